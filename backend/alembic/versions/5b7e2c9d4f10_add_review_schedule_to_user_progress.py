@@ -0,0 +1,43 @@
+"""add review schedule to user_progress
+
+Revision ID: 5b7e2c9d4f10
+Revises: 8d2e4b6f1a93
+Create Date: 2026-10-18 14:21:43.118604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e2c9d4f10'
+down_revision: Union[str, Sequence[str], None] = '8d2e4b6f1a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('user_progress', sa.Column('ease', sa.Float(), server_default='2.5', nullable=False))
+    op.add_column('user_progress', sa.Column('interval_days', sa.Float(), server_default='0', nullable=False))
+    op.add_column('user_progress', sa.Column('repetitions', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('user_progress', sa.Column('due_at', sa.DateTime(), nullable=True))
+
+    # Words reviewed before scheduling existed are due right away
+    op.execute("UPDATE user_progress SET due_at = coalesce(last_reviewed, now())")
+
+    op.create_index('ix_user_progress_user_due', 'user_progress', ['user_id', 'due_at'], unique=False)
+    op.create_index('ix_concept_language_pairs_to_translation', 'concept_language_pairs',
+                    ['to_translation_id', 'source_lang'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_concept_language_pairs_to_translation', table_name='concept_language_pairs')
+    op.drop_index('ix_user_progress_user_due', table_name='user_progress')
+    op.drop_column('user_progress', 'due_at')
+    op.drop_column('user_progress', 'repetitions')
+    op.drop_column('user_progress', 'interval_days')
+    op.drop_column('user_progress', 'ease')
@@ -0,0 +1,28 @@
+"""add sessions user created index
+
+Revision ID: 7a9d1f4c6e82
+Revises: e6f0b3d8a217
+Create Date: 2026-10-18 17:12:48.935120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a9d1f4c6e82'
+down_revision: Union[str, Sequence[str], None] = 'e6f0b3d8a217'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_sessions_user_created', 'sessions', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_sessions_user_created', table_name='sessions')
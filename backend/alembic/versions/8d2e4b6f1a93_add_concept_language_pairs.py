@@ -0,0 +1,62 @@
+"""add concept_language_pairs
+
+Revision ID: 8d2e4b6f1a93
+Revises: 3f1c9a7d2b64
+Create Date: 2026-10-18 11:02:17.542981
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2e4b6f1a93'
+down_revision: Union[str, Sequence[str], None] = '3f1c9a7d2b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('concept_language_pairs',
+    sa.Column('source_lang', sa.String(), nullable=False),
+    sa.Column('target_lang', sa.String(), nullable=False),
+    sa.Column('concept', sa.String(), nullable=False),
+    sa.Column('domain_code', sa.String(), nullable=False),
+    sa.Column('difficulty', postgresql.ENUM('EASY', 'MEDIUM', 'HARD', name='difficulty', create_type=False), nullable=False),
+    sa.Column('from_translation_id', sa.UUID(), nullable=False),
+    sa.Column('to_translation_id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['concept'], ['master_words.concept'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['from_translation_id'], ['translations.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['source_lang'], ['languages.code'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['target_lang'], ['languages.code'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['to_translation_id'], ['translations.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('source_lang', 'target_lang', 'concept')
+    )
+    op.create_index('ix_concept_language_pairs_lookup', 'concept_language_pairs',
+                    ['source_lang', 'target_lang', 'domain_code', 'difficulty'], unique=False,
+                    postgresql_include=['concept', 'from_translation_id', 'to_translation_id'])
+
+    # Backfill from existing translations
+    op.execute("""
+        INSERT INTO concept_language_pairs
+            (source_lang, target_lang, concept, domain_code, difficulty,
+             from_translation_id, to_translation_id, created_at, updated_at)
+        SELECT f.language_code, t.language_code, mw.concept, mw.domain_code, mw.difficulty,
+               f.id, t.id, now(), now()
+        FROM master_words mw
+        JOIN translations f ON f.master_word_concept = mw.concept
+        JOIN translations t ON t.master_word_concept = mw.concept AND t.language_code <> f.language_code
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_concept_language_pairs_lookup', table_name='concept_language_pairs',
+                  postgresql_include=['concept', 'from_translation_id', 'to_translation_id'])
+    op.drop_table('concept_language_pairs')
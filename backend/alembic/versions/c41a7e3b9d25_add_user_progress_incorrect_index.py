@@ -0,0 +1,31 @@
+"""add user_progress incorrect index
+
+Revision ID: c41a7e3b9d25
+Revises: 5b7e2c9d4f10
+Create Date: 2026-10-18 15:08:12.604391
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41a7e3b9d25'
+down_revision: Union[str, Sequence[str], None] = '5b7e2c9d4f10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_user_progress_user_incorrect', 'user_progress',
+                    ['user_id', sa.text('incorrect_count DESC NULLS LAST')], unique=False,
+                    postgresql_include=['correct_count', 'translation_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_user_progress_user_incorrect', table_name='user_progress',
+                  postgresql_include=['correct_count', 'translation_id'])
@@ -0,0 +1,56 @@
+"""add user_stats rollup
+
+Backfill with `python -m scripts.rebuild_user_stats` after upgrading.
+
+Revision ID: e6f0b3d8a217
+Revises: c41a7e3b9d25
+Create Date: 2026-10-18 16:37:05.280913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6f0b3d8a217'
+down_revision: Union[str, Sequence[str], None] = 'c41a7e3b9d25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('user_stats',
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('words_reviewed', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('correct_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('incorrect_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('sessions_completed', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('current_streak', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('longest_streak', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('last_active_date', sa.Date(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_table('user_stats_breakdown',
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('dimension', sa.String(), nullable=False),
+    sa.Column('code', sa.String(), nullable=False),
+    sa.Column('words_reviewed', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('correct_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('incorrect_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'dimension', 'code')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_stats_breakdown')
+    op.drop_table('user_stats')
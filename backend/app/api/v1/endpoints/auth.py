@@ -9,15 +9,25 @@ from starlette.responses import RedirectResponse
 import httpx
 
 from ....core.database import get_db
-from ....core.security import verify_password, get_password_hash, create_access_token, decode_access_token
+from ....core.security import (
+    PasswordHasherBusy, verify_password, get_password_hash, create_access_token, decode_access_token
+)
 from ....core.config import settings
+from ....domain.user.cache import get_user_by_email, invalidate_user
 from ....domain.user.models import User
+from ....domain.user.revocation import revocation_list, revoke_token
 from ....domain.user.schemas import UserCreate, UserResponse, Token, GoogleAuthResponse, LoginRequest
 
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 
+hasher_busy_exception = HTTPException(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    detail="Too many login attempts in progress, retry shortly",
+    headers={"Retry-After": "1"},
+)
+
 # Configure OAuth
 config = Config(environ={
     'GOOGLE_CLIENT_ID': settings.GOOGLE_CLIENT_ID,
@@ -50,9 +60,15 @@ async def get_current_user(
     if email is None:
         raise credentials_exception
     
-    result = await db.execute(select(User).where(User.email == email))
-    user = result.scalar_one_or_none()
+    # In-memory lookup, no query
+    if revocation_list.is_revoked(payload.get("jti")):
+        raise credentials_exception
     
+    # On the primary even for endpoints served by the replica: a user who
+    # just registered or changed their profile must be found as written, and
+    # the user cache must not be refilled from a lagging replica. A cached
+    # user never checks out a primary connection.
+    user = await get_user_by_email(db, email)
     if user is None:
         raise credentials_exception
     
@@ -68,10 +84,15 @@ async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
             detail="Email already registered"
         )
     
-    hashed_password = get_password_hash(user_data.password)
+    try:
+        hashed_password = await get_password_hash(user_data.password)
+    except PasswordHasherBusy:
+        raise hasher_busy_exception
     user = User(email=user_data.email, hashed_password=hashed_password, full_name=user_data.full_name)
     db.add(user)
     await db.commit()
+    # A deleted account with the same email may still be cached
+    await invalidate_user(user.email)
     await db.refresh(user)
     
     return user
@@ -85,13 +106,27 @@ async def login(
     result = await db.execute(select(User).where(User.email == credentials.email))
     user = result.scalar_one_or_none()
     
-    if not user or not verify_password(credentials.password, user.hashed_password):
+    verified, new_hash = False, None
+    # OAuth accounts have no password
+    if user and user.hashed_password:
+        try:
+            verified, new_hash = await verify_password(credentials.password, user.hashed_password)
+        except PasswordHasherBusy:
+            raise hasher_busy_exception
+    
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Stored with an older cost, upgrade it now that we have the password
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+        await invalidate_user(user.email)
+    
     access_token = create_access_token(data={"sub": user.email})
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -102,8 +137,16 @@ async def get_me(current_user: User = Depends(get_current_user)):
 
 
 @router.post("/logout")
-async def logout(current_user: User = Depends(get_current_user)):
-    """Logout endpoint - client should clear token after calling this"""
+async def logout(
+    token: str = Depends(oauth2_scheme),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Logout endpoint - revokes the token until it expires, client should clear it too"""
+    payload = decode_access_token(token)
+    # Tokens issued before revocation support have no jti and just expire
+    if payload.get("jti"):
+        await revoke_token(db, payload["jti"], payload["exp"])
     return {"message": "Successfully logged out"}
 
 
@@ -154,6 +197,7 @@ async def google_callback(request: Request, db: AsyncSession = Depends(get_db)):
                 user.full_name = full_name
                 user.picture_url = picture
                 await db.commit()
+                await invalidate_user(user.email)
                 await db.refresh(user)
         else:
             # Create new user
@@ -167,6 +211,7 @@ async def google_callback(request: Request, db: AsyncSession = Depends(get_db)):
             )
             db.add(user)
             await db.commit()
+            await invalidate_user(user.email)
             await db.refresh(user)
         
         # Create access token
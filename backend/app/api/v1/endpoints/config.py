@@ -1,45 +1,68 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Dict
+from typing import Any, List, Dict, Tuple
+import json
 from sqlalchemy import select, distinct
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_read_db, get_write_db
 from app.domain.vocab.models import Language, MasterWord, Domain, Difficulty, Translation
+from app.domain.vocab.catalog import ReferencePayload, commit_catalog_changes, vocab_catalog
+from app.domain.vocab.bulk import BulkImportResult, BulkRowError, import_master_words, import_translations
+from app.domain.vocab.pairs import refresh_concept_language_pairs
 from app.domain.vocab.schemas import LanguageSchema, DomainSchema, MasterWordCreate, MasterWordSchema, TranslationCreate
 from fastapi import HTTPException
 
 router = APIRouter()
 
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/jsonl", "application/json-seq")
+
+def reference_response(request: Request, payload: ReferencePayload) -> Response:
+    """Cached reference data as-is, or 304 when the client already has it"""
+    headers = {
+        "ETag": payload.etag,
+        "Cache-Control": f"public, max-age={settings.REFERENCE_DATA_MAX_AGE}, must-revalidate",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if "*" in tags or payload.etag in tags:
+            return Response(status_code=304, headers=headers)
+    return Response(content=payload.body, media_type="application/json", headers=headers)
+
+# Reference data is served from the vocab catalog, which is invalidated by
+# every admin write and seeder run, so steady-state calls run no query
+
 @router.get("/languages", response_model=List[LanguageSchema])
-async def get_languages(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Language))
-    return result.scalars().all()
+async def get_languages(request: Request, db: AsyncSession = Depends(get_read_db)):
+    return reference_response(request, await vocab_catalog.reference_payload(db, "languages"))
 
 @router.get("/domains", response_model=List[DomainSchema])
-async def get_domains(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Domain))
-    return result.scalars().all()
+async def get_domains(request: Request, db: AsyncSession = Depends(get_read_db)):
+    return reference_response(request, await vocab_catalog.reference_payload(db, "domains"))
+
+DIFFICULTIES_PAYLOAD = ReferencePayload.of([d.value for d in Difficulty])
 
 @router.get("/difficulties", response_model=List[str])
-async def get_difficulties():
-    # Return enum values
-    return [d.value for d in Difficulty]
+async def get_difficulties(request: Request):
+    # Enum values, fixed for the life of the process
+    return reference_response(request, DIFFICULTIES_PAYLOAD)
 
 ############### Admin / Creation Endpoints ##################
 
 @router.post("/languages", response_model=LanguageSchema)
-async def create_language(lang_in: LanguageSchema, db: AsyncSession = Depends(get_db)):
+async def create_language(lang_in: LanguageSchema, db: AsyncSession = Depends(get_write_db)):
     # Check existing
     if await db.get(Language, lang_in.code):
          raise HTTPException(status_code=400, detail="Language already exists")
     
     db_obj = Language(code=lang_in.code, name=lang_in.name)
     db.add(db_obj)
-    await db.commit()
+    await commit_catalog_changes(db)
     return db_obj
 
 @router.post("/domains", response_model=DomainSchema)
-async def create_domain(domain_name: str, db: AsyncSession = Depends(get_db)):
+async def create_domain(domain_name: str, db: AsyncSession = Depends(get_write_db)):
     # Check existing
     stmt = select(Domain).where(Domain.name == domain_name)
     existing = (await db.execute(stmt)).scalars().first()
@@ -48,12 +71,12 @@ async def create_domain(domain_name: str, db: AsyncSession = Depends(get_db)):
     
     db_obj = Domain(name=domain_name)
     db.add(db_obj)
-    await db.commit()
+    await commit_catalog_changes(db)
     await db.refresh(db_obj)
     return db_obj
 
 @router.post("/master-words", response_model=MasterWordSchema)
-async def create_master_word(word_in: MasterWordCreate, db: AsyncSession = Depends(get_db)):
+async def create_master_word(word_in: MasterWordCreate, db: AsyncSession = Depends(get_write_db)):
     db_obj = MasterWord(
         concept=word_in.concept,
         domain_code=word_in.domain_code,
@@ -62,12 +85,12 @@ async def create_master_word(word_in: MasterWordCreate, db: AsyncSession = Depen
         image_url=word_in.image_url
     )
     db.add(db_obj)
-    await db.commit()
+    await commit_catalog_changes(db)
     await db.refresh(db_obj)
     return db_obj
 
 @router.post("/translations", response_model=dict)
-async def create_translation(trans_in: TranslationCreate, db: AsyncSession = Depends(get_db)):
+async def create_translation(trans_in: TranslationCreate, db: AsyncSession = Depends(get_write_db)):
     # Create translation for a master word
     db_obj = Translation(
         master_word_concept=trans_in.master_word_concept,
@@ -80,9 +103,62 @@ async def create_translation(trans_in: TranslationCreate, db: AsyncSession = Dep
     )
     db.add(db_obj)
     try:
-        await db.commit()
+        await db.flush()
+        await refresh_concept_language_pairs(db, [trans_in.master_word_concept])
+        await commit_catalog_changes(db)
         await db.refresh(db_obj)
         return {"status": "success", "id": db_obj.id}
     except Exception as e:
         await db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
+
+############### Bulk Import Endpoints ##################
+
+async def read_bulk_items(request: Request) -> List[Tuple[int, Any]]:
+    """(index, item) pairs from a JSON array body or an NDJSON stream
+
+    NDJSON lines that are not valid JSON are returned as row errors.
+    """
+    if request.headers.get("content-type", "").startswith(NDJSON_MEDIA_TYPES):
+        items = []
+        index = 0
+        buffer = b""
+
+        def parse(line: bytes):
+            nonlocal index
+            if line.strip():
+                try:
+                    items.append((index, json.loads(line)))
+                except ValueError as e:
+                    items.append((index, BulkRowError(index=index, errors=[f"Invalid JSON: {e}"])))
+                index += 1
+
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                parse(line)
+        parse(buffer)
+        return items
+
+    try:
+        data = json.loads(await request.body())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
+    if not isinstance(data, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array or an NDJSON body")
+    return list(enumerate(data))
+
+@router.post("/master-words/bulk", response_model=BulkImportResult)
+async def bulk_import_master_words(request: Request, db: AsyncSession = Depends(get_write_db)):
+    """Upsert master words (with nested translations), skipping invalid rows"""
+    result = await import_master_words(db, await read_bulk_items(request))
+    await commit_catalog_changes(db)
+    return result
+
+@router.post("/translations/bulk", response_model=BulkImportResult)
+async def bulk_import_translations(request: Request, db: AsyncSession = Depends(get_write_db)):
+    """Upsert translations of existing master words, skipping invalid rows"""
+    result = await import_translations(db, await read_bulk_items(request))
+    await commit_catalog_changes(db)
+    return result
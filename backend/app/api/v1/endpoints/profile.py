@@ -12,6 +12,7 @@ from ....domain.user.schemas import (
     UserLanguageUpdate,
     UserLanguageResponse
 )
+from ....domain.user.cache import invalidate_user
 from .auth import get_current_user
 
 
@@ -61,6 +62,7 @@ async def update_profile(
         current_user.full_name = profile_data.full_name
     
     await db.commit()
+    await invalidate_user(current_user.email)
     await db.refresh(current_user)
     
     # Fetch languages
@@ -1,43 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
-from typing import List
+from typing import List, Optional
 from datetime import datetime
+from uuid import UUID, uuid4
 
-from app.core.database import get_db
-from app.domain.vocab.models import Translation, MasterWord, Domain, Difficulty
-from app.domain.session.models import Session, SessionWord, SessionType, UserProgress, SessionConfig
+from app.core.config import settings
+from app.core.database import get_read_db, get_write_db
+from app.core.responses import FastJSONResponse
+from app.domain.session.models import Session, SessionWord, SessionConfig
 from app.domain.session.schemas import (
     SessionConfigCreate, SessionConfigSchema,
     SessionCreate, SessionSchema, SessionDetail,
-    SessionWordCreate, SessionWordSchema
+    SessionWordCreate
 )
+from app.domain.session.detail import build_session_detail, load_session_detail
+from app.domain.session.history import decode_cursor, list_sessions, parse_fields
+from app.domain.session.progress import record_session_results
+from app.domain.session.rollup import update_user_stats
+from app.domain.session.prefetch import choose_words, config_key, load_config, pending_sessions, pregenerate_session
 from app.domain.user.models import User
 from app.api.v1.endpoints.auth import get_current_user
 
 router = APIRouter()
 
-# Constants
-WORDS_PER_DIFFICULTY = {
-    "EASY": 10,
-    "MEDIUM": 15,
-    "HARD": 20
-}
-
-# Reusable eager loading options for session details
-SESSION_DETAIL_OPTIONS = [
-    selectinload(Session.results).selectinload(SessionWord.translation_from).selectinload(Translation.language),
-    selectinload(Session.results).selectinload(SessionWord.translation_from).selectinload(Translation.master_word).selectinload(MasterWord.domain),
-    selectinload(Session.results).selectinload(SessionWord.translation_to).selectinload(Translation.language),
-    selectinload(Session.results).selectinload(SessionWord.translation_to).selectinload(Translation.master_word).selectinload(MasterWord.domain)
-]
-
 @router.post("/config", response_model=SessionConfigSchema)
 async def create_session_config(
     config_in: SessionConfigCreate, 
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_write_db)
 ):
     """Create a session configuration before starting a session"""
     db_config = SessionConfig(
@@ -54,15 +46,15 @@ async def create_session_config(
     
     return db_config
 
-@router.post("/start", response_model=SessionDetail)
+@router.post("/start", response_model=SessionDetail, response_class=FastJSONResponse)
 async def start_session(
     session_in: SessionCreate,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_write_db)
 ):
     """Start a new session based on a config"""
-    # Get the config
-    config = await db.get(SessionConfig, session_in.config_id)
+    # Get the config, with the user's due words for it
+    config, due = await load_config(db, session_in.config_id, current_user.id)
     if not config:
         raise HTTPException(status_code=404, detail="Session config not found")
     
@@ -77,8 +69,22 @@ async def start_session(
     difficulty = config.difficulty
     session_type = config.session_type
     
-    # Create Session Record
+    # Words pre-generated after the user's last submit, if that was for the
+    # same settings; otherwise choose them now
+    selected_pairs = await pending_sessions.claim(
+        current_user.id, config_key(source_lang_code, target_lang_code, domain, difficulty, session_type)
+    )
+    if selected_pairs is None:
+        selected_pairs = await choose_words(
+            db, current_user.id, source_lang_code, target_lang_code, domain, difficulty, due=due
+        )
+    
+    if not selected_pairs:
+        raise HTTPException(status_code=404, detail="No words found for this configuration")
+    
+    # Create Session Record (ID set here so results don't need a flush first)
     db_session = Session(
+        id=uuid4(),
         config_id=config.id,
         user_id=config.user_id,
         source_lang_code=source_lang_code,
@@ -88,97 +94,38 @@ async def start_session(
         session_type=session_type,
     )
     db.add(db_session)
-    await db.flush()  # Flush to get session ID before creating results
-    
-    # Determine number of words based on difficulty
-    num_words = WORDS_PER_DIFFICULTY.get(difficulty, 10)
-    
-    # Select master words that have translations in BOTH languages
-    # This ensures we can always show the word pair
-    query = (
-        select(MasterWord)
-        .join(Translation, Translation.master_word_concept == MasterWord.concept)
-        .where(Translation.language_code.in_([source_lang_code, target_lang_code]))
-        .group_by(MasterWord.concept)
-        .having(func.count(func.distinct(Translation.language_code)) == 2)
-    )
-    
-    # Filter by domain if specified
-    if domain and domain != "ALL":
-        query = query.where(MasterWord.domain_code == domain)
-    
-    # Filter by difficulty (cumulative)
-    if difficulty:
-        if difficulty == "EASY":
-            query = query.where(MasterWord.difficulty == Difficulty.EASY)
-        elif difficulty == "MEDIUM":
-            query = query.where(MasterWord.difficulty.in_([Difficulty.EASY, Difficulty.MEDIUM]))
-        elif difficulty == "HARD":
-            query = query.where(MasterWord.difficulty.in_([Difficulty.EASY, Difficulty.MEDIUM, Difficulty.HARD]))
-    
-    # Use SQL random and limit to get random sample efficiently
-    query = query.order_by(func.random()).limit(num_words)
-    
-    selected_master_words = (await db.execute(query)).scalars().all()
-    
-    if not selected_master_words:
-        await db.rollback()
-        raise HTTPException(status_code=404, detail="No words found for this configuration")
-    
-    # Bulk fetch all required translations for selected master words
-    concepts = [mw.concept for mw in selected_master_words]
-    
-    stmt_translations = select(Translation).where(
-        Translation.master_word_concept.in_(concepts),
-        Translation.language_code.in_([source_lang_code, target_lang_code])
-    )
-    all_translations = (await db.execute(stmt_translations)).scalars().all()
-    
-    # Build dictionaries for quick lookup
-    translations_by_concept_lang = {}
-    for trans in all_translations:
-        key = (trans.master_word_concept, trans.language_code)
-        translations_by_concept_lang[key] = trans
     
     # Create SessionWord records
-    session_words_created = 0
-    for master_word in selected_master_words:
-        trans_from = translations_by_concept_lang.get((master_word.concept, source_lang_code))
-        trans_to = translations_by_concept_lang.get((master_word.concept, target_lang_code))
-        
-        if trans_from and trans_to:
-            res = SessionWord(
-                session_id=db_session.id,
-                translation_from_id=trans_from.id,
-                translation_to_id=trans_to.id,
-                from_language=source_lang_code,
-                to_language=target_lang_code,
-                correct=None
-            )
-            db.add(res)
-            session_words_created += 1
-    
-    # Ensure we created at least one session word
-    if session_words_created == 0:
-        await db.rollback()
-        raise HTTPException(status_code=422, detail="Could not create session: no valid word pairs found")
+    session_words = []
+    for concept, trans_from_id, trans_to_id in selected_pairs:
+        res = SessionWord(
+            session_id=db_session.id,
+            translation_from_id=trans_from_id,
+            translation_to_id=trans_to_id,
+            from_language=source_lang_code,
+            to_language=target_lang_code,
+            correct=None
+        )
+        db.add(res)
+        session_words.append(res)
     
     await db.commit()
     
-    # Reload session with all nested relationships
-    stmt = select(Session).where(Session.id == db_session.id).options(*SESSION_DETAIL_OPTIONS)
-    result = await db.execute(stmt)
-    return result.scalars().first()
+    # Build the response from the objects we just wrote, no reload
+    return FastJSONResponse(await build_session_detail(db, db_session, session_words))
 
-@router.post("/{session_id}/submit", response_model=SessionDetail)
+@router.post("/{session_id}/submit", response_model=SessionDetail, response_class=FastJSONResponse)
 async def submit_session(
-    session_id: int,
+    session_id: UUID,
     words: List[SessionWordCreate],
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_write_db)
 ):
     """Submit session results and calculate score"""
-    db_session = await db.get(Session, session_id)
+    # Locked until commit: a concurrent submit of the same session waits, then
+    # sees it completed and doesn't count the completion again
+    db_session = await db.get(Session, session_id, with_for_update=True)
     if not db_session:
         raise HTTPException(status_code=404, detail="Session not found")
     
@@ -189,80 +136,46 @@ async def submit_session(
     if not words:
         raise HTTPException(status_code=422, detail="No words submitted")
     
-    # Bulk fetch all SessionWords for this session
-    translation_to_ids = [w.translation_to_id for w in words]
-    
-    stmt_session_words = select(SessionWord).where(
-        SessionWord.session_id == session_id,
-        SessionWord.translation_to_id.in_(translation_to_ids)
-    )
-    session_words = (await db.execute(stmt_session_words)).scalars().all()
-    session_words_by_id = {sw.translation_to_id: sw for sw in session_words}
+    now = datetime.utcnow()
     
-    # Bulk fetch all UserProgress for these translations
-    stmt_progress = select(UserProgress).where(
-        UserProgress.user_id == current_user.id,
-        UserProgress.translation_id.in_(translation_to_ids)
-    )
-    progress_records = (await db.execute(stmt_progress)).scalars().all()
-    progress_by_id = {up.translation_id: up for up in progress_records}
+    # Store answers and update progress with one statement each
+    reviews = await record_session_results(db, db_session.id, current_user.id, words)
     
-    correct_count = 0
-    total = 0
+    # Apply the submit's deltas to the stats rollup; a resubmit does not
+    # complete the session again
+    completed = db_session.completed_at is None
+    await update_user_stats(db, current_user.id, reviews, completed, now)
     
-    # Update SessionWords and UserProgress in memory
-    for r_in in words:
-        existing = session_words_by_id.get(r_in.translation_to_id)
-        
-        if existing:
-            existing.correct = r_in.correct
-            existing.user_answer = r_in.user_answer
-            
-            if r_in.correct:
-                correct_count += 1
-            total += 1
-            
-            # Update or create UserProgress
-            prog = progress_by_id.get(r_in.translation_to_id)
-            if not prog:
-                prog = UserProgress(
-                    user_id=current_user.id,
-                    translation_id=r_in.translation_to_id,
-                    correct_count=0,
-                    incorrect_count=0
-                )
-                db.add(prog)
-                progress_by_id[r_in.translation_to_id] = prog
-            
-            if r_in.correct:
-                prog.correct_count += 1
-            else:
-                prog.incorrect_count += 1
-            
-            prog.last_reviewed = datetime.utcnow()
+    total = len(reviews)
+    correct_count = sum(1 for r in reviews if r.correct)
     
     # Update Session score and completion
     score = int((correct_count / total) * 100) if total > 0 else 0
     db_session.score = score
-    db_session.completed_at = datetime.utcnow()
+    if completed:
+        db_session.completed_at = now
     
     await db.commit()
     
-    # Return session with all nested relationships
-    stmt = select(Session).where(Session.id == db_session.id).options(*SESSION_DETAIL_OPTIONS)
-    result = await db.execute(stmt)
-    return result.scalars().first()
+    # The user's progress changed: a word set chosen before is stale. Choose
+    # the next one for these settings once the response is sent
+    submit = await pending_sessions.discard(current_user.id)
+    if settings.PREGENERATE_SESSIONS:
+        background_tasks.add_task(
+            pregenerate_session, current_user.id, db_session.source_lang_code, db_session.target_lang_code,
+            db_session.domain, db_session.difficulty, db_session.session_type, submit
+        )
+    
+    return FastJSONResponse(await load_session_detail(db, db_session))
 
-@router.get("/{session_id}", response_model=SessionDetail)
+@router.get("/{session_id}", response_model=SessionDetail, response_class=FastJSONResponse)
 async def get_session(
-    session_id: int,
+    session_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a session with all its results"""
-    stmt = select(Session).where(Session.id == session_id).options(*SESSION_DETAIL_OPTIONS)
-    result = await db.execute(stmt)
-    session = result.scalars().first()
+    session = await db.get(Session, session_id)
     
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
@@ -271,15 +184,36 @@ async def get_session(
     if session.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to view this session")
     
-    return session
+    return FastJSONResponse(await load_session_detail(db, session))
 
 @router.get("/", response_model=List[SessionSchema])
 async def get_user_sessions(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=settings.SESSION_PAGE_MAX_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated subset of the session fields"),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get all sessions for the current user"""
-    stmt = select(Session).where(Session.user_id == current_user.id).order_by(Session.created_at.desc())
-    result = await db.execute(stmt)
-    return result.scalars().all()
-
+    """Get the current user's sessions, newest first
+    
+    Without `limit` or `cursor` the whole history is returned, as before
+    pagination. Otherwise one page is (`limit` defaults to SESSION_PAGE_SIZE)
+    and the cursor of the next page is in the X-Next-Cursor header, absent
+    on the last page.
+    """
+    try:
+        after = decode_cursor(cursor) if cursor else None
+        projection = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if limit is None and after is not None:
+        limit = settings.SESSION_PAGE_SIZE
+    items, next_cursor = await list_sessions(db, current_user.id, limit, after, projection)
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    if fields:
+        # Partial items don't match SessionSchema, return them as they are
+        return JSONResponse(jsonable_encoder(items), headers=headers)
+    response.headers.update(headers)
+    return items
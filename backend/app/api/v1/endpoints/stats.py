@@ -1,51 +1,116 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, true
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime
 from typing import List, Dict
 
-from app.core.database import get_db
-from app.domain.session.models import UserProgress
+from app.core.database import get_read_db
+from app.domain.session.models import UserProgress, UserStats as UserStatsRow, UserStatsBreakdown
+from app.domain.session.rollup import current_streak
 from app.domain.vocab.models import Translation
 from app.domain.user.models import User
+from app.api.v1.endpoints.auth import get_current_user
 from pydantic import BaseModel
 
 router = APIRouter()
 
+WEAKEST_WORDS = 5
+
+class BreakdownStats(BaseModel):
+    words_reviewed: int
+    correct_count: int
+    incorrect_count: int
+    correct_rate: float
+
 class UserStats(BaseModel):
     total_words_reviewed: int
     correct_rate: float
     weakest_words: List[str]
+    sessions_completed: int = 0
+    current_streak: int = 0
+    longest_streak: int = 0
+    languages: Dict[str, BreakdownStats] = {}
+    domains: Dict[str, BreakdownStats] = {}
+
+
+def correct_rate(correct: int, incorrect: int) -> float:
+    attempts = correct + incorrect
+    return round(correct / attempts * 100, 2) if attempts > 0 else 0.0
+
+
+def breakdown_stats(counts: Dict[str, List[int]]) -> Dict[str, BreakdownStats]:
+    return {
+        code: BreakdownStats(
+            words_reviewed=words, correct_count=correct, incorrect_count=incorrect,
+            correct_rate=correct_rate(correct, incorrect)
+        )
+        for code, (words, correct, incorrect) in (counts or {}).items()
+    }
+
 
 @router.get("/", response_model=UserStats)
-async def get_user_profile(db: AsyncSession = Depends(get_db)):
-    user_id = 1 # Hardcoded for now
-    
-    # Total Progress
-    query = select(UserProgress).where(UserProgress.user_id == user_id)
-    progress = (await db.execute(query)).scalars().all()
-    
-    total_reviewed = len(progress)
+async def get_user_profile(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    # Everything comes from the user_stats rollup (kept up to date by
+    # submit_session) in one query: the totals row, the per-language and
+    # per-domain counts, and the weakest words read off
+    # ix_user_progress_user_incorrect
+    def breakdown(dimension: str):
+        return (
+            select(func.jsonb_object_agg(
+                UserStatsBreakdown.code,
+                func.jsonb_build_array(
+                    UserStatsBreakdown.words_reviewed,
+                    UserStatsBreakdown.correct_count,
+                    UserStatsBreakdown.incorrect_count
+                ),
+                type_=JSONB
+            ))
+            .where(UserStatsBreakdown.user_id == current_user.id, UserStatsBreakdown.dimension == dimension)
+            .scalar_subquery()
+        )
     
-    total_correct = sum(p.correct_count for p in progress)
-    total_attempts = sum(p.correct_count + p.incorrect_count for p in progress)
-    
-    rate = (total_correct / total_attempts * 100) if total_attempts > 0 else 0.0
+    weakest = (
+        select(Translation.text, UserProgress.incorrect_count)
+        .select_from(UserProgress)
+        .join(Translation, Translation.id == UserProgress.translation_id)
+        .where(UserProgress.user_id == current_user.id)
+        .order_by(UserProgress.incorrect_count.desc().nulls_last())
+        .limit(WEAKEST_WORDS)
+        .cte("weakest")
+    )
     
-    # Weakest words (more incorrect than correct, sorted by incorrect count)
-    weakest = sorted(progress, key=lambda p: p.incorrect_count, reverse=True)[:5]
-    weakest_ids = [p.translation_id for p in weakest]
+    # Start from the user row so there is a result even before any stats
+    query = (
+        select(
+            UserStatsRow,
+            breakdown("language").label("languages"),
+            breakdown("domain").label("domains"),
+            weakest.c.text
+        )
+        .select_from(User)
+        .outerjoin(UserStatsRow, UserStatsRow.user_id == User.id)
+        .outerjoin(weakest, true())
+        .where(User.id == current_user.id)
+        .order_by(weakest.c.incorrect_count.desc().nulls_last())
+    )
+    rows = (await db.execute(query)).all()
     
-    if weakest_ids:
-        w_query = select(Translation).where(Translation.id.in_(weakest_ids))
-        translations = (await db.execute(w_query)).scalars().all()
-        # Maintain order? Hard with IN clause. Map back.
-        w_map = {t.id: t.text for t in translations}
-        weakest_texts = [w_map.get(tid, "Unknown") for tid in weakest_ids]
-    else:
-        weakest_texts = []
+    stats = rows[0].UserStats
+    weakest_texts = [row.text for row in rows if row.text is not None]
+    if stats is None:
+        return UserStats(total_words_reviewed=0, correct_rate=0.0, weakest_words=weakest_texts)
         
     return UserStats(
-        total_words_reviewed=total_reviewed,
-        correct_rate=round(rate, 2),
-        weakest_words=weakest_texts
+        total_words_reviewed=stats.words_reviewed,
+        correct_rate=correct_rate(stats.correct_count, stats.incorrect_count),
+        weakest_words=weakest_texts,
+        sessions_completed=stats.sessions_completed,
+        current_streak=current_streak(stats, datetime.utcnow().date()),
+        longest_streak=stats.longest_streak,
+        languages=breakdown_stats(rows[0].languages),
+        domains=breakdown_stats(rows[0].domains)
     )
@@ -0,0 +1,126 @@
+"""
+Small TTL caches with a pluggable backend.
+
+`MemoryBackend` is per-process and size-bounded (LRU). `RedisBackend` shares
+entries between workers through any Redis-compatible server; its client
+library (redis-py) is only needed when CACHE_URL is set. It stores values as
+JSON, never pickle: whoever can write to the server must not be able to run
+code in the workers. Values must therefore be JSON-compatible.
+"""
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+
+
+class CacheBackend(ABC):
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float):
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str):
+        ...
+
+
+class MemoryBackend(CacheBackend):
+    def __init__(self, max_size: int = 10_000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str):
+        self._entries.pop(key, None)
+
+
+class RedisBackend(CacheBackend):
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_URL is set but the 'redis' package is not installed") from e
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[Any]:
+        data = await self._client.get(key)
+        return json.loads(data) if data is not None else None
+
+    async def set(self, key: str, value: Any, ttl: float):
+        await self._client.set(key, json.dumps(value), px=max(1, int(ttl * 1000)))
+
+    async def delete(self, key: str):
+        await self._client.delete(key)
+
+
+class Cache:
+    """A named cache over a backend, with hit/miss counters"""
+
+    def __init__(self, name: str, backend: CacheBackend, ttl: float):
+        self.name = name
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        caches.append(self)
+
+    def _key(self, key: str) -> str:
+        return f"{self.name}:{key}"
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = await self.backend.get(self._key(key))
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: Any):
+        await self.backend.set(self._key(key), value, self.ttl)
+
+    async def delete(self, key: str):
+        await self.backend.delete(self._key(key))
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+caches: List[Cache] = []
+
+
+def create_backend(max_size: int) -> CacheBackend:
+    """Shared Redis-compatible backend when CACHE_URL is set, in-process otherwise"""
+    if settings.CACHE_URL:
+        return RedisBackend(settings.CACHE_URL)
+    return MemoryBackend(max_size)
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    return {cache.name: cache.stats() for cache in caches}
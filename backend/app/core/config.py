@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 import json
 import os
 
@@ -7,7 +7,7 @@ import os
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Vocab API"
     VERSION: str = "1.0.0"
-    ENVIRONMENT: str = "development"  # development, staging, production
+    ENVIRONMENT: str = "development"  # local, development, staging, production
     
     # Database
     POSTGRES_USER: str
@@ -20,6 +20,54 @@ class Settings(BaseSettings):
     def DATABASE_URL(self) -> str:
         return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
     
+    # Engine profile
+    DB_ECHO: Optional[bool] = None  # Log every statement, defaults to True in local/development only
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30  # Seconds to wait for a connection when the pool is exhausted
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced, -1 to disable
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100  # Prepared statements cached per connection, 0 to disable
+    # Set when connecting through an external pooler in transaction mode
+    # (PgBouncer, ...): it owns the pooling and prepared statements can't be
+    # reused, so the engine uses NullPool and no statement cache
+    DB_EXTERNAL_POOLER: bool = False
+    
+    # Read replica, with the same credentials and database name. Reads use
+    # the primary when REPLICA_HOST is empty
+    REPLICA_HOST: str = ""
+    REPLICA_PORT: Optional[int] = None  # Defaults to POSTGRES_PORT
+    READ_PRIMARY_HEADER: str = "X-Read-Primary"  # Set to 1 to pin a request's reads to the primary
+    
+    @property
+    def REPLICA_DATABASE_URL(self) -> Optional[str]:
+        if not self.REPLICA_HOST:
+            return None
+        port = self.REPLICA_PORT or self.POSTGRES_PORT
+        return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.REPLICA_HOST}:{port}/{self.POSTGRES_DB}"
+    
+    @property
+    def db_echo(self) -> bool:
+        if self.DB_ECHO is not None:
+            return self.DB_ECHO
+        return self.ENVIRONMENT in ("local", "development")
+    
+    # Per-request query count and timings in a response header, defaults to
+    # True in local/development only
+    METRICS_DEBUG_HEADER: Optional[bool] = None
+    
+    @property
+    def metrics_debug_header(self) -> bool:
+        if self.METRICS_DEBUG_HEADER is not None:
+            return self.METRICS_DEBUG_HEADER
+        return self.ENVIRONMENT in ("local", "development")
+    
+    # N+1 and slow-query detector, for development and CI (see query_detector.py)
+    QUERY_DETECTOR: bool = False
+    QUERY_DETECTOR_REPEAT: int = 5  # Runs of one statement shape in a request that count as N+1
+    SLOW_QUERY_MS: float = 100
+    QUERY_REPORT_PATH: str = ""  # JSON report written on shutdown, empty to skip
+    
     # CORS - can be set as JSON string in env or use default
     CORS_ORIGINS: str = '["http://localhost:5173", "http://localhost:5174", "http://localhost:8080"]'
     
@@ -34,6 +82,26 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    JWT_BACKEND: str = "jose"  # "jose" (python-jose) or "pyjwt" (needs PyJWT installed)
+    TOKEN_CACHE_SIZE: int = 10000  # Verified tokens kept per process, 0 to disable
+    # Full reload of revoked tokens, in case a notification was missed
+    REVOCATION_SYNC_SECONDS: int = 60
+    
+    # Password hashing - bcrypt cost (log2 rounds; existing hashes with a lower
+    # cost are upgraded on login), threads running it, and hashes allowed
+    # in flight (running or queued) before new ones are refused
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    
+    # Caches - CACHE_URL points to a Redis-compatible server shared by workers,
+    # leave empty for per-process memory caches
+    CACHE_URL: str = ""
+    USER_CACHE_TTL_SECONDS: int = 30
+    USER_CACHE_MAX_SIZE: int = 10000
+    # Vocab catalog dropped at least this often, in case an invalidation
+    # notification was missed
+    CATALOG_MAX_AGE_SECONDS: int = 300
     
     # Session (for OAuth state)
     SESSION_SECRET: str = ""  # Will default to SECRET_KEY if not set
@@ -43,6 +111,19 @@ class Settings(BaseSettings):
         """Use SESSION_SECRET if set, otherwise fall back to SECRET_KEY"""
         return self.SESSION_SECRET if self.SESSION_SECRET else self.SECRET_KEY
     
+    # Browser cache lifetime (seconds) of /config reference data, revalidated
+    # with its ETag afterwards
+    REFERENCE_DATA_MAX_AGE: int = 60
+    
+    # Session history pagination
+    SESSION_PAGE_SIZE: int = 20
+    SESSION_PAGE_MAX_SIZE: int = 100
+
+    # Next session words chosen in the background after a submit
+    PREGENERATE_SESSIONS: bool = True
+    PENDING_SESSION_TTL_SECONDS: int = 600
+    PENDING_SESSION_MAX_SIZE: int = 10000
+    
     # Google OAuth
     GOOGLE_CLIENT_ID: str = ""
     GOOGLE_CLIENT_SECRET: str = ""
@@ -1,11 +1,13 @@
+from fastapi import Request
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import NullPool
 from sqlalchemy import Column, Integer, DateTime
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
 import uuid
 
-from app.core.config import settings
+from app.core.config import Settings, settings
 
 
 class Base(DeclarativeBase):
@@ -14,11 +16,42 @@ class Base(DeclarativeBase):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=True,
-    future=True
-)
+def engine_options(config: Settings) -> dict:
+    """create_async_engine arguments for the engine profile in `config`"""
+    options = {"echo": config.db_echo, "future": True}
+    if config.DB_EXTERNAL_POOLER:
+        # Consecutive statements may run on different server connections, so
+        # nothing is prepared under a reusable name
+        options["poolclass"] = NullPool
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+        return options
+
+    options.update(
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+        connect_args={
+            # asyncpg's own cache, and SQLAlchemy's cache of asyncpg statements
+            "statement_cache_size": config.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": config.DB_STATEMENT_CACHE_SIZE,
+        },
+    )
+    return options
+
+
+engine = create_async_engine(settings.DATABASE_URL, **engine_options(settings))
+
+# Read-only endpoints go to the replica when one is configured
+if settings.REPLICA_DATABASE_URL:
+    read_engine = create_async_engine(settings.REPLICA_DATABASE_URL, **engine_options(settings))
+else:
+    read_engine = engine
 
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -26,8 +59,15 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False
 )
 
+AsyncReadSessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+)
+
 
-async def get_db():
+async def get_write_db():
+    """Session on the primary"""
     async with AsyncSessionLocal() as session:
         try:
             yield session
@@ -35,6 +75,28 @@ async def get_db():
             await session.close()
 
 
+async def get_read_db(request: Request):
+    """Session on the replica, for endpoints that only read
+
+    Requests sending the READ_PRIMARY_HEADER header (e.g. right after a
+    write they need to see) are pinned to the primary instead. Either way
+    get_current_user looks the user up with its own get_db session, and the
+    vocab catalog fills its cache through primary_session: both stay on the
+    primary.
+    """
+    pinned = request.headers.get(settings.READ_PRIMARY_HEADER, "").lower() in ("1", "true", "yes")
+    session_factory = AsyncSessionLocal if pinned else AsyncReadSessionLocal
+    async with session_factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+# Endpoints that both read and write use the primary
+get_db = get_write_db
+
+
 async def init_db():
     # Tables are now managed by Alembic migrations
     pass
@@ -0,0 +1,233 @@
+"""
+Per-route request and database metrics.
+
+`MetricsMiddleware` times every request and, through SQLAlchemy engine
+events (`instrument_engine`), the statements it runs: count, time spent in
+the database and rows returned. Totals are kept per method and route
+template and rendered in the Prometheus text format by `render_prometheus`
+(served on /metrics). They are per process: scrape each worker.
+
+When settings.metrics_debug_header is on, responses carry the request's
+own numbers in the STATS_HEADER header.
+
+`query_budget` is for tests and benchmarks: it collects the statements run
+inside it, through the app or not, and fails when there are too many.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+
+
+STATS_HEADER = "X-Query-Stats"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class ExecutedStatement(NamedTuple):
+    statement: str
+    parameters: Any
+    seconds: float
+    executemany: bool
+
+
+@dataclass
+class QueryStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+    rows: int = 0
+    statements: Optional[List[ExecutedStatement]] = None  # Only kept when asked for
+
+    def header(self, total_seconds: float) -> str:
+        return (
+            f"queries={self.queries}; db_ms={self.db_seconds * 1000:.1f}; "
+            f"rows={self.rows}; total_ms={total_seconds * 1000:.1f}"
+        )
+
+
+# Every collector active in the current context gets each statement, so a
+# query budget around an in-process request sees the request's statements
+_collectors: ContextVar[Tuple[QueryStats, ...]] = ContextVar("query_collectors", default=())
+
+
+@contextmanager
+def collect_queries(keep_statements: bool = False):
+    stats = QueryStats(statements=[] if keep_statements else None)
+    token = _collectors.set(_collectors.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _collectors.reset(token)
+
+
+@contextmanager
+def uncollected():
+    """Statements run inside are not counted (diagnostics of the metrics themselves)"""
+    token = _collectors.set(())
+    try:
+        yield
+    finally:
+        _collectors.reset(token)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_budget(max_queries: int):
+    """Fail if more than `max_queries` statements run inside the block
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), ...) as client:
+            with query_budget(3):
+                await client.get("/api/v1/sessions/", headers=auth)
+    """
+    with collect_queries(keep_statements=True) as stats:
+        yield stats
+    if stats.queries > max_queries:
+        statements = "\n".join(f"  {s.statement}" for s in stats.statements)
+        raise QueryBudgetExceeded(f"{stats.queries} queries, budget is {max_queries}:\n{statements}")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _collectors.get():
+        context._metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    collectors = _collectors.get()
+    start = getattr(context, "_metrics_start", None)
+    if not collectors or start is None:
+        return
+    elapsed = time.perf_counter() - start
+    rows = cursor.rowcount
+    if rows is None or rows < 0:
+        # asyncpg's adapted cursor buffers SELECT results without a rowcount
+        rows = len(getattr(cursor, "_rows", ()))
+    for stats in collectors:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+        stats.rows += rows
+        if stats.statements is not None:
+            stats.statements.append(ExecutedStatement(statement, parameters, elapsed, executemany))
+
+
+def instrument_engine(engine: AsyncEngine):
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@dataclass
+class RouteMetrics:
+    requests: int = 0
+    seconds: float = 0.0
+    buckets: List[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS))
+    queries: int = 0
+    db_seconds: float = 0.0
+    rows: int = 0
+
+    def record(self, seconds: float, stats: QueryStats):
+        self.requests += 1
+        self.seconds += seconds
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+        self.queries += stats.queries
+        self.db_seconds += stats.db_seconds
+        self.rows += stats.rows
+
+
+route_metrics: Dict[Tuple[str, str], RouteMetrics] = {}
+
+
+def response_complete(message) -> bool:
+    """Whether an ASGI send message is the last one of the response body"""
+    return message["type"] == "http.response.body" and not message.get("more_body", False)
+
+
+class MetricsMiddleware:
+    """Records each request when its response has been sent.
+
+    Background tasks (e.g. the next session's pregeneration after a submit)
+    run after that, in the same call: their statements and time are not
+    charged to the route.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        debug_header = settings.metrics_debug_header
+        recorded = False
+
+        def record(stats: QueryStats):
+            nonlocal recorded
+            recorded = True
+            # Route template, so /sessions/{session_id} is one series
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            key = (scope["method"], path)
+            metrics = route_metrics.get(key)
+            if metrics is None:
+                metrics = route_metrics[key] = RouteMetrics()
+            metrics.record(time.perf_counter() - start, stats)
+
+        with collect_queries() as stats:
+            async def send_with_stats(message):
+                if debug_header and message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    value = stats.header(time.perf_counter() - start)
+                    headers.append((STATS_HEADER.lower().encode(), value.encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+                if not recorded and response_complete(message):
+                    record(stats)
+
+            try:
+                await self.app(scope, receive, send_with_stats)
+            finally:
+                # No complete response (error, client gone)
+                if not recorded:
+                    record(stats)
+
+
+def _labels(method: str, route: str, **extra) -> str:
+    labels = {"method": method, "route": route, **extra}
+    return ",".join(f'{name}="{value}"' for name, value in labels.items())
+
+
+def render_prometheus() -> str:
+    lines = [
+        "# HELP vocab_http_request_duration_seconds Request latency by route.",
+        "# TYPE vocab_http_request_duration_seconds histogram",
+    ]
+    items = sorted(route_metrics.items())
+    for (method, route), m in items:
+        for bound, count in zip(LATENCY_BUCKETS, m.buckets):
+            lines.append(f"vocab_http_request_duration_seconds_bucket{{{_labels(method, route, le=bound)}}} {count}")
+        lines.append(f'vocab_http_request_duration_seconds_bucket{{{_labels(method, route, le="+Inf")}}} {m.requests}')
+        lines.append(f"vocab_http_request_duration_seconds_sum{{{_labels(method, route)}}} {m.seconds}")
+        lines.append(f"vocab_http_request_duration_seconds_count{{{_labels(method, route)}}} {m.requests}")
+
+    for name, help_text, attr in (
+        ("vocab_db_queries_total", "SQL statements run by requests, by route.", "queries"),
+        ("vocab_db_seconds_total", "Time spent in SQL statements by requests, by route.", "db_seconds"),
+        ("vocab_db_rows_total", "Rows returned or affected by SQL statements, by route.", "rows"),
+    ):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for (method, route), m in items:
+            lines.append(f"{name}{{{_labels(method, route)}}} {getattr(m, attr)}")
+    return "\n".join(lines) + "\n"
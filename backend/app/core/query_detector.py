@@ -0,0 +1,176 @@
+"""
+N+1 and slow-query detector, for development and CI (QUERY_DETECTOR=true).
+
+`QueryDetectorMiddleware` collects every statement of a request through the
+engine events of metrics.py, plus the ORM lazy loads of relationships seen by
+the Session, until its response is sent (background tasks are left out).
+It then analyzes them, after the request's metrics were recorded, so its own
+work (EXPLAIN included) never shows in the route latency or STATS_HEADER:
+- statements are grouped by shape (the SQL with each run of bind
+  placeholders, as in an expanded IN list, folded into one). A shape run
+  QUERY_DETECTOR_REPEAT times or more is a likely N+1 and is logged;
+- statements slower than SLOW_QUERY_MS are logged with the types of their
+  parameters (not the values) and their EXPLAIN plan.
+
+Findings are accumulated per endpoint in `detector_report`, served on
+/health/queries and written as JSON to QUERY_REPORT_PATH on shutdown, so a
+whole test suite run against the app produces a single report.
+"""
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.metrics import ExecutedStatement, collect_queries, response_complete, uncollected
+
+
+logger = logging.getLogger(__name__)
+
+_PLACEHOLDERS = re.compile(r"(?:\$\d+|%\(\w+\)s|\?)(?:\s*,\s*(?:\$\d+|%\(\w+\)s|\?))*")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """The statement with whitespace normalized and bind placeholder runs folded"""
+    return _PLACEHOLDERS.sub("?", _WHITESPACE.sub(" ", statement).strip())
+
+
+def parameter_shape(parameters: Any) -> List[str]:
+    """Types of the bound parameters, with lengths for collections; never the values"""
+    if isinstance(parameters, dict):
+        parameters = parameters.values()
+    shapes = []
+    for value in parameters or ():
+        name = type(value).__name__
+        if isinstance(value, (list, tuple, set)):
+            name = f"{name}[{len(value)}]"
+        shapes.append(name)
+    return shapes
+
+
+# Relationship loads triggered through the ORM during the current request
+_lazy_loads: ContextVar[Optional[List[str]]] = ContextVar("lazy_loads", default=None)
+
+
+def _on_orm_execute(orm_execute_state):
+    lazy_loads = _lazy_loads.get()
+    if lazy_loads is not None and orm_execute_state.lazy_loaded_from is not None:
+        lazy_loads.append(str(orm_execute_state.loader_strategy_path))
+
+
+@dataclass
+class EndpointReport:
+    requests: int = 0
+    max_queries: int = 0
+    # Shape -> highest number of runs in one request
+    repeated: Dict[str, int] = field(default_factory=dict)
+    # Shape -> {"max_ms", "parameters", "plan"}
+    slow: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # Relationship path -> number of lazy loads
+    lazy_loads: Dict[str, int] = field(default_factory=dict)
+
+
+detector_report: Dict[str, EndpointReport] = {}
+
+
+async def _explain(record: ExecutedStatement) -> List[str]:
+    if record.executemany:
+        return []
+    try:
+        # Plain EXPLAIN only plans the statement, writes are not run
+        with uncollected():
+            async with engine.connect() as conn:
+                rows = await conn.exec_driver_sql(f"EXPLAIN {record.statement}", record.parameters)
+                return [row[0] for row in rows]
+    except Exception as e:
+        return [f"EXPLAIN failed: {e}"]
+
+
+async def analyze(endpoint: str, statements: List[ExecutedStatement], lazy_loads: List[str]):
+    report = detector_report.get(endpoint)
+    if report is None:
+        report = detector_report[endpoint] = EndpointReport()
+    report.requests += 1
+    report.max_queries = max(report.max_queries, len(statements))
+
+    shapes = Counter(statement_shape(record.statement) for record in statements)
+    for shape, count in shapes.items():
+        if count >= settings.QUERY_DETECTOR_REPEAT:
+            if count > report.repeated.get(shape, 0):
+                report.repeated[shape] = count
+            logger.warning("Possible N+1 on %s: %d runs of %s", endpoint, count, shape)
+
+    for path, count in Counter(lazy_loads).items():
+        report.lazy_loads[path] = report.lazy_loads.get(path, 0) + count
+        logger.warning("Lazy load on %s: %s loaded %d times", endpoint, path, count)
+
+    for record in statements:
+        ms = record.seconds * 1000
+        if ms < settings.SLOW_QUERY_MS:
+            continue
+        shape = statement_shape(record.statement)
+        slow = report.slow.get(shape)
+        if slow is not None and slow["max_ms"] >= ms:
+            continue
+        plan = await _explain(record)
+        report.slow[shape] = {"max_ms": round(ms, 1), "parameters": parameter_shape(record.parameters), "plan": plan}
+        logger.warning(
+            "Slow statement on %s (%.1f ms): %s\nparameters: %s\n%s",
+            endpoint, ms, shape, parameter_shape(record.parameters), "\n".join(plan)
+        )
+
+
+class QueryDetectorMiddleware:
+    def __init__(self, app):
+        self.app = app
+        if not event.contains(Session, "do_orm_execute", _on_orm_execute):
+            event.listen(Session, "do_orm_execute", _on_orm_execute)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        lazy_loads: List[str] = []
+        sent: Optional[tuple] = None
+        token = _lazy_loads.set(lazy_loads)
+        try:
+            with collect_queries(keep_statements=True) as stats:
+                async def send_and_snapshot(message):
+                    nonlocal sent
+                    await send(message)
+                    if sent is None and response_complete(message):
+                        sent = (list(stats.statements), list(lazy_loads))
+
+                await self.app(scope, receive, send_and_snapshot)
+        finally:
+            _lazy_loads.reset(token)
+            statements, lazy_loads = sent or (stats.statements, lazy_loads)
+            route = scope.get("route")
+            endpoint = f"{scope['method']} {getattr(route, 'path', None) or 'unmatched'}"
+            # MetricsMiddleware wraps this one: the request is already recorded
+            await analyze(endpoint, statements, lazy_loads)
+
+
+def report_json() -> Dict[str, Any]:
+    return {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "slow_query_ms": settings.SLOW_QUERY_MS,
+        "repeat_threshold": settings.QUERY_DETECTOR_REPEAT,
+        "endpoints": {endpoint: asdict(report) for endpoint, report in sorted(detector_report.items())},
+    }
+
+
+def write_report(path: str):
+    with open(path, "w") as f:
+        json.dump(report_json(), f, indent=2)
+    logger.info("Query detector report written to %s", path)
@@ -0,0 +1,43 @@
+"""
+JSON response class for large, already trusted payloads.
+
+Endpoints returning `FastJSONResponse` bypass FastAPI's response_model
+validation and serialize plain dicts/lists directly, with orjson (it handles
+UUID, datetime and Enum natively and is much faster). Without it, e.g. in a
+bare environment running scripts, the standard json module produces the
+same output.
+"""
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # Declared dependency, the fallback only keeps bare installs working
+    orjson = None
+
+
+def _default(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def json_dumps(content: Any) -> bytes:
+    if orjson is not None:
+        # orjson only handles exact uuid.UUID natively; asyncpg returns a subclass
+        return orjson.dumps(content, default=_default)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
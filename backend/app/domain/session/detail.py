@@ -0,0 +1,73 @@
+"""
+Assembly of SessionDetail responses from already loaded rows.
+
+Translations and languages come from the vocab catalog cache, so a response
+costs no query beyond the session words themselves (none at all when the
+caller already holds them, as start_session does). The content is a plain
+dict with the SessionDetail layout, built from already validated objects and
+returned through FastJSONResponse, so it is not validated again.
+"""
+from typing import Dict, Sequence
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.vocab.catalog import vocab_catalog
+from app.domain.vocab.schemas import TranslationSchema
+from .models import Session, SessionWord
+
+
+def _translation_detail(translation: TranslationSchema, languages: Dict[str, dict]) -> dict:
+    # Cached rows are already validated, their field values are used as-is
+    return {**translation.__dict__, "language": languages[translation.language_code]}
+
+
+async def build_session_detail(db: AsyncSession, session: Session, words: Sequence[SessionWord]) -> dict:
+    """SessionDetail-shaped content, for FastJSONResponse (no re-validation)"""
+    translation_ids = {w.translation_from_id for w in words} | {w.translation_to_id for w in words}
+    translations: Dict[UUID, TranslationSchema] = await vocab_catalog.translations(db, translation_ids)
+    languages = {code: language.__dict__ for code, language in (await vocab_catalog.languages(db)).items()}
+
+    results = [
+        {
+            "id": w.id,
+            "session_id": w.session_id,
+            "translation_from_id": w.translation_from_id,
+            "translation_to_id": w.translation_to_id,
+            "from_language": w.from_language,
+            "to_language": w.to_language,
+            "correct": w.correct,
+            "user_answer": w.user_answer,
+            "created_at": w.created_at,
+            "translation_from": _translation_detail(translations[w.translation_from_id], languages),
+            "translation_to": _translation_detail(translations[w.translation_to_id], languages),
+        }
+        for w in words
+    ]
+    return {
+        "source_lang_code": session.source_lang_code,
+        "target_lang_code": session.target_lang_code,
+        "domain": session.domain,
+        "difficulty": session.difficulty,
+        "session_type": session.session_type,
+        "id": session.id,
+        "user_id": session.user_id,
+        "config_id": session.config_id,
+        "created_at": session.created_at,
+        "score": session.score,
+        "completed_at": session.completed_at,
+        "results": results,
+    }
+
+
+async def load_session_detail(db: AsyncSession, session: Session) -> dict:
+    """Load a session's words (one query) and assemble its detail"""
+    stmt = (
+        select(SessionWord)
+        .where(SessionWord.session_id == session.id)
+        .order_by(SessionWord.created_at)
+        .execution_options(populate_existing=True)
+    )
+    words = (await db.execute(stmt)).scalars().all()
+    return await build_session_detail(db, session, words)
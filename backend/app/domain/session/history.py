@@ -0,0 +1,79 @@
+"""
+Keyset pagination of a user's session history.
+
+Pages are ordered by (created_at, id) descending and the cursor is the key
+of the last row of the previous page, so fetching any page is an index
+range scan on ix_sessions_user_created of at most `limit + 1` rows,
+however deep the page. Without a limit the whole history is one page.
+"""
+import base64
+from datetime import datetime
+from typing import Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Session
+from .schemas import SessionSchema
+
+
+# Columns a list item may contain, the ones SessionSchema exposes
+SESSION_LIST_FIELDS = tuple(SessionSchema.model_fields)
+
+Cursor = Tuple[datetime, UUID]
+
+
+def encode_cursor(created_at: datetime, session_id: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{session_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """Parse a cursor from encode_cursor, raises ValueError if it is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, session_id = raw.split("|")
+        return datetime.fromisoformat(created_at), UUID(session_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def parse_fields(fields: Optional[str]) -> Sequence[str]:
+    """Comma-separated projection, raises ValueError on unknown fields"""
+    if not fields:
+        return SESSION_LIST_FIELDS
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in SESSION_LIST_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return requested
+
+
+async def list_sessions(
+    db: AsyncSession,
+    user_id: UUID,
+    limit: Optional[int],
+    cursor: Optional[Cursor] = None,
+    fields: Iterable[str] = SESSION_LIST_FIELDS
+) -> Tuple[List[dict], Optional[str]]:
+    """One page of the user's sessions as dicts of `fields`, and the next page's cursor"""
+    fields = list(fields)
+    # The key columns are always read, the cursor is built from them
+    columns = dict.fromkeys(fields + ["created_at", "id"])
+    query = (
+        select(*(Session.__table__.c[name] for name in columns))
+        .where(Session.user_id == user_id)
+        .order_by(Session.created_at.desc(), Session.id.desc())
+    )
+    if limit is not None:
+        query = query.limit(limit + 1)
+    if cursor is not None:
+        query = query.where(tuple_(Session.created_at, Session.id) < tuple_(*cursor))
+
+    rows = (await db.execute(query)).mappings().all()
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+    return [{name: row[name] for name in fields} for row in rows], next_cursor
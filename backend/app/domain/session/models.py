@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, Boolean, UniqueConstraint
+from sqlalchemy import Column, Integer, Float, String, ForeignKey, Date, DateTime, Enum, Boolean, UniqueConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -47,6 +47,11 @@ class Session(Base):
     source_language = relationship("Language", foreign_keys=[source_lang_code])
     target_language = relationship("Language", foreign_keys=[target_lang_code])
     results = relationship("SessionWord", back_populates="session", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # Keyset pagination of the history, see history.py
+        Index('ix_sessions_user_created', 'user_id', 'created_at', 'id'),
+    )
 
 
 class SessionWord(Base):
@@ -77,9 +82,51 @@ class UserProgress(Base):
     incorrect_count = Column(Integer, default=0)
     last_reviewed = Column(DateTime, default=datetime.utcnow)
     
+    # Spaced-repetition schedule, see scheduler.py
+    ease = Column(Float, nullable=False, default=2.5, server_default="2.5")
+    interval_days = Column(Float, nullable=False, default=0, server_default="0")
+    repetitions = Column(Integer, nullable=False, default=0, server_default="0")
+    due_at = Column(DateTime, nullable=True)
+    
     user = relationship("User")
     translation = relationship("Translation")
     
     __table_args__ = (
         UniqueConstraint('user_id', 'translation_id', name='unique_user_translation_progress'),
+        Index('ix_user_progress_user_due', 'user_id', 'due_at'),
+        Index(
+            'ix_user_progress_user_incorrect',
+            'user_id', incorrect_count.desc().nulls_last(),
+            postgresql_include=['correct_count', 'translation_id']
+        ),
     )
+
+
+class UserStats(Base):
+    """Per-user totals and streaks, maintained on submit (see rollup.py)"""
+    __tablename__ = "user_stats"
+
+    id = None
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    words_reviewed = Column(Integer, nullable=False, default=0, server_default="0")
+    correct_count = Column(Integer, nullable=False, default=0, server_default="0")
+    incorrect_count = Column(Integer, nullable=False, default=0, server_default="0")
+    sessions_completed = Column(Integer, nullable=False, default=0, server_default="0")
+    current_streak = Column(Integer, nullable=False, default=0, server_default="0")  # Days, ending on last_active_date
+    longest_streak = Column(Integer, nullable=False, default=0, server_default="0")
+    last_active_date = Column(Date, nullable=True)  # Last day (UTC) with a completed session
+
+
+class UserStatsBreakdown(Base):
+    """Per-user counts by language or by domain, maintained on submit (see rollup.py)"""
+    __tablename__ = "user_stats_breakdown"
+
+    id = None
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    dimension = Column(String, primary_key=True)  # 'language' or 'domain'
+    code = Column(String, primary_key=True)  # Language or domain code
+    words_reviewed = Column(Integer, nullable=False, default=0, server_default="0")
+    correct_count = Column(Integer, nullable=False, default=0, server_default="0")
+    incorrect_count = Column(Integer, nullable=False, default=0, server_default="0")
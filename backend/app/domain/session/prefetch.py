@@ -0,0 +1,174 @@
+"""
+Word selection for new sessions, and pre-generation of the next one.
+
+Users usually start another session with the same settings right after
+submitting one. The submit endpoint therefore schedules `pregenerate_session`
+as a background task: once the answers are committed it picks the next word
+set (due queue first, then a catalog sample) and keeps it as the user's
+pending session. `start_session` claims it when the new config has the same
+settings, and falls back to `choose_words` otherwise. It reads the config
+and the user's due words with one statement (`load_config`), so a warm start
+runs three: that one and the session and words inserts.
+
+A pending session is dropped when:
+- it is older than PENDING_SESSION_TTL_SECONDS (words that became due in the
+  meantime are picked up by the next session);
+- the user's progress changes, i.e. on every submit, before the next one is
+  generated. A word set still being chosen for an earlier submit is not
+  stored either (each submit is numbered, see `PendingSessions.discard`);
+- the vocab catalog was invalidated after its words were chosen.
+
+Pending sessions live in process memory, like the catalog they are checked
+against, so with several workers a start served by another worker is a miss.
+Hit rate and discards are reported by /health/caches.
+"""
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import Cache, MemoryBackend
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.domain.vocab.catalog import VocabCatalog, WordPair, vocab_catalog
+from .models import SessionConfig
+from .scheduler import config_due_query, due_pairs
+
+
+logger = logging.getLogger(__name__)
+
+WORDS_PER_DIFFICULTY = {
+    "EASY": 10,
+    "MEDIUM": 15,
+    "HARD": 20
+}
+
+
+def config_key(source_lang: str, target_lang: str, domain: Optional[str], difficulty: Optional[str], session_type) -> str:
+    """Settings of a session config that decide its words, normalized like the catalog's"""
+    _, _, domain, difficulty = VocabCatalog.key(source_lang, target_lang, domain, difficulty)
+    session_type = getattr(session_type, "value", session_type)
+    return f"{source_lang}|{target_lang}|{domain or ''}|{difficulty or ''}|{session_type}"
+
+
+async def load_config(
+    db: AsyncSession, config_id: UUID, user_id: UUID
+) -> Tuple[Optional[SessionConfig], List[WordPair]]:
+    """A session config and the user's due word pairs for it, in one statement"""
+    rows = (await db.execute(config_due_query(config_id, user_id, max(WORDS_PER_DIFFICULTY.values())))).all()
+    if not rows:
+        return None, []
+    config = rows[0][0]
+    due = [tuple(row[1:]) for row in rows if row[1] is not None]
+    return config, due[:WORDS_PER_DIFFICULTY.get(config.difficulty, 10)]
+
+
+async def choose_words(
+    db: AsyncSession,
+    user_id: UUID,
+    source_lang: str,
+    target_lang: str,
+    domain: Optional[str],
+    difficulty: Optional[str],
+    due: Optional[List[WordPair]] = None
+) -> List[WordPair]:
+    """Word pairs of a new session: the user's due words first, then catalog words
+
+    `due` are the due words when the caller already has them (`load_config`).
+    """
+    num_words = WORDS_PER_DIFFICULTY.get(difficulty, 10)
+
+    # Words due for review come first (top-N of the user's due queue)
+    if due is None:
+        due = await due_pairs(
+            db, user_id, source_lang, target_lang,
+            domain=domain, difficulty=difficulty, limit=num_words
+        )
+    selected_pairs = list(due)
+
+    # Fill up with master words that have translations in BOTH languages from
+    # the in-process catalog, so no query is needed once the entry is warm
+    if len(selected_pairs) < num_words:
+        catalog_entry = await vocab_catalog.get(db, source_lang, target_lang, domain, difficulty)
+        due_concepts = {concept for concept, _, _ in selected_pairs}
+        candidates = catalog_entry.sample(num_words + len(selected_pairs))
+        selected_pairs += [p for p in candidates if p[0] not in due_concepts][:num_words - len(selected_pairs)]
+
+    return selected_pairs
+
+
+class PendingSessions(Cache):
+    """One pre-generated word set per user, claimed at most once"""
+
+    def __init__(self, ttl: float, max_size: int):
+        super().__init__("pending_session", MemoryBackend(max_size), ttl)
+        self.max_size = max_size
+        # Number of the user's latest submit; a user missing here never stores
+        self._submits: "OrderedDict[UUID, int]" = OrderedDict()
+        self.generated = 0
+        self.discarded = 0
+
+    async def store(self, user_id: UUID, key: str, pairs: List[WordPair], generation: int, submit: int):
+        """Keep the words chosen after the given submit, unless the user submitted again since"""
+        if self._submits.get(user_id) != submit:
+            self.discarded += 1
+            return
+        await self.set(str(user_id), {"config": key, "pairs": pairs, "generation": generation})
+        self.generated += 1
+
+    async def claim(self, user_id: UUID, key: str) -> Optional[List[WordPair]]:
+        """Take the user's pending words if they were chosen for these settings and are still valid"""
+        entry = await self.backend.get(self._key(str(user_id)))
+        if entry is None:
+            self.misses += 1
+            return None
+        await self.delete(str(user_id))
+        if entry["config"] != key or entry["generation"] != vocab_catalog.generation:
+            self.discarded += 1
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["pairs"]
+
+    async def discard(self, user_id: UUID) -> int:
+        """Drop the user's pending words on a submit, returns the submit's number"""
+        submit = self._submits.pop(user_id, 0) + 1
+        self._submits[user_id] = submit
+        while len(self._submits) > self.max_size:
+            self._submits.popitem(last=False)
+        await self.delete(str(user_id))
+        return submit
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "generated": self.generated, "discarded": self.discarded}
+
+
+pending_sessions = PendingSessions(settings.PENDING_SESSION_TTL_SECONDS, settings.PENDING_SESSION_MAX_SIZE)
+
+
+async def pregenerate_session(
+    user_id: UUID,
+    source_lang: str,
+    target_lang: str,
+    domain: Optional[str],
+    difficulty: Optional[str],
+    session_type,
+    submit: int
+):
+    """Background task run after a submit: choose the user's next session words
+
+    `submit` is the number `PendingSessions.discard` gave that submit.
+    """
+    generation = vocab_catalog.generation
+    try:
+        # Own session: the request's one is closed by the time this runs
+        async with AsyncSessionLocal() as db:
+            pairs = await choose_words(db, user_id, source_lang, target_lang, domain, difficulty)
+    except Exception:
+        logger.exception("Pre-generating the next session of user %s failed", user_id)
+        return
+    if pairs:
+        key = config_key(source_lang, target_lang, domain, difficulty, session_type)
+        await pending_sessions.store(user_id, key, pairs, generation, submit)
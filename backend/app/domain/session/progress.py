@@ -0,0 +1,90 @@
+"""
+Set-based recording of submitted session results.
+
+A submit writes the answers with one UPDATE ... FROM (VALUES ...) and the
+per-user progress with one INSERT ... ON CONFLICT DO UPDATE, whatever the
+number of words. The upsert increments counters and reschedules reviews
+(see scheduler.py) in the database, so two concurrent submits never race on
+unique_user_translation_progress.
+"""
+from datetime import datetime
+from typing import Iterable, List, NamedTuple
+from uuid import UUID
+
+from sqlalchemy import Boolean, String, column, func, literal_column, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import SessionWord, UserProgress
+from .scheduler import first_review, review_assignments
+from .schemas import SessionWordCreate
+
+
+class Review(NamedTuple):
+    translation_id: UUID
+    correct: bool
+    first: bool  # The user's first answer for this translation
+
+
+async def record_session_results(
+    db: AsyncSession,
+    session_id: UUID,
+    user_id: UUID,
+    words: Iterable[SessionWordCreate]
+) -> List[Review]:
+    """Store answers and update progress, returns a Review per matched word"""
+    # One answer per word, the last submitted one wins
+    submitted = {w.translation_to_id: w for w in words}
+    if not submitted:
+        return []
+    now = datetime.utcnow()
+
+    answers = values(
+        column("translation_to_id", PG_UUID(as_uuid=True)),
+        column("correct", Boolean),
+        column("user_answer", String),
+        name="answers"
+    ).data([(w.translation_to_id, w.correct, w.user_answer) for w in submitted.values()])
+
+    stmt_results = (
+        update(SessionWord)
+        .where(
+            SessionWord.session_id == session_id,
+            SessionWord.translation_to_id == answers.c.translation_to_id
+        )
+        .values(correct=answers.c.correct, user_answer=answers.c.user_answer, updated_at=now)
+        .returning(SessionWord.translation_to_id, SessionWord.correct)
+        .execution_options(synchronize_session=False)
+    )
+    answered = [(row[0], bool(row[1])) for row in (await db.execute(stmt_results)).all()]
+    if not answered:
+        return []
+
+    # Sorted so concurrent submits lock progress rows in the same order
+    progress_rows = [
+        {
+            "user_id": user_id,
+            "translation_id": translation_id,
+            "correct_count": 1 if correct else 0,
+            "incorrect_count": 0 if correct else 1,
+            "last_reviewed": now,
+            **first_review(correct, now),
+        }
+        for translation_id, correct in sorted(answered, key=lambda a: a[0])
+    ]
+    progress = UserProgress.__table__
+    stmt_progress = insert(progress).values(progress_rows)
+    stmt_progress = stmt_progress.on_conflict_do_update(
+        constraint="unique_user_translation_progress",
+        set_={
+            "correct_count": func.coalesce(progress.c.correct_count, 0) + stmt_progress.excluded.correct_count,
+            "incorrect_count": func.coalesce(progress.c.incorrect_count, 0) + stmt_progress.excluded.incorrect_count,
+            "last_reviewed": stmt_progress.excluded.last_reviewed,
+            **review_assignments(progress, stmt_progress.excluded),
+            "updated_at": now,
+        }
+    ).returning(progress.c.translation_id, literal_column("xmax = 0", Boolean))
+    # xmax is 0 for rows the upsert inserted rather than updated
+    first_reviews = {row[0]: bool(row[1]) for row in (await db.execute(stmt_progress)).all()}
+
+    return [Review(translation_id, correct, first_reviews[translation_id]) for translation_id, correct in answered]
@@ -0,0 +1,245 @@
+"""
+Per-user stats rollup (user_stats and user_stats_breakdown).
+
+submit_session applies the deltas of each submit in its own transaction:
+one upsert of the user's totals and streak, and one upsert of the
+per-language and per-domain counts. Both tables can be rebuilt in bulk from
+user_progress and sessions with `rebuild_user_stats`, and compared with
+them with `check_user_stats`.
+
+Both paths use the same definitions:
+- words_reviewed counts progress rows, i.e. distinct translations answered
+- correct_count / incorrect_count are sums of the progress counters
+- sessions_completed counts sessions with completed_at set
+- a streak is a run of consecutive days (UTC) with a completed session;
+  current_streak is the run ending on last_active_date
+"""
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import Boolean, Date, Integer, case, cast, column, delete, except_, func, literal, select, union_all, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, aggregate_order_by, array_agg, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.vocab.models import MasterWord, Translation
+from .models import Session, UserProgress, UserStats, UserStatsBreakdown
+from .progress import Review
+
+
+STATS_COLUMNS = (
+    "user_id", "words_reviewed", "correct_count", "incorrect_count",
+    "sessions_completed", "current_streak", "longest_streak", "last_active_date",
+)
+BREAKDOWN_COLUMNS = ("user_id", "dimension", "code", "words_reviewed", "correct_count", "incorrect_count")
+COUNT_COLUMNS = ("words_reviewed", "correct_count", "incorrect_count")
+
+
+def current_streak(stats: Optional[UserStats], today: date) -> int:
+    """Streak as of today: the stored run only counts if it reaches yesterday"""
+    if stats is None or stats.last_active_date is None or stats.last_active_date < today - timedelta(days=1):
+        return 0
+    return stats.current_streak
+
+
+async def update_user_stats(
+    db: AsyncSession,
+    user_id: UUID,
+    reviews: Sequence[Review],
+    completed: bool,
+    now: datetime
+):
+    """Apply one submit: its reviews, and a session completion if it is the first submit"""
+    if not reviews and not completed:
+        return
+    today = now.date()
+
+    stats = UserStats.__table__
+    stmt_stats = insert(stats).values(
+        user_id=user_id,
+        words_reviewed=sum(1 for r in reviews if r.first),
+        correct_count=sum(1 for r in reviews if r.correct),
+        incorrect_count=sum(1 for r in reviews if not r.correct),
+        sessions_completed=1 if completed else 0,
+        current_streak=1 if completed else 0,
+        longest_streak=1 if completed else 0,
+        last_active_date=today if completed else None,
+        created_at=now,
+        updated_at=now,
+    )
+    set_ = {name: stats.c[name] + stmt_stats.excluded[name] for name in COUNT_COLUMNS + ("sessions_completed",)}
+    if completed:
+        streak = case(
+            (stats.c.last_active_date == today, stats.c.current_streak),
+            (stats.c.last_active_date == today - timedelta(days=1), stats.c.current_streak + 1),
+            else_=1
+        )
+        set_.update(
+            current_streak=streak,
+            longest_streak=func.greatest(stats.c.longest_streak, streak),
+            last_active_date=today,
+        )
+    set_["updated_at"] = now
+    await db.execute(stmt_stats.on_conflict_do_update(index_elements=[stats.c.user_id], set_=set_))
+
+    if not reviews:
+        return
+
+    deltas = values(
+        column("translation_id", PG_UUID(as_uuid=True)),
+        column("correct", Boolean),
+        column("first", Boolean),
+        name="reviews"
+    ).data([(r.translation_id, r.correct, r.first) for r in reviews])
+    counts = (
+        func.count().filter(deltas.c.first),
+        func.count().filter(deltas.c.correct),
+        func.count().filter(~deltas.c.correct),
+        literal(now),
+        literal(now),
+    )
+    by_language = (
+        select(literal(user_id, PG_UUID(as_uuid=True)), literal("language"), Translation.language_code, *counts)
+        .select_from(deltas)
+        .join(Translation, Translation.id == deltas.c.translation_id)
+        .group_by(Translation.language_code)
+    )
+    by_domain = (
+        select(literal(user_id, PG_UUID(as_uuid=True)), literal("domain"), MasterWord.domain_code, *counts)
+        .select_from(deltas)
+        .join(Translation, Translation.id == deltas.c.translation_id)
+        .join(MasterWord, MasterWord.concept == Translation.master_word_concept)
+        .group_by(MasterWord.domain_code)
+    )
+
+    breakdown = UserStatsBreakdown.__table__
+    stmt_breakdown = insert(breakdown).from_select(
+        [breakdown.c[name] for name in BREAKDOWN_COLUMNS + ("created_at", "updated_at")],
+        union_all(by_language, by_domain)
+    )
+    stmt_breakdown = stmt_breakdown.on_conflict_do_update(
+        index_elements=[breakdown.c.user_id, breakdown.c.dimension, breakdown.c.code],
+        set_={
+            **{name: breakdown.c[name] + stmt_breakdown.excluded[name] for name in COUNT_COLUMNS},
+            "updated_at": now,
+        }
+    )
+    await db.execute(stmt_breakdown)
+
+
+def expected_user_stats():
+    """SELECT producing the rows user_stats should contain"""
+    progress = (
+        select(
+            UserProgress.user_id,
+            func.count().label("words_reviewed"),
+            func.coalesce(func.sum(UserProgress.correct_count), 0).label("correct_count"),
+            func.coalesce(func.sum(UserProgress.incorrect_count), 0).label("incorrect_count")
+        )
+        .group_by(UserProgress.user_id)
+        .cte("progress_totals")
+    )
+
+    # Streaks are islands of consecutive active days: within a run, day minus
+    # its rank is constant
+    days = (
+        select(Session.user_id, cast(Session.completed_at, Date).label("day"), func.count().label("sessions"))
+        .where(Session.completed_at.isnot(None))
+        .group_by(Session.user_id, cast(Session.completed_at, Date))
+        .cte("active_days")
+    )
+    runs = select(
+        days.c.user_id,
+        days.c.day,
+        days.c.sessions,
+        (days.c.day - cast(func.row_number().over(partition_by=days.c.user_id, order_by=days.c.day), Integer)).label("run")
+    ).cte("runs")
+    islands = (
+        select(
+            runs.c.user_id,
+            func.count().label("length"),
+            func.max(runs.c.day).label("last_day"),
+            func.sum(runs.c.sessions).label("sessions")
+        )
+        .group_by(runs.c.user_id, runs.c.run)
+        .cte("islands")
+    )
+    activity = (
+        select(
+            islands.c.user_id,
+            func.sum(islands.c.sessions).label("sessions_completed"),
+            array_agg(aggregate_order_by(islands.c.length, islands.c.last_day.desc()))[1].label("current_streak"),
+            func.max(islands.c.length).label("longest_streak"),
+            func.max(islands.c.last_day).label("last_active_date")
+        )
+        .group_by(islands.c.user_id)
+        .cte("activity")
+    )
+
+    return select(
+        func.coalesce(progress.c.user_id, activity.c.user_id),
+        func.coalesce(progress.c.words_reviewed, 0),
+        func.coalesce(progress.c.correct_count, 0),
+        func.coalesce(progress.c.incorrect_count, 0),
+        func.coalesce(activity.c.sessions_completed, 0),
+        func.coalesce(activity.c.current_streak, 0),
+        func.coalesce(activity.c.longest_streak, 0),
+        activity.c.last_active_date,
+    ).select_from(progress.outerjoin(activity, activity.c.user_id == progress.c.user_id, full=True))
+
+
+def expected_breakdown():
+    """SELECT producing the rows user_stats_breakdown should contain"""
+    def grouped(dimension: str, code_column, with_domain: bool):
+        query = (
+            select(
+                UserProgress.user_id,
+                literal(dimension),
+                code_column,
+                func.count(),
+                func.coalesce(func.sum(UserProgress.correct_count), 0),
+                func.coalesce(func.sum(UserProgress.incorrect_count), 0)
+            )
+            .select_from(UserProgress)
+            .join(Translation, Translation.id == UserProgress.translation_id)
+        )
+        if with_domain:
+            query = query.join(MasterWord, MasterWord.concept == Translation.master_word_concept)
+        return query.group_by(UserProgress.user_id, code_column)
+
+    return union_all(
+        grouped("language", Translation.language_code, with_domain=False),
+        grouped("domain", MasterWord.domain_code, with_domain=True),
+    )
+
+
+async def rebuild_user_stats(db: AsyncSession):
+    """Recompute both rollup tables from user_progress and sessions"""
+    now = datetime.utcnow()
+    for model, columns, expected in (
+        (UserStats, STATS_COLUMNS, expected_user_stats()),
+        (UserStatsBreakdown, BREAKDOWN_COLUMNS, expected_breakdown()),
+    ):
+        table = model.__table__
+        await db.execute(delete(table))
+        rows = select(*expected.subquery().c, literal(now), literal(now))
+        await db.execute(
+            insert(table).from_select([table.c[name] for name in columns + ("created_at", "updated_at")], rows)
+        )
+
+
+async def check_user_stats(db: AsyncSession) -> Dict[str, Tuple[int, int]]:
+    """Compare the rollup with its sources, returns {table: (missing rows, stale rows)}"""
+    result = {}
+    for model, columns, expected in (
+        (UserStats, STATS_COLUMNS, expected_user_stats()),
+        (UserStatsBreakdown, BREAKDOWN_COLUMNS, expected_breakdown()),
+    ):
+        table = model.__table__
+        stored = select(*(table.c[name] for name in columns))
+        missing = except_(expected, stored).subquery()
+        stale = except_(stored, expected).subquery()
+        missing_count = (await db.execute(select(func.count()).select_from(missing))).scalar_one()
+        stale_count = (await db.execute(select(func.count()).select_from(stale))).scalar_one()
+        result[table.name] = (missing_count, stale_count)
+    return result
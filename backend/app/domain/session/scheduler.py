@@ -0,0 +1,167 @@
+"""
+Spaced-repetition scheduling (SM-2) on UserProgress.
+
+Each progress row carries an ease factor, the current interval, the number
+of successful reviews in a row and the date it is due again. Answers are
+binary, so a correct one is graded CORRECT_GRADE and a wrong one
+INCORRECT_GRADE on SM-2's 0-5 scale.
+
+The update is written as SQL expressions used in the ON CONFLICT clause of
+the progress upsert, so every word of a submit is rescheduled by the same
+single statement. `first_review` is the same computation for rows the
+upsert inserts; the two must be kept in sync.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import Interval, Table, and_, case, func, literal_column, or_, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.vocab.catalog import CUMULATIVE_DIFFICULTIES, VocabCatalog, WordPair
+from app.domain.vocab.models import ConceptLanguagePair
+from .models import SessionConfig, UserProgress
+
+
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+CORRECT_GRADE = 5
+INCORRECT_GRADE = 2
+FIRST_INTERVAL_DAYS = 1.0
+SECOND_INTERVAL_DAYS = 6.0
+RELEARN_INTERVAL_DAYS = 1.0
+
+ONE_DAY = literal_column("interval '1 day'", Interval)
+
+
+def ease_delta(grade: int) -> float:
+    """SM-2 change of the ease factor for a grade between 0 and 5"""
+    return 0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02)
+
+
+CORRECT_EASE_DELTA = ease_delta(CORRECT_GRADE)
+INCORRECT_EASE_DELTA = ease_delta(INCORRECT_GRADE)
+
+
+def first_review(correct: bool, now: datetime) -> Dict[str, Any]:
+    """Schedule of a word reviewed for the first time"""
+    ease = max(MIN_EASE, INITIAL_EASE + (CORRECT_EASE_DELTA if correct else INCORRECT_EASE_DELTA))
+    interval = FIRST_INTERVAL_DAYS if correct else RELEARN_INTERVAL_DAYS
+    return {
+        "ease": ease,
+        "interval_days": interval,
+        "repetitions": 1 if correct else 0,
+        "due_at": now + timedelta(days=interval),
+    }
+
+
+def review_assignments(progress: Table, excluded) -> Dict[str, Any]:
+    """SET clause rescheduling existing rows from the answer in `excluded`
+
+    `excluded` is the upsert's EXCLUDED row: correct_count is 1 for a correct
+    answer and 0 otherwise, last_reviewed is the review time. All
+    expressions read the row's values from before the update.
+    """
+    correct = excluded.correct_count > 0
+    ease = func.greatest(
+        MIN_EASE,
+        progress.c.ease + case((correct, CORRECT_EASE_DELTA), else_=INCORRECT_EASE_DELTA)
+    )
+    interval = case(
+        (~correct, RELEARN_INTERVAL_DAYS),
+        (progress.c.repetitions == 0, FIRST_INTERVAL_DAYS),
+        (progress.c.repetitions == 1, SECOND_INTERVAL_DAYS),
+        else_=progress.c.interval_days * ease
+    )
+    return {
+        "ease": ease,
+        "interval_days": interval,
+        "repetitions": case((correct, progress.c.repetitions + 1), else_=0),
+        "due_at": excluded.last_reviewed + interval * ONE_DAY,
+    }
+
+
+def _due_select(user_id: UUID, now: Optional[datetime], limit: int, *filters):
+    return (
+        select(
+            ConceptLanguagePair.concept,
+            ConceptLanguagePair.from_translation_id,
+            ConceptLanguagePair.to_translation_id,
+            UserProgress.due_at
+        )
+        .select_from(UserProgress)
+        .join(ConceptLanguagePair, ConceptLanguagePair.to_translation_id == UserProgress.translation_id)
+        .where(
+            UserProgress.user_id == user_id,
+            UserProgress.due_at <= (now or datetime.utcnow()),
+            *filters
+        )
+        .order_by(UserProgress.due_at)
+        .limit(limit)
+    )
+
+
+def due_query(
+    user_id: UUID,
+    source_lang: str,
+    target_lang: str,
+    domain: Optional[str] = None,
+    difficulty: Optional[str] = None,
+    limit: int = 10,
+    now: Optional[datetime] = None
+):
+    """SELECT of the user's most overdue word pairs for a session config, oldest due first
+
+    Walks ix_user_progress_user_due in due_at order and stops after `limit`
+    matches, so the cost does not grow with the user's history.
+    """
+    _, _, domain, difficulty = VocabCatalog.key(source_lang, target_lang, domain, difficulty)
+    filters = [ConceptLanguagePair.source_lang == source_lang, ConceptLanguagePair.target_lang == target_lang]
+    if domain:
+        filters.append(ConceptLanguagePair.domain_code == domain)
+    if difficulty:
+        filters.append(ConceptLanguagePair.difficulty.in_(CUMULATIVE_DIFFICULTIES[difficulty]))
+    return _due_select(user_id, now, limit, *filters)
+
+
+def config_due_query(config_id: UUID, user_id: UUID, limit: int, now: Optional[datetime] = None):
+    """SELECT of a session config together with the user's most overdue word pairs for it
+
+    One row per due pair, oldest first, or a single row with NULL pair
+    columns when nothing is due, so a session start reads both in one
+    statement. The filters are `due_query`'s, taken from the config's
+    columns (normalized as VocabCatalog.key does). LIMIT can't depend on the
+    config: `limit` must cover the largest session, callers trim the rest.
+    """
+    config = SessionConfig
+    domain_filter = or_(
+        config.domain.is_(None), config.domain.in_(["", "ALL"]),
+        ConceptLanguagePair.domain_code == config.domain
+    )
+    difficulty_filter = or_(
+        config.difficulty.is_(None), config.difficulty.notin_(list(CUMULATIVE_DIFFICULTIES)),
+        *(
+            and_(config.difficulty == name, ConceptLanguagePair.difficulty.in_(levels))
+            for name, levels in CUMULATIVE_DIFFICULTIES.items()
+        )
+    )
+    due = _due_select(
+        user_id, now, limit,
+        ConceptLanguagePair.source_lang == config.native_language,
+        ConceptLanguagePair.target_lang == config.language_tested,
+        domain_filter,
+        difficulty_filter
+    ).lateral("due")
+    return (
+        select(config, due.c.concept, due.c.from_translation_id, due.c.to_translation_id)
+        .select_from(config)
+        .outerjoin(due, true())
+        .where(config.id == config_id)
+        .order_by(due.c.due_at)
+    )
+
+
+async def due_pairs(db: AsyncSession, user_id: UUID, source_lang: str, target_lang: str, **filters) -> List[WordPair]:
+    """Word pairs due for review, see `due_query` for the filters"""
+    rows = (await db.execute(due_query(user_id, source_lang, target_lang, **filters))).all()
+    return [tuple(row[:3]) for row in rows]
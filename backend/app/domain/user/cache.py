@@ -0,0 +1,79 @@
+"""
+Cache of authenticated users, keyed by token subject (the email).
+
+Entries hold the user's column values as JSON-compatible data, not the ORM
+instance, so they can live in a shared backend and be attached to any
+request's session. The password hash is left out: it has no business outside
+the database, and login reads it from there. Writers to a user row must call
+`invalidate_user` after committing.
+"""
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.cache import Cache, create_backend
+from app.core.config import settings
+from .models import User
+
+
+user_cache = Cache(
+    "user",
+    create_backend(settings.USER_CACHE_MAX_SIZE),
+    ttl=settings.USER_CACHE_TTL_SECONDS
+)
+
+
+# Cached columns and their Python types; hashed_password stays unloaded on cached users
+CACHED_COLUMNS = {
+    attr.key: attr.columns[0].type.python_type
+    for attr in inspect(User).column_attrs
+    if attr.key != "hashed_password"
+}
+
+
+def _user_data(user: User) -> Dict[str, Any]:
+    data = {}
+    for key in CACHED_COLUMNS:
+        value = getattr(user, key)
+        if isinstance(value, UUID):
+            value = str(value)
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        data[key] = value
+    return data
+
+
+def _user_from_data(data: Dict[str, Any]) -> User:
+    values = {}
+    for key, value in data.items():
+        python_type = CACHED_COLUMNS[key]
+        if value is not None and python_type is UUID:
+            value = UUID(value)
+        elif value is not None and python_type is datetime:
+            value = datetime.fromisoformat(value)
+        values[key] = value
+    return User(**values)
+
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    """User for a token subject, from the cache when possible"""
+    data = await user_cache.get(email)
+    if data is not None:
+        user = _user_from_data(data)
+        make_transient_to_detached(user)
+        # Attached as persistent without a SELECT, so handlers can still modify and commit it
+        return await db.merge(user, load=False)
+
+    result = await db.execute(select(User).where(User.email == email))
+    user = result.scalar_one_or_none()
+    if user is not None:
+        await user_cache.set(email, _user_data(user))
+    return user
+
+
+async def invalidate_user(email: str):
+    await user_cache.delete(email)
@@ -35,4 +35,13 @@ class UserLanguage(Base):
     language_code = Column(String, ForeignKey("languages.code"), nullable=False)
     level = Column(Enum(LanguageLevelEnum), nullable=False)
     is_learning = Column(Boolean, default=True)
-    
\ No newline at end of file
+    
+
+class RevokedToken(Base):
+    """Access tokens revoked before their expiry, e.g. on logout (see revocation.py)"""
+    __tablename__ = "revoked_tokens"
+
+    id = None
+
+    jti = Column(String, primary_key=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
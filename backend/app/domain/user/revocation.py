@@ -0,0 +1,158 @@
+"""
+Revocation of access tokens before their expiry (logout).
+
+Revoked token ids (the jti claim) are written to the revoked_tokens table and
+kept by every process in an in-memory dict, so checking a token is a single
+lookup with no round trip. Processes learn about revocations made elsewhere
+through a NOTIFY on REVOCATION_CHANNEL, like the vocab catalog, and reload the
+table every REVOCATION_SYNC_SECONDS in case a notification was missed (e.g.
+no listener behind a transaction-mode pooler). A lost listener connection is
+reopened, and the table reloaded once it is.
+
+An entry is only needed until its token expires: expired ids are dropped from
+memory on every reload, and from the table on the next revocation.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine
+from .models import RevokedToken
+
+
+logger = logging.getLogger(__name__)
+
+REVOCATION_CHANNEL = "token_revoked"
+
+
+class RevocationList:
+    def __init__(self):
+        # jti -> expiry as a UTC timestamp
+        self._revoked: Dict[str, float] = {}
+        self._listener_conn = None
+        self._sync_task: Optional[asyncio.Task] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        return jti in self._revoked
+
+    def add(self, jti: str, expires_at: float):
+        self._revoked[jti] = expires_at
+
+    async def load(self, db: AsyncSession):
+        """Add the table's unexpired revocations and forget the expired ones"""
+        now = time.time()
+        rows = await db.execute(
+            select(RevokedToken.jti, RevokedToken.expires_at)
+            .where(RevokedToken.expires_at > datetime.utcfromtimestamp(now))
+        )
+        # Revocations are never undone, so merging can't resurrect a token
+        # revoked between the SELECT and now
+        for jti, expires_at in rows:
+            self._revoked[jti] = _timestamp(expires_at)
+        self._revoked = {jti: exp for jti, exp in self._revoked.items() if exp > now}
+
+    async def start(self):
+        await self._sync()
+        self._sync_task = asyncio.create_task(self._sync_periodically())
+        if not await self._listen():
+            logger.warning("Token revocation listener not started, revocations from other processes "
+                           "apply after the next reload")
+
+    async def stop(self):
+        for task in (self._sync_task, self._reconnect_task):
+            if task is not None:
+                task.cancel()
+        self._sync_task = self._reconnect_task = None
+        if self._listener_conn is None:
+            return
+        raw_conn = await self._listener_conn.get_raw_connection()
+        # Closing must not look like a lost connection
+        raw_conn.driver_connection.remove_termination_listener(self._on_listener_lost)
+        await raw_conn.driver_connection.remove_listener(REVOCATION_CHANNEL, self._on_notify)
+        await self._listener_conn.close()
+        self._listener_conn = None
+
+    async def _listen(self) -> bool:
+        try:
+            conn = await engine.connect()
+            raw_conn = await conn.get_raw_connection()
+            await raw_conn.driver_connection.add_listener(REVOCATION_CHANNEL, self._on_notify)
+            raw_conn.driver_connection.add_termination_listener(self._on_listener_lost)
+        except Exception as e:
+            logger.warning("Token revocation listener connection failed: %s", e)
+            return False
+        self._listener_conn = conn
+        return True
+
+    async def _reconnect(self, lost_conn):
+        try:
+            # Dead connection: discard it instead of returning it to the pool
+            await lost_conn.invalidate()
+        except Exception:
+            pass
+        delay = 1
+        while not await self._listen():
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 60)
+        # Revocations made while no one was listening were not notified
+        await self._sync()
+        logger.info("Token revocation listener reconnected")
+        self._reconnect_task = None
+
+    def _on_listener_lost(self, connection):
+        logger.warning("Token revocation listener connection lost, reconnecting")
+        lost_conn, self._listener_conn = self._listener_conn, None
+        if lost_conn is not None and self._reconnect_task is None:
+            self._reconnect_task = asyncio.create_task(self._reconnect(lost_conn))
+
+    async def _sync(self):
+        try:
+            async with AsyncSessionLocal() as db:
+                await self.load(db)
+        except Exception as e:
+            logger.warning("Reloading revoked tokens failed: %s", e)
+
+    async def _sync_periodically(self):
+        while True:
+            await asyncio.sleep(settings.REVOCATION_SYNC_SECONDS)
+            await self._sync()
+
+    def _on_notify(self, connection, pid, channel, payload):
+        jti, _, expires_at = payload.partition(" ")
+        self.add(jti, float(expires_at))
+
+
+revocation_list = RevocationList()
+
+
+def _timestamp(value: datetime) -> float:
+    # Naive UTC datetimes, as stored by the app
+    return (value - datetime(1970, 1, 1)).total_seconds()
+
+
+async def revoke_token(db: AsyncSession, jti: str, expires_at: float):
+    """Revoke a token until its expiry (exp claim) in every process, and commit"""
+    await db.execute(
+        insert(RevokedToken)
+        .values(jti=jti, expires_at=datetime.utcfromtimestamp(expires_at))
+        .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+    )
+    # Nothing to keep once the token expired by itself
+    await db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= datetime.utcnow()))
+    await db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": REVOCATION_CHANNEL, "payload": f"{jti} {expires_at}"}
+    )
+    await db.commit()
+    revocation_list.add(jti, expires_at)
@@ -1,4 +1,4 @@
-from .models import Language, Translation, Difficulty, WordType, MasterWord, Domain, UserTranslation
+from .models import Language, Translation, Difficulty, WordType, MasterWord, Domain, UserTranslation, FixtureChecksum, ConceptLanguagePair
 from .schemas import (
     LanguageSchema, LanguageCreate,
     DomainSchema, DomainCreate,
@@ -0,0 +1,133 @@
+"""
+Batch import of master words and translations for the admin API.
+
+Items are validated together: schema errors per item, then set lookups for
+the references (domains and languages from the catalog, master words with
+one SELECT per batch). Invalid items are reported by index and
+skipped; the valid ones are written with the set-based upserts of
+ingest.py, and the concept pairs of every touched concept are rebuilt once.
+Committing is left to the caller (through commit_catalog_changes).
+"""
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .catalog import vocab_catalog
+from .ingest import upsert_master_words, upsert_translations
+from .models import MasterWord
+from .pairs import refresh_concept_language_pairs
+from .schemas import MasterWordCreate, TranslationCreate
+
+
+BULK_BATCH_SIZE = 1000
+
+
+class BulkRowError(BaseModel):
+    index: int
+    errors: List[Any]
+
+
+class BulkImportResult(BaseModel):
+    received: int
+    written: int
+    errors: List[BulkRowError] = []
+
+
+def _validate(model, items: Iterable[Tuple[int, Any]], errors: List[BulkRowError]) -> List[Tuple[int, Any]]:
+    valid = []
+    for index, item in items:
+        if isinstance(item, BulkRowError):
+            errors.append(item)
+            continue
+        try:
+            valid.append((index, model.model_validate(item)))
+        except ValidationError as e:
+            errors.append(BulkRowError(index=index, errors=e.errors(include_url=False, include_input=False)))
+    return valid
+
+
+def _translation_row(translation: TranslationCreate) -> Dict:
+    # ingest.py takes fixture-shaped rows, keyed by concept
+    return {"concept": translation.master_word_concept, **translation.model_dump(exclude={"master_word_concept"})}
+
+
+async def _existing_concepts(db: AsyncSession, concepts: Set[str]) -> Set[str]:
+    concepts = list(concepts)
+    existing = set()
+    # Batched to stay well under the driver's bind parameter limit
+    for start in range(0, len(concepts), BULK_BATCH_SIZE):
+        batch = concepts[start:start + BULK_BATCH_SIZE]
+        rows = await db.execute(select(MasterWord.concept).where(MasterWord.concept.in_(batch)))
+        existing.update(rows.scalars())
+    return existing
+
+
+async def _write(db: AsyncSession, words: List[Dict], translations: List[Dict]) -> int:
+    written = 0
+    for start in range(0, len(words), BULK_BATCH_SIZE):
+        written += await upsert_master_words(db, words[start:start + BULK_BATCH_SIZE])
+    for start in range(0, len(translations), BULK_BATCH_SIZE):
+        written += await upsert_translations(db, translations[start:start + BULK_BATCH_SIZE])
+
+    concepts = {w["concept"] for w in words} | {t["concept"] for t in translations}
+    # Sorted, so refreshes lock master words in the same order (see pairs.py)
+    concepts = sorted(concepts)
+    for start in range(0, len(concepts), BULK_BATCH_SIZE):
+        await refresh_concept_language_pairs(db, concepts[start:start + BULK_BATCH_SIZE])
+    return written
+
+
+async def import_master_words(db: AsyncSession, items: Iterable[Tuple[int, Any]]) -> BulkImportResult:
+    """Upsert master words, with their nested translations, from (index, raw item) pairs"""
+    items = list(items)
+    errors: List[BulkRowError] = []
+    valid = _validate(MasterWordCreate, items, errors)
+
+    domains = await vocab_catalog.domains(db)
+    languages = await vocab_catalog.languages(db)
+    words, translations = [], []
+    for index, word in valid:
+        row_errors = []
+        if word.domain_code not in domains:
+            row_errors.append(f"Unknown domain: {word.domain_code}")
+        for translation in word.translations:
+            if translation.language_code not in languages:
+                row_errors.append(f"Unknown language: {translation.language_code}")
+            if translation.master_word_concept != word.concept:
+                row_errors.append(f"Nested translation of another concept: {translation.master_word_concept}")
+        if row_errors:
+            errors.append(BulkRowError(index=index, errors=row_errors))
+            continue
+        words.append(word.model_dump(exclude={"translations"}))
+        translations.extend(_translation_row(t) for t in word.translations)
+
+    written = await _write(db, words, translations)
+    errors.sort(key=lambda e: e.index)
+    return BulkImportResult(received=len(items), written=written, errors=errors)
+
+
+async def import_translations(db: AsyncSession, items: Iterable[Tuple[int, Any]]) -> BulkImportResult:
+    """Upsert translations of existing master words from (index, raw item) pairs"""
+    items = list(items)
+    errors: List[BulkRowError] = []
+    valid = _validate(TranslationCreate, items, errors)
+
+    languages = await vocab_catalog.languages(db)
+    concepts = await _existing_concepts(db, {t.master_word_concept for _, t in valid})
+    translations = []
+    for index, translation in valid:
+        row_errors = []
+        if translation.master_word_concept not in concepts:
+            row_errors.append(f"Unknown master word: {translation.master_word_concept}")
+        if translation.language_code not in languages:
+            row_errors.append(f"Unknown language: {translation.language_code}")
+        if row_errors:
+            errors.append(BulkRowError(index=index, errors=row_errors))
+            continue
+        translations.append(_translation_row(translation))
+
+    written = await _write(db, [], translations)
+    errors.sort(key=lambda e: e.index)
+    return BulkImportResult(received=len(items), written=written, errors=errors)
@@ -0,0 +1,324 @@
+"""
+In-process cache of the vocabulary catalog used to pick session words.
+
+Entries are keyed by (source language, target language, domain, cumulative
+difficulty) and hold every eligible concept together with the ids of its two
+translations, packed as raw UUID bytes. Languages, domains and recently used
+translation rows are cached alongside, so session responses can be built
+without reloading them. The catalog only changes through the seeder and the
+admin endpoints, which go through `commit_catalog_changes` so that every
+worker drops its entries (via a Postgres NOTIFY).
+
+The catalog is always filled from the primary, even for requests served by
+the read replica: right after an invalidation a lagging replica would hand
+back the old rows, and they would stay cached until the next change.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine
+from .models import Language, Domain, Translation, Difficulty, ConceptLanguagePair
+from .schemas import LanguageSchema, DomainSchema, TranslationSchema
+from .sampling import sample_indices
+
+
+logger = logging.getLogger(__name__)
+
+CATALOG_CHANNEL = "vocab_catalog"
+TRANSLATION_CACHE_SIZE = 50_000
+
+# Difficulty filter is cumulative: a MEDIUM session also draws EASY words
+CUMULATIVE_DIFFICULTIES = {
+    "EASY": [Difficulty.EASY],
+    "MEDIUM": [Difficulty.EASY, Difficulty.MEDIUM],
+    "HARD": [Difficulty.EASY, Difficulty.MEDIUM, Difficulty.HARD],
+}
+
+CatalogKey = Tuple[str, str, Optional[str], Optional[str]]
+WordPair = Tuple[str, uuid.UUID, uuid.UUID]
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """Eligible concepts for one key, with translation ids as packed UUID bytes"""
+    concepts: Tuple[str, ...]
+    from_ids: bytes
+    to_ids: bytes
+
+    def __len__(self) -> int:
+        return len(self.concepts)
+
+    def pair(self, index: int) -> WordPair:
+        start = index * 16
+        return (
+            self.concepts[index],
+            uuid.UUID(bytes=self.from_ids[start:start + 16]),
+            uuid.UUID(bytes=self.to_ids[start:start + 16]),
+        )
+
+    def sample(self, k: int) -> List[WordPair]:
+        """Pick up to k distinct word pairs uniformly at random"""
+        indices = sample_indices(len(self.concepts), k)
+        return [self.pair(i) for i in indices]
+
+
+@dataclass(frozen=True)
+class ReferencePayload:
+    """Serialized JSON body of a reference-data endpoint, with its strong ETag"""
+    body: bytes
+    etag: str
+
+    @classmethod
+    def of(cls, data) -> "ReferencePayload":
+        body = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()
+        # Derived from the content, so every worker agrees on it
+        return cls(body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+
+
+@asynccontextmanager
+async def primary_session(db: Optional[AsyncSession]):
+    """`db` when it is bound to the primary, a new primary session otherwise"""
+    if db is not None and db.bind is engine:
+        yield db
+    else:
+        async with AsyncSessionLocal() as session:
+            yield session
+
+
+class VocabCatalog:
+    def __init__(self):
+        self._entries: Dict[CatalogKey, CatalogEntry] = {}
+        self._locks: Dict[CatalogKey, asyncio.Lock] = {}
+        self._languages: Optional[Dict[str, LanguageSchema]] = None
+        self._domains: Optional[Dict[str, DomainSchema]] = None
+        self._translations: "OrderedDict[uuid.UUID, TranslationSchema]" = OrderedDict()
+        self._payloads: Dict[str, ReferencePayload] = {}
+        self._generation = 0
+        self._listener_conn = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._expiry_task: Optional[asyncio.Task] = None
+
+    @property
+    def generation(self) -> int:
+        """Incremented on every invalidation, to tell whether data derived from the catalog is stale"""
+        return self._generation
+
+    @staticmethod
+    def key(source_lang: str, target_lang: str, domain: Optional[str], difficulty: Optional[str]) -> CatalogKey:
+        """Normalize session filters so equivalent configs share an entry"""
+        if not domain or domain == "ALL":
+            domain = None
+        if difficulty not in CUMULATIVE_DIFFICULTIES:
+            difficulty = None
+        return (source_lang, target_lang, domain, difficulty)
+
+    async def get(
+        self,
+        db: AsyncSession,
+        source_lang: str,
+        target_lang: str,
+        domain: Optional[str] = None,
+        difficulty: Optional[str] = None
+    ) -> CatalogEntry:
+        key = self.key(source_lang, target_lang, domain, difficulty)
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+
+        # Only one request per key hits the database on a cold cache
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                generation = self._generation
+                entry = await self._load(db, key)
+                # Don't keep data read before a concurrent invalidation
+                if generation == self._generation:
+                    self._entries[key] = entry
+        return entry
+
+    async def _load(self, db: AsyncSession, key: CatalogKey) -> CatalogEntry:
+        source_lang, target_lang, domain, difficulty = key
+
+        # Single indexed lookup on the maintained pair table, no aggregation
+        query = select(
+            ConceptLanguagePair.concept,
+            ConceptLanguagePair.from_translation_id,
+            ConceptLanguagePair.to_translation_id
+        ).where(
+            ConceptLanguagePair.source_lang == source_lang,
+            ConceptLanguagePair.target_lang == target_lang
+        )
+        if domain:
+            query = query.where(ConceptLanguagePair.domain_code == domain)
+        if difficulty:
+            query = query.where(ConceptLanguagePair.difficulty.in_(CUMULATIVE_DIFFICULTIES[difficulty]))
+
+        async with primary_session(db) as primary:
+            rows = (await primary.execute(query)).all()
+        return CatalogEntry(
+            concepts=tuple(row[0] for row in rows),
+            from_ids=b"".join(row[1].bytes for row in rows),
+            to_ids=b"".join(row[2].bytes for row in rows),
+        )
+
+    async def languages(self, db: AsyncSession) -> Dict[str, LanguageSchema]:
+        languages = self._languages
+        if languages is None:
+            generation = self._generation
+            async with primary_session(db) as primary:
+                rows = (await primary.execute(select(Language))).scalars().all()
+            languages = {row.code: LanguageSchema.model_validate(row) for row in rows}
+            if generation == self._generation:
+                self._languages = languages
+        return languages
+
+    async def domains(self, db: AsyncSession) -> Dict[str, DomainSchema]:
+        domains = self._domains
+        if domains is None:
+            generation = self._generation
+            async with primary_session(db) as primary:
+                rows = (await primary.execute(select(Domain))).scalars().all()
+            domains = {row.code: DomainSchema.model_validate(row) for row in rows}
+            if generation == self._generation:
+                self._domains = domains
+        return domains
+
+    async def reference_payload(self, db: AsyncSession, name: str) -> ReferencePayload:
+        """Serialized languages or domains list, sorted by code"""
+        payload = self._payloads.get(name)
+        if payload is None:
+            generation = self._generation
+            rows = await (self.languages(db) if name == "languages" else self.domains(db))
+            payload = ReferencePayload.of([rows[code].model_dump(mode="json") for code in sorted(rows)])
+            if generation == self._generation:
+                self._payloads[name] = payload
+        return payload
+
+    async def translations(self, db: AsyncSession, ids: Iterable[uuid.UUID]) -> Dict[uuid.UUID, TranslationSchema]:
+        """Translation rows by id, only querying the ones not cached yet (LRU)"""
+        found = {}
+        missing = []
+        for translation_id in ids:
+            translation = self._translations.get(translation_id)
+            if translation is None:
+                missing.append(translation_id)
+            else:
+                self._translations.move_to_end(translation_id)
+                found[translation_id] = translation
+
+        if missing:
+            generation = self._generation
+            async with primary_session(db) as primary:
+                rows = (await primary.execute(select(Translation).where(Translation.id.in_(missing)))).scalars().all()
+            for row in rows:
+                found[row.id] = TranslationSchema.model_validate(row)
+            if generation == self._generation:
+                for row in rows:
+                    self._translations[row.id] = found[row.id]
+                while len(self._translations) > TRANSLATION_CACHE_SIZE:
+                    self._translations.popitem(last=False)
+        return found
+
+    def invalidate(self):
+        """Drop every cached entry (loads in flight are discarded too)"""
+        self._generation += 1
+        self._entries.clear()
+        self._languages = None
+        self._domains = None
+        self._translations.clear()
+        self._payloads.clear()
+
+    async def start_listener(self):
+        """Listen for catalog changes made by other processes (seeder, other workers)
+
+        A lost listener connection is reopened, and the whole catalog is also
+        dropped every CATALOG_MAX_AGE_SECONDS, so a missed notification (or no
+        LISTEN at all behind a transaction-mode pooler) can't keep stale data
+        cached forever.
+        """
+        self._expiry_task = asyncio.create_task(self._expire_periodically())
+        if not await self._listen():
+            logger.warning("Vocab catalog listener not started, changes from other processes "
+                           "apply within CATALOG_MAX_AGE_SECONDS")
+
+    async def stop_listener(self):
+        for task in (self._expiry_task, self._reconnect_task):
+            if task is not None:
+                task.cancel()
+        self._expiry_task = self._reconnect_task = None
+        if self._listener_conn is None:
+            return
+        raw_conn = await self._listener_conn.get_raw_connection()
+        # Closing must not look like a lost connection
+        raw_conn.driver_connection.remove_termination_listener(self._on_listener_lost)
+        await raw_conn.driver_connection.remove_listener(CATALOG_CHANNEL, self._on_notify)
+        await self._listener_conn.close()
+        self._listener_conn = None
+
+    async def _listen(self) -> bool:
+        try:
+            conn = await engine.connect()
+            raw_conn = await conn.get_raw_connection()
+            await raw_conn.driver_connection.add_listener(CATALOG_CHANNEL, self._on_notify)
+            raw_conn.driver_connection.add_termination_listener(self._on_listener_lost)
+        except Exception as e:
+            logger.warning("Vocab catalog listener connection failed: %s", e)
+            return False
+        self._listener_conn = conn
+        return True
+
+    async def _reconnect(self, lost_conn):
+        try:
+            # Dead connection: discard it instead of returning it to the pool
+            await lost_conn.invalidate()
+        except Exception:
+            pass
+        delay = 1
+        while not await self._listen():
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 60)
+        # Changes made while no one was listening were not notified
+        self.invalidate()
+        logger.info("Vocab catalog listener reconnected")
+        self._reconnect_task = None
+
+    async def _expire_periodically(self):
+        while True:
+            await asyncio.sleep(settings.CATALOG_MAX_AGE_SECONDS)
+            self.invalidate()
+
+    def _on_listener_lost(self, connection):
+        logger.warning("Vocab catalog listener connection lost, reconnecting")
+        self.invalidate()
+        lost_conn, self._listener_conn = self._listener_conn, None
+        if lost_conn is not None and self._reconnect_task is None:
+            self._reconnect_task = asyncio.create_task(self._reconnect(lost_conn))
+
+    def _on_notify(self, connection, pid, channel, payload):
+        self.invalidate()
+
+
+vocab_catalog = VocabCatalog()
+
+
+async def commit_catalog_changes(db: AsyncSession):
+    """Commit vocab writes and invalidate the catalog in every process.
+
+    The NOTIFY is transactional, so listeners only see it once the writes
+    are visible.
+    """
+    await db.execute(text("SELECT pg_notify(:channel, '')"), {"channel": CATALOG_CHANNEL})
+    await db.commit()
+    vocab_catalog.invalidate()
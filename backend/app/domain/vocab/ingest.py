@@ -0,0 +1,71 @@
+"""
+Set-based upserts for vocabulary data.
+
+Each call writes a batch of fixture-shaped rows with a single
+INSERT ... ON CONFLICT DO UPDATE, giving the same end state as the
+row-by-row select/update path. Rows that would not change are left alone,
+so re-running an import does not rewrite (or re-timestamp) anything, and
+they are not counted: the upserts return the number of rows actually
+inserted or updated.
+"""
+from datetime import datetime
+from typing import Dict, Iterable, List
+
+from sqlalchemy import literal_column, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import MasterWord, Translation
+
+
+MASTER_WORD_FIELDS = ("domain_code", "difficulty", "image_url", "word_type")
+TRANSLATION_FIELDS = ("text", "audio_url", "gender", "plural_text", "sentence_example", "synonyms")
+
+
+def _upsert_statement(table, conflict_columns: List[str], fields: Iterable[str]):
+    stmt = insert(table)
+    changed = [table.c[field].is_distinct_from(stmt.excluded[field]) for field in fields]
+    return stmt.on_conflict_do_update(
+        index_elements=conflict_columns,
+        set_={**{field: stmt.excluded[field] for field in fields}, "updated_at": datetime.utcnow()},
+        where=or_(*changed)
+    ).returning(literal_column("1"))  # Rows skipped by the WHERE return nothing
+
+
+async def upsert_master_words(session: AsyncSession, words_data: List[Dict]) -> int:
+    """Insert or update master words (keyed by concept), returns rows written"""
+    rows = {}
+    for word_data in words_data:
+        # Last occurrence wins, as with the row-by-row path
+        rows[word_data["concept"]] = {
+            "concept": word_data["concept"],
+            **{field: word_data.get(field) for field in MASTER_WORD_FIELDS},
+        }
+    if not rows:
+        return 0
+
+    table = MasterWord.__table__
+    result = await session.execute(_upsert_statement(table, ["concept"], MASTER_WORD_FIELDS), list(rows.values()))
+    return len(result.all())
+
+
+async def upsert_translations(session: AsyncSession, translations_data: List[Dict]) -> int:
+    """Insert or update translations (keyed by concept + language), returns rows written.
+
+    Rows must reference existing master words; callers filter unknown concepts.
+    """
+    rows = {}
+    for trans_data in translations_data:
+        key = (trans_data["concept"], trans_data["language_code"])
+        rows[key] = {
+            "master_word_concept": trans_data["concept"],
+            "language_code": trans_data["language_code"],
+            **{field: trans_data.get(field) for field in TRANSLATION_FIELDS},
+        }
+    if not rows:
+        return 0
+
+    table = Translation.__table__
+    stmt = _upsert_statement(table, ["master_word_concept", "language_code"], TRANSLATION_FIELDS)
+    result = await session.execute(stmt, list(rows.values()))
+    return len(result.all())
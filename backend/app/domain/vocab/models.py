@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint, Enum, DateTime, Text, Boolean, ARRAY
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint, Enum, DateTime, Text, Boolean, ARRAY, Index
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -72,6 +72,35 @@ class Translation(Base):
     )
 
 
+class ConceptLanguagePair(Base):
+    """Concepts translated in both languages of an ordered language pair.
+
+    Derived from translations (see app/domain/vocab/pairs.py) so that picking
+    session words is an indexed lookup instead of a GROUP BY over translations.
+    """
+    __tablename__ = "concept_language_pairs"
+
+    id = None
+
+    source_lang = Column(String, ForeignKey("languages.code", ondelete="CASCADE"), primary_key=True)
+    target_lang = Column(String, ForeignKey("languages.code", ondelete="CASCADE"), primary_key=True)
+    concept = Column(String, ForeignKey("master_words.concept", ondelete="CASCADE"), primary_key=True)
+    domain_code = Column(String, nullable=False)
+    difficulty = Column(Enum(Difficulty), nullable=False)
+    from_translation_id = Column(UUID(as_uuid=True), ForeignKey("translations.id", ondelete="CASCADE"), nullable=False)
+    to_translation_id = Column(UUID(as_uuid=True), ForeignKey("translations.id", ondelete="CASCADE"), nullable=False)
+
+    __table_args__ = (
+        Index(
+            "ix_concept_language_pairs_lookup",
+            "source_lang", "target_lang", "domain_code", "difficulty",
+            postgresql_include=["concept", "from_translation_id", "to_translation_id"]
+        ),
+        # Joins from user progress, which is keyed by the tested translation
+        Index("ix_concept_language_pairs_to_translation", "to_translation_id", "source_lang"),
+    )
+
+
 class UserTranslation(Base):
     """Tracks user-specific data for translations (e.g., words they've marked as 'already known')"""
     __tablename__ = "user_translations"
@@ -89,3 +118,12 @@ class UserTranslation(Base):
     )
 
 
+class FixtureChecksum(Base):
+    """Content hash of a fixture file loaded by the seeder, used to skip unchanged files"""
+    __tablename__ = "fixture_checksums"
+
+    id = None
+
+    path = Column(String, primary_key=True)  # Relative to the fixtures directory
+    sha256 = Column(String, nullable=False)
+    record_hashes = Column(JSONB, nullable=True)  # Optional {record key: hash} map
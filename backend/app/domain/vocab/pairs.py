@@ -0,0 +1,90 @@
+"""
+Maintenance of the concept_language_pairs table.
+
+For every concept and ordered pair of languages it is translated into, the
+table holds the concept's domain and difficulty and both translation ids.
+It is rebuilt set-based from translations by whoever writes vocab data (the
+seeder, the admin endpoints), in the same transaction as the write.
+
+A refresh first locks the concepts' master word rows, so two transactions
+adding translations of one concept rebuild its pairs one after the other:
+the second one sees the first one's committed translation and writes the
+pairs between both languages (e.g. fr -> es), which neither could see while
+both were in flight.
+"""
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy import and_, delete, except_, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from .models import ConceptLanguagePair, MasterWord, Translation
+
+
+PAIR_COLUMNS = (
+    "source_lang", "target_lang", "concept", "domain_code", "difficulty",
+    "from_translation_id", "to_translation_id",
+)
+
+
+def expected_pairs(concepts: Optional[Iterable[str]] = None):
+    """SELECT producing the rows concept_language_pairs should contain"""
+    trans_from = aliased(Translation)
+    trans_to = aliased(Translation)
+    query = (
+        select(
+            trans_from.language_code,
+            trans_to.language_code,
+            MasterWord.concept,
+            MasterWord.domain_code,
+            MasterWord.difficulty,
+            trans_from.id,
+            trans_to.id,
+        )
+        .join(trans_from, trans_from.master_word_concept == MasterWord.concept)
+        .join(trans_to, and_(
+            trans_to.master_word_concept == MasterWord.concept,
+            trans_to.language_code != trans_from.language_code
+        ))
+    )
+    if concepts is not None:
+        query = query.where(MasterWord.concept.in_(list(concepts)))
+    return query
+
+
+async def refresh_concept_language_pairs(db: AsyncSession, concepts: Optional[Iterable[str]] = None):
+    """Rebuild pair rows from translations, for every concept or only the given ones"""
+    if concepts is not None:
+        concepts = list(concepts)
+        if not concepts:
+            return
+
+    # FOR NO KEY UPDATE: doesn't wait for the key share locks taken by
+    # inserting translations, but serializes concurrent refreshes. Ordered
+    # so that overlapping refreshes can't deadlock.
+    stmt_lock = select(MasterWord.concept).order_by(MasterWord.concept).with_for_update(key_share=True)
+    if concepts is not None:
+        stmt_lock = stmt_lock.where(MasterWord.concept.in_(concepts))
+    await db.execute(stmt_lock)
+
+    stmt_delete = delete(ConceptLanguagePair)
+    if concepts is not None:
+        stmt_delete = stmt_delete.where(ConceptLanguagePair.concept.in_(concepts))
+    await db.execute(stmt_delete.execution_options(synchronize_session=False))
+
+    table = ConceptLanguagePair.__table__
+    await db.execute(
+        insert(table).from_select([table.c[name] for name in PAIR_COLUMNS], expected_pairs(concepts))
+    )
+
+
+async def check_concept_language_pairs(db: AsyncSession) -> Tuple[int, int]:
+    """Compare the table with translations, returns (missing rows, stale rows)"""
+    stored = select(*(ConceptLanguagePair.__table__.c[name] for name in PAIR_COLUMNS))
+    expected = expected_pairs()
+
+    missing = except_(expected, stored).subquery()
+    stale = except_(stored, expected).subquery()
+    missing_count = (await db.execute(select(func.count()).select_from(missing))).scalar_one()
+    stale_count = (await db.execute(select(func.count()).select_from(stale))).scalar_one()
+    return missing_count, stale_count
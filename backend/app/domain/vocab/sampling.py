@@ -0,0 +1,30 @@
+"""
+Random sampling over cached candidate arrays.
+
+Replaces `ORDER BY random() LIMIT n`, which makes Postgres sort the whole
+eligible set on every call. Picking k indices here costs O(k) time and
+memory whatever the population size, with the same distribution: every
+k-subset is equally likely and comes back in a uniformly random order.
+"""
+import random
+from typing import List, Optional
+
+
+_rng = random.Random()
+
+
+def sample_indices(population: int, k: int, rng: Optional[random.Random] = None) -> List[int]:
+    """Pick min(k, population) distinct indices in [0, population) (Floyd's algorithm)"""
+    rng = rng or _rng
+    k = min(k, population)
+    chosen = set()
+    result = []
+    for j in range(population - k, population):
+        t = rng.randrange(j + 1)
+        if t in chosen:
+            t = j
+        chosen.add(t)
+        result.append(t)
+    # Floyd's algorithm yields a uniform subset but not a uniform order
+    rng.shuffle(result)
+    return result
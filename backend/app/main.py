@@ -1,20 +1,32 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 from contextlib import asynccontextmanager
 
+from .core.cache import cache_stats
 from .core.config import settings
-from .core.database import init_db
+from .core.database import engine, init_db, read_engine
+from .core.metrics import STATS_HEADER, MetricsMiddleware, instrument_engine, render_prometheus
+from .core.query_detector import QueryDetectorMiddleware, report_json, write_report
+from .core.security import password_hasher
 from .api.v1.router import api_router
+from .domain.user.revocation import revocation_list
+from .domain.vocab.catalog import vocab_catalog
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     await init_db()
+    await vocab_catalog.start_listener()
+    await revocation_list.start()
     yield
     # Shutdown
-    pass
+    await vocab_catalog.stop_listener()
+    await revocation_list.stop()
+    password_hasher.shutdown()
+    if settings.QUERY_DETECTOR and settings.QUERY_REPORT_PATH:
+        write_report(settings.QUERY_REPORT_PATH)
 
 
 def create_app() -> FastAPI:
@@ -38,8 +50,18 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", STATS_HEADER],
     )
 
+    # Request latency and SQL statements per route, see /metrics
+    instrument_engine(engine)
+    instrument_engine(read_engine)
+    if settings.QUERY_DETECTOR:
+        # Added first, so it runs inside MetricsMiddleware and its analysis
+        # happens after the request is recorded
+        app.add_middleware(QueryDetectorMiddleware)
+    app.add_middleware(MetricsMiddleware)
+
     # Include routers
     app.include_router(api_router, prefix="/api/v1")
 
@@ -51,6 +73,22 @@ def create_app() -> FastAPI:
     async def health():
         return {"status": "healthy"}
 
+    @app.get("/health/caches")
+    async def health_caches():
+        """Hit/miss counters of this worker's caches"""
+        return cache_stats()
+
+    @app.get("/metrics")
+    async def metrics():
+        """This worker's request and database metrics, in Prometheus text format"""
+        return Response(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+    if settings.QUERY_DETECTOR:
+        @app.get("/health/queries")
+        async def health_queries():
+            """N+1 and slow-query findings per endpoint since this worker started"""
+            return report_json()
+
     return app
 
 
@@ -0,0 +1,95 @@
+"""
+Benchmark importing vocabulary through the admin API: one object per
+request versus the bulk endpoints.
+
+Calls the app in-process. Each run writes master words and translations to a
+throwaway domain, which is deleted at the end (translations and pairs go
+with it through ON DELETE CASCADE). Needs the two languages to exist.
+
+Usage:
+    python -m scripts.benchmarks.admin_import
+    python -m scripts.benchmarks.admin_import --words 2000 --source en --target fr
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+
+import httpx
+from sqlalchemy import delete
+
+from app.core.database import AsyncSessionLocal, engine
+from app.domain.vocab.catalog import commit_catalog_changes
+from app.domain.vocab.models import Domain, MasterWord
+from app.main import app
+
+
+def payloads(domain: str, count: int, languages):
+    words, translations = [], []
+    for i in range(count):
+        concept = f"{domain}-{i}"
+        words.append({"concept": concept, "domain_code": domain, "difficulty": "EASY"})
+        translations.extend(
+            {"master_word_concept": concept, "language_code": lang, "text": f"{concept}-{lang}"}
+            for lang in languages
+        )
+    return words, translations
+
+
+async def create_domain(code: str):
+    async with AsyncSessionLocal() as db:
+        db.add(Domain(code=code, name=code))
+        await commit_catalog_changes(db)
+
+
+async def drop_domain(code: str):
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(MasterWord).where(MasterWord.domain_code == code))
+        await db.execute(delete(Domain).where(Domain.code == code))
+        await commit_catalog_changes(db)
+
+
+async def single(client: httpx.AsyncClient, words, translations):
+    for word in words:
+        (await client.post("/api/v1/config/master-words", json=word)).raise_for_status()
+    for translation in translations:
+        (await client.post("/api/v1/config/translations", json=translation)).raise_for_status()
+
+
+async def bulk(client: httpx.AsyncClient, words, translations):
+    for url, items in (("/api/v1/config/master-words/bulk", words), ("/api/v1/config/translations/bulk", translations)):
+        body = "\n".join(json.dumps(item) for item in items)
+        response = await client.post(url, content=body, headers={"Content-Type": "application/x-ndjson"})
+        response.raise_for_status()
+        assert not response.json()["errors"], response.json()["errors"][:5]
+
+
+async def main(count: int, languages):
+    print(f"{count} master words with {len(languages)} translations each")
+    print(f"{'path':<8} {'rows':>8} {'seconds':>9} {'rows/s':>9}")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=None) as client:
+        for name, run in (("single", single), ("bulk", bulk)):
+            domain = f"bench-{uuid.uuid4().hex[:8]}"
+            words, translations = payloads(domain, count, languages)
+            await create_domain(domain)
+            try:
+                start = time.perf_counter()
+                await run(client, words, translations)
+                elapsed = time.perf_counter() - start
+            finally:
+                await drop_domain(domain)
+            rows = len(words) + len(translations)
+            print(f"{name:<8} {rows:>8} {elapsed:>9.2f} {rows / elapsed:>9.0f}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark single-object vs bulk admin imports.")
+    parser.add_argument("--words", type=int, default=1000, help="Master words per run")
+    parser.add_argument("--source", default="en", help="First translation language")
+    parser.add_argument("--target", default="fr", help="Second translation language")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.words, [args.source, args.target]))
@@ -0,0 +1,129 @@
+"""
+Benchmark building a review queue for a user with a large history.
+
+Generates a synthetic domain with N concepts translated in two languages, a
+user with one progress row per concept (due dates spread over +/- 60 days),
+then times the top-N due_pairs query against loading the user's whole
+history and picking the due words in Python. Prints the query plan so the
+index walk is visible. Needs the two languages to exist (seeded database);
+everything runs in a transaction that is rolled back.
+
+Usage:
+    python -m scripts.benchmarks.due_queue
+    python -m scripts.benchmarks.due_queue --rows 100000 --limit 20 --repeat 50
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import engine
+from app.domain.session.models import UserProgress
+from app.domain.session.scheduler import due_pairs, due_query
+from app.domain.user.models import User
+from app.domain.vocab.models import ConceptLanguagePair, MasterWord
+from app.domain.vocab.pairs import PAIR_COLUMNS, expected_pairs
+
+
+def report(label: str, timings):
+    timings.sort()
+    p50 = timings[len(timings) // 2] * 1000
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1000
+    print(f"{label:<20} {p50:>9.2f} {p99:>9.2f}")
+
+
+async def generate(db: AsyncSession, rows: int, source: str, target: str) -> uuid.UUID:
+    domain = f"bench-{uuid.uuid4().hex[:8]}"
+    params = {"domain": domain, "rows": rows, "source": source, "target": target}
+    await db.execute(text("INSERT INTO domains (code, name) VALUES (:domain, :domain)"), params)
+    await db.execute(text("""
+        INSERT INTO master_words (concept, domain_code, difficulty, created_at, updated_at)
+        SELECT :domain || '-' || g, :domain, 'EASY', now(), now() FROM generate_series(1, :rows) g
+    """), params)
+    await db.execute(text("""
+        INSERT INTO translations (id, master_word_concept, language_code, text, created_at, updated_at)
+        SELECT gen_random_uuid(), mw.concept, lang.code, mw.concept, now(), now()
+        FROM master_words mw CROSS JOIN (VALUES (:source), (:target)) AS lang(code)
+        WHERE mw.domain_code = :domain
+    """), params)
+
+    table = ConceptLanguagePair.__table__
+    await db.execute(insert(table).from_select(
+        [table.c[name] for name in PAIR_COLUMNS],
+        expected_pairs().where(MasterWord.domain_code == domain)
+    ))
+
+    user = User(email=f"bench-{uuid.uuid4()}@example.com", is_active=True)
+    db.add(user)
+    await db.flush()
+    await db.execute(text("""
+        INSERT INTO user_progress (id, user_id, translation_id, correct_count, incorrect_count,
+                                   last_reviewed, ease, interval_days, repetitions, due_at,
+                                   created_at, updated_at)
+        SELECT gen_random_uuid(), :user_id, t.id, 1, 0, now(), 2.5, 1, 1,
+               now() + (random() * 120 - 60) * interval '1 day', now(), now()
+        FROM translations t JOIN master_words mw ON mw.concept = t.master_word_concept
+        WHERE mw.domain_code = :domain AND t.language_code = :target
+    """), {**params, "user_id": user.id})
+    for name in ("user_progress", "concept_language_pairs"):
+        await db.execute(text(f"ANALYZE {name}"))
+    return user.id
+
+
+async def full_history(db: AsyncSession, user_id: uuid.UUID, limit: int, now: datetime):
+    """Baseline: read every progress row of the user and pick due words in Python"""
+    rows = (await db.execute(
+        select(UserProgress.translation_id, UserProgress.due_at).where(UserProgress.user_id == user_id)
+    )).all()
+    due = sorted((row for row in rows if row.due_at <= now), key=lambda row: row.due_at)
+    return due[:limit]
+
+
+async def main(rows: int, limit: int, repeat: int, source: str, target: str):
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        db = AsyncSession(bind=conn, expire_on_commit=False)
+        try:
+            start = time.perf_counter()
+            user_id = await generate(db, rows, source, target)
+            print(f"Generated {rows} progress rows in {time.perf_counter() - start:.1f}s")
+
+            now = datetime.utcnow()
+            query = due_query(user_id, source, target, limit=limit, now=now)
+            sql = query.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+            plan = await db.execute(text(f"EXPLAIN ANALYZE {sql}"))
+            print("\n".join(row[0] for row in plan))
+
+            print(f"\n{repeat} queue builds of {limit} words (times in ms)")
+            print(f"{'query':<20} {'p50':>9} {'p99':>9}")
+            for label, build in (
+                ("due_pairs top-N", lambda: due_pairs(db, user_id, source, target, limit=limit, now=now)),
+                ("full history", lambda: full_history(db, user_id, limit, now)),
+            ):
+                timings = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    await build()
+                    timings.append(time.perf_counter() - start)
+                report(label, timings)
+        finally:
+            await db.close()
+            await transaction.rollback()
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark due-queue construction.")
+    parser.add_argument("--rows", type=int, default=100_000, help="Progress rows for the benchmark user")
+    parser.add_argument("--limit", type=int, default=20, help="Words per queue (HARD sessions use 20)")
+    parser.add_argument("--repeat", type=int, default=50, help="Queue builds per query")
+    parser.add_argument("--source", default="en", help="Source language code")
+    parser.add_argument("--target", default="fr", help="Target language code")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.rows, args.limit, args.repeat, args.source, args.target))
@@ -0,0 +1,102 @@
+"""
+Load benchmark of engine profiles (see Settings' DB_* options).
+
+Runs the same workload against one engine per profile: concurrent workers,
+each checking out a session and running a few indexed lookups shaped like a
+request (user by email, catalog pair lookup). Reports throughput and
+per-request latency. Point POSTGRES_HOST/PORT at PgBouncer to measure the
+external pooler profile as it is meant to run.
+
+Echo output goes to /dev/null, so its cost is the formatting and logging
+calls on the event loop, not the terminal.
+
+Usage:
+    python -m scripts.benchmarks.engine_profiles
+    python -m scripts.benchmarks.engine_profiles --concurrency 50 --requests 2000 --profiles tuned,external-pooler
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.core.database import engine_options
+from app.domain.user.models import User
+from app.domain.vocab.models import ConceptLanguagePair
+
+
+PROFILES = {
+    # What database.py used to do: default pool, every statement logged
+    "legacy-echo": {"DB_ECHO": True, "DB_POOL_SIZE": 5, "DB_MAX_OVERFLOW": 10, "DB_POOL_PRE_PING": False},
+    "tuned": {"DB_ECHO": False},
+    "tuned-no-pre-ping": {"DB_ECHO": False, "DB_POOL_PRE_PING": False},
+    "no-statement-cache": {"DB_ECHO": False, "DB_STATEMENT_CACHE_SIZE": 0},
+    "external-pooler": {"DB_ECHO": False, "DB_EXTERNAL_POOLER": True},
+}
+
+
+async def request(sessionmaker):
+    async with sessionmaker() as db:
+        await db.execute(select(User.id).where(User.email == "bench@example.com"))
+        await db.execute(
+            select(ConceptLanguagePair.concept)
+            .where(ConceptLanguagePair.source_lang == "en", ConceptLanguagePair.target_lang == "fr")
+            .limit(20)
+        )
+
+
+async def run_profile(name: str, overrides: dict, concurrency: int, total: int, devnull):
+    config = settings.model_copy(update=overrides)
+    with contextlib.redirect_stdout(devnull):
+        # The echo handler binds sys.stdout when the engine is created
+        engine = create_async_engine(config.DATABASE_URL, **engine_options(config))
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+
+    # Warm up connections and statement caches
+    await asyncio.gather(*(request(sessionmaker) for _ in range(concurrency)))
+
+    timings = []
+    remaining = total
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            await request(sessionmaker)
+            timings.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    await engine.dispose()
+
+    timings.sort()
+    p50 = timings[len(timings) // 2] * 1000
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1000
+    print(f"{name:<20} {len(timings) / elapsed:>10.0f} {p50:>8.2f} {p99:>8.2f}")
+
+
+async def main(concurrency: int, total: int, profiles):
+    print(f"{total} requests, {concurrency} concurrent (times in ms)")
+    print(f"{'profile':<20} {'req/s':>10} {'p50':>8} {'p99':>8}")
+    with open(os.devnull, "w") as devnull:
+        for name in profiles:
+            await run_profile(name, PROFILES[name], concurrency, total, devnull)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load benchmark of engine profiles.")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent workers")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per profile")
+    parser.add_argument(
+        "--profiles", default=",".join(PROFILES),
+        help=f"Comma-separated profiles among {', '.join(PROFILES)}"
+    )
+    args = parser.parse_args()
+
+    asyncio.run(main(args.concurrency, args.requests, args.profiles.split(",")))
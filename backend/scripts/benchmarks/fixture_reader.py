@@ -0,0 +1,84 @@
+"""
+Benchmark the streaming fixture reader against json.load.
+
+Generates a synthetic translations file and measures throughput and peak
+Python memory (tracemalloc) while consuming it in seeder-sized batches.
+
+Usage:
+    python -m scripts.benchmarks.fixture_reader
+    python -m scripts.benchmarks.fixture_reader --records 10000 100000 1000000
+"""
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Iterable, List
+
+from scripts.fixture_reader import batched, iter_records
+
+
+DEFAULT_RECORDS = [10_000, 100_000, 500_000]
+
+
+def write_fixture(path: Path, records: int):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[\n")
+        for i in range(records):
+            if i:
+                f.write(",\n")
+            json.dump({
+                "concept": f"concept_{i}",
+                "language_code": "en",
+                "text": f"word {i}",
+                "sentence_example": f"This is the example sentence for word number {i}."
+            }, f, indent=2)
+        f.write("\n]\n")
+
+
+def load_batches(path: Path, batch_size: int) -> Iterable[List]:
+    with open(path) as f:
+        data = json.load(f)
+    for i in range(0, len(data), batch_size):
+        yield data[i:i + batch_size]
+
+
+def measure(read: Callable[[], Iterable[List]]):
+    # Timed and traced in separate passes: tracemalloc slows every allocation
+    start = time.perf_counter()
+    rows = sum(len(batch) for batch in read())
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    for _ in read():
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, elapsed, peak
+
+
+def main(sizes: List[int], batch_size: int):
+    print(f"{'reader':<12} {'records':>10} {'file MB':>8} {'seconds':>8} {'rows/s':>10} {'peak MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for records in sizes:
+            path = Path(tmp) / "translations_en.json"
+            write_fixture(path, records)
+            size_mb = path.stat().st_size / 1e6
+
+            readers = {
+                "json.load": lambda: load_batches(path, batch_size),
+                "streaming": lambda: batched(iter_records(path), batch_size),
+            }
+            for name, read in readers.items():
+                rows, elapsed, peak = measure(read)
+                print(f"{name:<12} {rows:>10,} {size_mb:>8.1f} {elapsed:>8.2f} {rows / elapsed:>10,.0f} {peak / 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark fixture readers.")
+    parser.add_argument("--records", type=int, nargs="+", default=DEFAULT_RECORDS, help="Records per generated file")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Records per batch, as in the seeder")
+    args = parser.parse_args()
+
+    main(args.records, args.batch_size)
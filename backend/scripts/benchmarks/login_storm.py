@@ -0,0 +1,87 @@
+"""
+Load test: latency of an unrelated endpoint during a login storm.
+
+Runs a storm of concurrent password verifications (what /auth/login spends
+its time on) while probing GET /api/v1/config/difficulties in-process, which
+needs no database. Three phases: no storm, bcrypt on the event loop as login
+used to do, and bcrypt in the bounded pool. With the pool the probe's p99
+should stay close to the baseline; storm calls beyond
+PASSWORD_HASH_MAX_PENDING are refused (503 in the endpoint).
+
+Usage:
+    python -m scripts.benchmarks.login_storm
+    python -m scripts.benchmarks.login_storm --logins 64 --seconds 5 --rounds 12
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from app.core.security import PasswordHasherBusy, pwd_context, verify_password
+from app.main import app
+
+
+PASSWORD = "correct horse battery staple"
+
+
+async def probe(client: httpx.AsyncClient, stop: asyncio.Event):
+    timings = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        (await client.get("/api/v1/config/difficulties")).raise_for_status()
+        timings.append(time.perf_counter() - start)
+        await asyncio.sleep(0.005)
+    return timings
+
+
+async def storm(mode: str, hashed: str, logins: int, stop: asyncio.Event):
+    counts = {"done": 0, "rejected": 0}
+
+    async def login():
+        while not stop.is_set():
+            if mode == "inline":
+                pwd_context.verify(PASSWORD, hashed)
+                await asyncio.sleep(0)
+            else:
+                try:
+                    await verify_password(PASSWORD, hashed)
+                except PasswordHasherBusy:
+                    counts["rejected"] += 1
+                    # Client honoring Retry-After, shortened
+                    await asyncio.sleep(0.05)
+                    continue
+            counts["done"] += 1
+
+    await asyncio.gather(*(login() for _ in range(logins)))
+    return counts
+
+
+async def main(logins: int, seconds: float, rounds: int):
+    hashed = pwd_context.hash(PASSWORD, rounds=rounds)
+    print(f"{logins} concurrent logins, bcrypt cost {rounds}, {seconds}s per phase")
+    print(f"{'phase':<10} {'probe p50 ms':>13} {'probe p99 ms':>13} {'logins/s':>9} {'rejected':>9}")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for mode in ("baseline", "inline", "pool"):
+            stop = asyncio.Event()
+            asyncio.get_running_loop().call_later(seconds, stop.set)
+            tasks = [probe(client, stop)]
+            if mode != "baseline":
+                tasks.append(storm(mode, hashed, logins, stop))
+            timings, *counts = await asyncio.gather(*tasks)
+            counts = counts[0] if counts else {"done": 0, "rejected": 0}
+
+            timings.sort()
+            p50 = timings[len(timings) // 2] * 1000
+            p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1000
+            print(f"{mode:<10} {p50:>13.2f} {p99:>13.2f} {counts['done'] / seconds:>9.1f} {counts['rejected']:>9}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Probe latency during a login storm.")
+    parser.add_argument("--logins", type=int, default=64, help="Concurrent login loops")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Duration of each phase")
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost of the stored hash")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.logins, args.seconds, args.rounds))
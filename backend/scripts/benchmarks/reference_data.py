@@ -0,0 +1,71 @@
+"""
+Benchmark the /config reference-data endpoints in steady state.
+
+Calls the app in-process (no network) and reports, per endpoint, the
+latency of a full 200 response and of a 304 revalidation with If-None-Match,
+plus the number of statements executed after the first (warming) call.
+
+Usage:
+    python -m scripts.benchmarks.reference_data
+    python -m scripts.benchmarks.reference_data --repeat 5000
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from sqlalchemy import event
+
+from app.core.database import engine, read_engine
+from app.main import app
+from scripts.benchmarks.submit_session import StatementCounter
+
+
+ENDPOINTS = ("/api/v1/config/languages", "/api/v1/config/domains", "/api/v1/config/difficulties")
+
+
+def report(label: str, timings):
+    timings.sort()
+    p50 = timings[len(timings) // 2] * 1000
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1000
+    print(f"{label:<36} {p50:>8.3f} {p99:>8.3f}")
+
+
+async def main(repeat: int):
+    counter = StatementCounter()
+    engines = {engine.sync_engine, read_engine.sync_engine}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        print(f"{repeat} calls per case (times in ms)")
+        print(f"{'case':<36} {'p50':>8} {'p99':>8}")
+        for url in ENDPOINTS:
+            etag = (await client.get(url)).headers["etag"]
+
+            for target in engines:
+                event.listen(target, "before_cursor_execute", counter)
+            counter.round_trips = 0
+            for label, headers, status in (
+                ("200", {}, 200),
+                ("304", {"If-None-Match": etag}, 304),
+            ):
+                timings = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    response = await client.get(url, headers=headers)
+                    timings.append(time.perf_counter() - start)
+                    assert response.status_code == status, response.status_code
+                report(f"{url.rsplit('/', 1)[-1]} {label}", timings)
+            for target in engines:
+                event.remove(target, "before_cursor_execute", counter)
+            print(f"{'':<4}statements after warm-up: {counter.round_trips}")
+
+    await engine.dispose()
+    await read_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the cached /config endpoints.")
+    parser.add_argument("--repeat", type=int, default=1000, help="Calls per endpoint and case")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.repeat))
@@ -0,0 +1,95 @@
+"""
+Benchmark session word sampling at growing catalog sizes.
+
+Compares the in-memory catalog sampler with the former
+`ORDER BY random() LIMIT n` query. The database side only runs with
+--database and works on a temporary table, so real data is untouched.
+
+Usage:
+    python -m scripts.benchmarks.sampling
+    python -m scripts.benchmarks.sampling --database --sizes 10000 100000
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from typing import Callable, List
+
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.domain.vocab.catalog import CatalogEntry
+from app.domain.session.prefetch import WORDS_PER_DIFFICULTY
+
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+def build_entry(size: int) -> CatalogEntry:
+    return CatalogEntry(
+        concepts=tuple(f"concept_{i}" for i in range(size)),
+        from_ids=b"".join(uuid.uuid4().bytes for _ in range(size)),
+        to_ids=b"".join(uuid.uuid4().bytes for _ in range(size)),
+    )
+
+
+def time_calls(fn: Callable, repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(label: str, size: int, timings: List[float]):
+    timings = sorted(timings)
+    p50 = timings[len(timings) // 2] * 1000
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1000
+    print(f"{label:<24} {size:>10,} {p50:>10.4f} {p99:>10.4f}")
+
+
+async def time_order_by_random(size: int, k: int, repeat: int) -> List[float]:
+    async with engine.connect() as conn:
+        await conn.execute(text("CREATE TEMP TABLE bench_concepts (concept text PRIMARY KEY)"))
+        await conn.execute(
+            text("INSERT INTO bench_concepts SELECT 'concept_' || g FROM generate_series(1, :n) g"),
+            {"n": size}
+        )
+        await conn.execute(text("ANALYZE bench_concepts"))
+
+        query = text("SELECT concept FROM bench_concepts ORDER BY random() LIMIT :k")
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            (await conn.execute(query, {"k": k})).all()
+            timings.append(time.perf_counter() - start)
+
+        await conn.execute(text("DROP TABLE bench_concepts"))
+        await conn.commit()
+    return timings
+
+
+async def main(sizes: List[int], repeat: int, database: bool):
+    k = max(WORDS_PER_DIFFICULTY.values())
+    print(f"Sampling {k} words, {repeat} runs per size (times in ms)")
+    print(f"{'method':<24} {'concepts':>10} {'p50':>10} {'p99':>10}")
+
+    for size in sizes:
+        entry = build_entry(size)
+        report("catalog sample", size, time_calls(lambda: entry.sample(k), repeat))
+
+        if database:
+            report("ORDER BY random()", size, await time_order_by_random(size, k, repeat))
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark session word sampling.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Catalog sizes to test")
+    parser.add_argument("--repeat", type=int, default=200, help="Samples drawn per size")
+    parser.add_argument("--database", action="store_true", help="Also time ORDER BY random() in Postgres")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.sizes, args.repeat, args.database))
@@ -0,0 +1,130 @@
+"""
+Microbenchmark of SessionDetail serialization, per session response.
+
+Compares the former path, where the endpoint built a SessionDetail and
+FastAPI dumped, re-validated and JSON-encoded it against response_model,
+with the current one: a plain dict from the cached, validated rows encoded
+by FastJSONResponse (orjson when installed). No database is needed, the
+catalog is filled with synthetic rows.
+
+Usage:
+    python -m scripts.benchmarks.session_serialization
+    python -m scripts.benchmarks.session_serialization --words 20 --repeat 2000
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.core import responses
+from app.core.responses import FastJSONResponse
+from app.domain.session.detail import build_session_detail
+from app.domain.session.models import SessionType
+from app.domain.session.schemas import SessionDetail, SessionWordDetail
+from app.domain.vocab.catalog import vocab_catalog
+from app.domain.vocab.schemas import LanguageSchema, TranslationDetail, TranslationSchema
+
+
+def synthetic_session(num_words: int):
+    now = datetime.utcnow()
+    languages = {code: LanguageSchema(code=code, name=name) for code, name in (("en", "English"), ("fr", "French"))}
+    session = SimpleNamespace(
+        id=uuid.uuid4(), user_id=uuid.uuid4(), config_id=uuid.uuid4(), source_lang_code="en",
+        target_lang_code="fr", domain=None, difficulty="HARD", session_type=SessionType.COMPREHENSION,
+        created_at=now, score=None, completed_at=None,
+    )
+    translations = {}
+    words = []
+    for i in range(num_words):
+        pair = {}
+        for lang in ("en", "fr"):
+            translation = TranslationSchema(
+                id=uuid.uuid4(), master_word_concept=f"concept-{i}", text=f"word {i} {lang}",
+                language_code=lang, sentence_example=f"An example sentence for word {i}.",
+                synonyms=[f"synonym {i}"], created_at=now, updated_at=now,
+            )
+            translations[translation.id] = translation
+            pair[lang] = translation.id
+        words.append(SimpleNamespace(
+            id=uuid.uuid4(), session_id=session.id, translation_from_id=pair["en"], translation_to_id=pair["fr"],
+            from_language="en", to_language="fr", correct=None, user_answer=None, created_at=now,
+        ))
+    return session, words, translations, languages
+
+
+def legacy_render(session, words, translations, languages) -> bytes:
+    """Former build_session_detail, then what FastAPI does with response_model"""
+    def detail(t):
+        return TranslationDetail.model_construct(**dict(t), language=languages[t.language_code])
+
+    results = [
+        SessionWordDetail(
+            id=w.id, session_id=w.session_id, translation_from_id=w.translation_from_id,
+            translation_to_id=w.translation_to_id, from_language=w.from_language, to_language=w.to_language,
+            correct=w.correct, user_answer=w.user_answer, created_at=w.created_at,
+            translation_from=detail(translations[w.translation_from_id]),
+            translation_to=detail(translations[w.translation_to_id]),
+        )
+        for w in words
+    ]
+    returned = SessionDetail(
+        id=session.id, user_id=session.user_id, config_id=session.config_id,
+        source_lang_code=session.source_lang_code, target_lang_code=session.target_lang_code,
+        domain=session.domain, difficulty=session.difficulty, session_type=session.session_type,
+        created_at=session.created_at, score=session.score, completed_at=session.completed_at, results=results,
+    )
+    # serialize_response: dump the returned model, validate it against
+    # response_model, dump it to JSON-compatible data, then JSONResponse
+    content = returned.model_dump(by_alias=True)
+    validated = SessionDetail.model_validate(content)
+    jsonable = validated.model_dump(mode="json", by_alias=True)
+    return json.dumps(jsonable, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+async def current_render(session, words) -> bytes:
+    content = await build_session_detail(None, session, words)
+    return FastJSONResponse(content).body
+
+
+async def main(num_words: int, repeat: int):
+    session, words, translations, languages = synthetic_session(num_words)
+    # Warm catalog, as in steady state
+    vocab_catalog._languages = languages
+    vocab_catalog._translations.update(translations)
+
+    legacy_body = legacy_render(session, words, translations, languages)
+    current_body = await current_render(session, words)
+    assert json.loads(legacy_body) == json.loads(current_body), "Payloads differ"
+
+    encoder = "orjson" if responses.orjson is not None else "json (install orjson for the fast path)"
+    print(f"{num_words} words per session, {repeat} renders, encoder: {encoder}")
+    print(f"{'path':<10} {'p50 us':>9} {'p99 us':>9} {'bytes':>8}")
+
+    async def legacy():
+        return legacy_render(session, words, translations, languages)
+
+    for name, render, body in (
+        ("legacy", legacy, legacy_body),
+        ("current", lambda: current_render(session, words), current_body),
+    ):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            await render()
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        p50 = timings[len(timings) // 2] * 1e6
+        p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1e6
+        print(f"{name:<10} {p50:>9.0f} {p99:>9.0f} {len(body):>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Microbenchmark of session response serialization.")
+    parser.add_argument("--words", type=int, default=20, help="Words per session (HARD sessions use 20)")
+    parser.add_argument("--repeat", type=int, default=2000, help="Renders per path")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.words, args.repeat))
@@ -0,0 +1,158 @@
+"""
+Benchmark statements and latency per session submit, before and after the
+set-based rewrite.
+
+Needs a seeded database. Everything runs inside one transaction that is
+rolled back at the end, so no data is left behind.
+
+Usage:
+    python -m scripts.benchmarks.submit_session
+    python -m scripts.benchmarks.submit_session --words 20 --repeat 50 --source en --target fr
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import engine
+from app.domain.session.models import Session, SessionConfig, SessionType, SessionWord, UserProgress
+from app.domain.session.progress import record_session_results
+from app.domain.session.schemas import SessionWordCreate
+from app.domain.user.models import User
+from app.domain.vocab.catalog import vocab_catalog
+
+
+class StatementCounter:
+    """Counts driver calls (round trips) and executed parameter sets (statements)"""
+
+    def __init__(self):
+        self.round_trips = 0
+        self.statements = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.round_trips += 1
+        self.statements += len(parameters) if executemany else 1
+
+
+async def legacy_submit(db: AsyncSession, session_id, user_id, words: List[SessionWordCreate]):
+    """The former per-row ORM implementation of submit_session"""
+    translation_to_ids = [w.translation_to_id for w in words]
+    session_words = (await db.execute(select(SessionWord).where(
+        SessionWord.session_id == session_id,
+        SessionWord.translation_to_id.in_(translation_to_ids)
+    ))).scalars().all()
+    session_words_by_id = {sw.translation_to_id: sw for sw in session_words}
+
+    progress_records = (await db.execute(select(UserProgress).where(
+        UserProgress.user_id == user_id,
+        UserProgress.translation_id.in_(translation_to_ids)
+    ))).scalars().all()
+    progress_by_id = {up.translation_id: up for up in progress_records}
+
+    for r_in in words:
+        existing = session_words_by_id.get(r_in.translation_to_id)
+        if existing:
+            existing.correct = r_in.correct
+            existing.user_answer = r_in.user_answer
+            prog = progress_by_id.get(r_in.translation_to_id)
+            if not prog:
+                prog = UserProgress(user_id=user_id, translation_id=r_in.translation_to_id, correct_count=0, incorrect_count=0)
+                db.add(prog)
+                progress_by_id[r_in.translation_to_id] = prog
+            if r_in.correct:
+                prog.correct_count += 1
+            else:
+                prog.incorrect_count += 1
+            prog.last_reviewed = datetime.utcnow()
+    await db.flush()
+
+
+async def new_submit(db: AsyncSession, session_id, user_id, words: List[SessionWordCreate]):
+    await record_session_results(db, session_id, user_id, words)
+    await db.flush()
+
+
+async def main(num_words: int, repeat: int, source: str, target: str):
+    counter = StatementCounter()
+
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        db = AsyncSession(bind=conn, expire_on_commit=False)
+        try:
+            entry = await vocab_catalog.get(db, source, target)
+            pairs = entry.sample(num_words)
+            if not pairs:
+                raise SystemExit(f"No word pairs for {source}->{target}, seed the database first")
+
+            user = User(email=f"bench-{uuid.uuid4()}@example.com", is_active=True)
+            db.add(user)
+            await db.flush()
+            config = SessionConfig(
+                user_id=user.id, native_language=source, language_tested=target,
+                session_type=SessionType.COMPREHENSION
+            )
+            db.add(config)
+            await db.flush()
+            session = Session(
+                config_id=config.id, user_id=user.id, source_lang_code=source,
+                target_lang_code=target, session_type=SessionType.COMPREHENSION
+            )
+            db.add(session)
+            await db.flush()
+            for _, from_id, to_id in pairs:
+                db.add(SessionWord(
+                    session_id=session.id, translation_from_id=from_id, translation_to_id=to_id,
+                    from_language=source, to_language=target
+                ))
+            await db.flush()
+
+            print(f"{len(pairs)} words per submit, {repeat} submits (times in ms)")
+            print(f"{'implementation':<16} {'round trips':>12} {'statements':>11} {'p50':>8} {'p99':>8}")
+            for name, submit in (("per-row ORM", legacy_submit), ("set-based", new_submit)):
+                timings = []
+                counter.round_trips = counter.statements = 0
+                event.listen(engine.sync_engine, "before_cursor_execute", counter)
+                for _ in range(repeat):
+                    words = [
+                        SessionWordCreate(
+                            translation_from_id=from_id, translation_to_id=to_id,
+                            from_language=source, to_language=target,
+                            correct=random.random() < 0.7, user_answer="answer"
+                        )
+                        for _, from_id, to_id in pairs
+                    ]
+                    start = time.perf_counter()
+                    await submit(db, session.id, user.id, words)
+                    timings.append(time.perf_counter() - start)
+                event.remove(engine.sync_engine, "before_cursor_execute", counter)
+                # Start each implementation from a clean identity map
+                db.expunge_all()
+
+                timings.sort()
+                print(
+                    f"{name:<16} {counter.round_trips / repeat:>12.1f} {counter.statements / repeat:>11.1f} "
+                    f"{timings[len(timings) // 2] * 1000:>8.2f} "
+                    f"{timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1000:>8.2f}"
+                )
+        finally:
+            await db.close()
+            await transaction.rollback()
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark session submit statements and latency.")
+    parser.add_argument("--words", type=int, default=20, help="Words per session (HARD sessions use 20)")
+    parser.add_argument("--repeat", type=int, default=50, help="Submits per implementation")
+    parser.add_argument("--source", default="en", help="Source language code")
+    parser.add_argument("--target", default="fr", help="Target language code")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.words, args.repeat, args.source, args.target))
@@ -0,0 +1,80 @@
+"""
+Benchmark the authenticated user lookup with and without the user cache.
+
+Times the lookup done by get_current_user on every request: the uncached
+SELECT by email, then the cached path (backend get plus session attach).
+Uses the configured backend, so set CACHE_URL to measure a shared one.
+The benchmark user is created in a transaction that is rolled back.
+
+Usage:
+    python -m scripts.benchmarks.user_cache
+    python -m scripts.benchmarks.user_cache --repeat 2000
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import engine
+from app.domain.user.cache import get_user_by_email, invalidate_user, user_cache
+from app.domain.user.models import User
+
+
+def report(label: str, timings):
+    timings.sort()
+    p50 = timings[len(timings) // 2] * 1000
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1000
+    print(f"{label:<10} {p50:>8.3f} {p99:>8.3f}")
+    return p50
+
+
+async def main(repeat: int):
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        db = AsyncSession(bind=conn, expire_on_commit=False)
+        try:
+            email = f"bench-{uuid.uuid4()}@example.com"
+            db.add(User(email=email, is_active=True))
+            await db.flush()
+            db.expunge_all()
+
+            uncached = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                (await db.execute(select(User).where(User.email == email))).scalar_one()
+                uncached.append(time.perf_counter() - start)
+                # Each request has its own session, so start from an empty identity map
+                db.expunge_all()
+
+            await invalidate_user(email)
+            await get_user_by_email(db, email)
+            db.expunge_all()
+            cached = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                await get_user_by_email(db, email)
+                cached.append(time.perf_counter() - start)
+                db.expunge_all()
+
+            print(f"{repeat} lookups, backend {type(user_cache.backend).__name__} (times in ms)")
+            print(f"{'lookup':<10} {'p50':>8} {'p99':>8}")
+            saved = report("uncached", uncached) - report("cached", cached)
+            print(f"saved per request (p50): {saved:.3f} ms")
+            print(f"counters: {user_cache.stats()}")
+            await invalidate_user(email)
+        finally:
+            await db.close()
+            await transaction.rollback()
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the cached user lookup.")
+    parser.add_argument("--repeat", type=int, default=1000, help="Lookups per variant")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.repeat))
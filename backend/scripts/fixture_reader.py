@@ -0,0 +1,102 @@
+"""
+Incremental reader for fixture files.
+
+Yields records one by one from a top-level JSON array (or from NDJSON, one
+object per line), reading the file in fixed-size chunks. Peak memory is
+bounded by the chunk size plus one record, whatever the size of the file.
+"""
+import json
+import re
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List
+
+
+CHUNK_SIZE = 64 * 1024
+NDJSON_SUFFIXES = {".ndjson", ".jsonl"}
+FIXTURE_SUFFIXES = {".json"} | NDJSON_SUFFIXES
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def iter_records(path: Path, chunk_size: int = CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """Yield the records of a fixture file, picking the format from its suffix"""
+    if path.suffix in NDJSON_SUFFIXES:
+        return iter_ndjson(path)
+    return iter_json_array(path, chunk_size)
+
+
+def iter_ndjson(path: Path) -> Iterator[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_number}: {e}") from e
+
+
+def iter_json_array(path: Path, chunk_size: int = CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as f:
+        buffer = ""
+        pos = 0
+        eof = False
+        # start: expect "[", first: value or "]", value: value, separator: "," or "]"
+        state = "start"
+
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+
+            need_more = pos == len(buffer)
+            if not need_more:
+                char = buffer[pos]
+                if state == "start":
+                    if char != "[":
+                        raise ValueError(f"{path}: expected a top-level JSON array")
+                    pos += 1
+                    state = "first"
+                    continue
+                if state == "separator" or (state == "first" and char == "]"):
+                    if char == "]":
+                        return
+                    if char != ",":
+                        raise ValueError(f"{path}: expected ',' or ']' between records")
+                    pos += 1
+                    state = "value"
+                    continue
+
+                try:
+                    record, end = decoder.raw_decode(buffer, pos)
+                    # Only trust the value once its delimiter is in the buffer:
+                    # a number like "2.5" cut after "2" still decodes
+                    after = _WHITESPACE.match(buffer, end).end()
+                    need_more = not eof and (after == len(buffer) or buffer[after] not in ",]")
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    need_more = True
+
+                if not need_more:
+                    pos = end
+                    state = "separator"
+                    yield record
+                    continue
+
+            if eof:
+                raise ValueError(f"{path}: unexpected end of file")
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+
+
+def batched(records: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    iterator = iter(records)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
@@ -0,0 +1,41 @@
+"""
+Rebuild or check the user_stats rollup (user_stats and user_stats_breakdown).
+
+submit_session keeps it up to date; this is for the initial backfill, for
+manual repairs and for verifying that it matches user_progress and sessions.
+
+Usage:
+    python -m scripts.rebuild_user_stats
+    python -m scripts.rebuild_user_stats --check
+"""
+import argparse
+import asyncio
+import sys
+
+from app.core.database import AsyncSessionLocal
+from app.domain.session.rollup import check_user_stats, rebuild_user_stats
+
+
+async def main(check_only: bool) -> int:
+    async with AsyncSessionLocal() as session:
+        if not check_only:
+            print("Rebuilding user_stats and user_stats_breakdown...")
+            await rebuild_user_stats(session)
+            await session.commit()
+
+        consistent = True
+        for table, (missing, stale) in (await check_user_stats(session)).items():
+            if missing or stale:
+                print(f"✗ {table} inconsistent: {missing} missing row(s), {stale} stale row(s)")
+                consistent = False
+            else:
+                print(f"✓ {table} matches user_progress and sessions")
+        return 0 if consistent else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild or check the user stats rollup.")
+    parser.add_argument("--check", action="store_true", help="Only compare the rollup with its sources")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(main(args.check)))
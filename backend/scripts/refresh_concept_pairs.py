@@ -0,0 +1,40 @@
+"""
+Rebuild or check the concept_language_pairs table.
+
+The seeder and the admin endpoints keep it up to date; this is for manual
+repairs and for verifying that it matches translations.
+
+Usage:
+    python -m scripts.refresh_concept_pairs
+    python -m scripts.refresh_concept_pairs --check
+"""
+import argparse
+import asyncio
+import sys
+
+from app.core.database import AsyncSessionLocal
+from app.domain.vocab.catalog import commit_catalog_changes
+from app.domain.vocab.pairs import check_concept_language_pairs, refresh_concept_language_pairs
+
+
+async def main(check_only: bool) -> int:
+    async with AsyncSessionLocal() as session:
+        if not check_only:
+            print("Rebuilding concept_language_pairs...")
+            await refresh_concept_language_pairs(session)
+            await commit_catalog_changes(session)
+
+        missing, stale = await check_concept_language_pairs(session)
+        if missing or stale:
+            print(f"✗ Inconsistent: {missing} missing row(s), {stale} stale row(s)")
+            return 1
+        print("✓ concept_language_pairs matches translations")
+        return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild or check the concept_language_pairs table.")
+    parser.add_argument("--check", action="store_true", help="Only compare the table with translations")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(main(args.check)))
@@ -7,30 +7,155 @@ The new structure organizes fixtures by domain:
 - fixtures/<domain_code>/master_words.json
 - fixtures/<domain_code>/translations_<lang>.json
 
+Fixture files whose content hash is unchanged since their last load are
+skipped (see the fixture_checksums table); use --force to reload everything.
+
+The bulk and parallel modes stream fixture files and also accept NDJSON
+(`.ndjson` / `.jsonl`, one record per line) in the domain folders.
+
 Usage:
     python -m scripts.seed_database
+    python -m scripts.seed_database --bulk
+    python -m scripts.seed_database --jobs 4
     
 Or from Docker:
     docker compose exec backend python -m scripts.seed_database
 """
 import argparse
 import asyncio
+import hashlib
 import json
+import time
+from datetime import datetime
+from concurrent.futures import Executor, ThreadPoolExecutor
 from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import AsyncSessionLocal
-from app.domain.vocab.models import Language, Domain, MasterWord, Translation
+from app.domain.vocab.models import Language, Domain, MasterWord, Translation, FixtureChecksum
+from app.domain.vocab.catalog import commit_catalog_changes
+from app.domain.vocab.ingest import upsert_master_words, upsert_translations
+from app.domain.vocab.pairs import refresh_concept_language_pairs
+from scripts.fixture_reader import FIXTURE_SUFFIXES, batched, iter_records
 
 
 FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
+BULK_BATCH_SIZE = 1000
+
+
+def file_digest(path: Path) -> str:
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def record_digest(record: Dict) -> str:
+    encoded = json.dumps(record, sort_keys=True, ensure_ascii=False).encode()
+    return hashlib.blake2b(encoded, digest_size=8).hexdigest()
+
 
+class FixtureChecksums:
+    """Content hashes of the fixture files already loaded (fixture_checksums table).
 
-async def load_languages(session: AsyncSession):
+    Files whose hash did not change since their last successful load are
+    skipped. With record hashes enabled, a changed file only applies the
+    records whose own hash changed.
+    """
+    
+    def __init__(self, stored: Dict[str, FixtureChecksum] = None, force: bool = False, record_hashes: bool = False):
+        self.stored = stored or {}
+        self.force = force
+        self.record_hashes = record_hashes
+        self.loaded = 0
+        self.skipped = 0
+    
+    @classmethod
+    async def load(cls, session: AsyncSession, force: bool = False, record_hashes: bool = False) -> "FixtureChecksums":
+        rows = (await session.execute(select(FixtureChecksum))).scalars().all()
+        return cls({row.path: row for row in rows}, force=force, record_hashes=record_hashes)
+    
+    @staticmethod
+    def key(path: Path) -> str:
+        return path.relative_to(FIXTURES_DIR).as_posix()
+    
+    def changed(self, path: Path) -> Optional[str]:
+        """Return the file digest, or None when the file is unchanged since its last load"""
+        digest = file_digest(path)
+        stored = self.stored.get(self.key(path))
+        if stored is not None and stored.sha256 == digest and not self.force:
+            self.skipped += 1
+            return None
+        return digest
+    
+    def previous_record_hashes(self, path: Path) -> Dict[str, str]:
+        stored = self.stored.get(self.key(path))
+        if stored is None or self.force:
+            return {}
+        return stored.record_hashes or {}
+    
+    async def save(self, session: AsyncSession, path: Path, digest: str, record_hashes: Dict[str, str] = None):
+        """Record a loaded file, in the same transaction as its data"""
+        stmt = insert(FixtureChecksum.__table__).values(
+            path=self.key(path),
+            sha256=digest,
+            record_hashes=record_hashes
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["path"],
+            set_={
+                "sha256": stmt.excluded.sha256,
+                "record_hashes": stmt.excluded.record_hashes,
+                "updated_at": datetime.utcnow()
+            }
+        )
+        await session.execute(stmt)
+        self.loaded += 1
+
+
+def mark_loaded(checksums: FixtureChecksums, path: Path, missing: int) -> bool:
+    """Whether a file can be recorded as loaded: not if records were dropped.
+
+    Translations of concepts that don't exist yet (or, in parallel mode, are
+    not committed yet by another domain) must be retried on the next run.
+    """
+    if missing:
+        print(f"    {checksums.key(path)} not recorded as loaded, {missing} record(s) skipped")
+        return False
+    return True
+
+
+def changed_records(
+    records: List[Dict],
+    key: Callable[[Dict], str],
+    previous: Dict[str, str],
+    current: Dict[str, str]
+) -> List[Dict]:
+    """Store each record's hash in `current` and keep the ones that differ from `previous`"""
+    changed = []
+    for record in records:
+        record_key = key(record)
+        current[record_key] = record_digest(record)
+        if previous.get(record_key) != current[record_key]:
+            changed.append(record)
+    return changed
+
+
+async def load_languages(session: AsyncSession, checksums: FixtureChecksums = None):
     """Load languages from fixtures/languages.json"""
     print("Loading languages...")
-    with open(FIXTURES_DIR / "languages.json") as f:
+    checksums = checksums or FixtureChecksums()
+    languages_file = FIXTURES_DIR / "languages.json"
+    digest = checksums.changed(languages_file)
+    if digest is None:
+        print("  Unchanged, skipping")
+        return
+    
+    with open(languages_file) as f:
         languages_data = json.load(f)
     
     for lang_data in languages_data:
@@ -43,13 +168,21 @@ async def load_languages(session: AsyncSession):
         if not existing:
             language = Language(**lang_data)
             session.add(language)
+    await checksums.save(session, languages_file, digest)
     await session.commit()
 
 
-async def load_domains(session: AsyncSession):
+async def load_domains(session: AsyncSession, checksums: FixtureChecksums = None):
     """Load domains from fixtures/domains.json"""
     print("\nLoading domains...")
-    with open(FIXTURES_DIR / "domains.json") as f:
+    checksums = checksums or FixtureChecksums()
+    domains_file = FIXTURES_DIR / "domains.json"
+    digest = checksums.changed(domains_file)
+    if digest is None:
+        print("  Unchanged, skipping")
+        return
+    
+    with open(domains_file) as f:
         domains_data = json.load(f)
     
     for domain_data in domains_data:
@@ -65,12 +198,14 @@ async def load_domains(session: AsyncSession):
         else:
             # Update existing domain
             existing.name = domain_data["name"]    
+    await checksums.save(session, domains_file, digest)
     await session.commit()
 
 
-async def load_master_words(session: AsyncSession, domain_code: str = None):
+async def load_master_words(session: AsyncSession, domain_code: str = None, checksums: FixtureChecksums = None):
     """Load master words from domain-specific fixture files"""
     print("\nLoading master words...")
+    checksums = checksums or FixtureChecksums()
     
     # Get all domain folders
     domain_folders = [d for d in FIXTURES_DIR.iterdir() if d.is_dir()]
@@ -86,6 +221,10 @@ async def load_master_words(session: AsyncSession, domain_code: str = None):
         master_words_file = domain_folder / "master_words.json"
         if not master_words_file.exists():
             continue
+        
+        digest = checksums.changed(master_words_file)
+        if digest is None:
+            continue
             
         with open(master_words_file) as f:
             words_data = json.load(f)
@@ -110,13 +249,16 @@ async def load_master_words(session: AsyncSession, domain_code: str = None):
                 existing.difficulty = word_data["difficulty"]
                 existing.image_url = word_data.get("image_url")
                 existing.word_type = word_data.get("word_type")
+        
+        await checksums.save(session, master_words_file, digest)
     
     await session.commit()
 
 
-async def load_translations(session: AsyncSession, domain_code: str = None):
+async def load_translations(session: AsyncSession, domain_code: str = None, checksums: FixtureChecksums = None):
     """Load translations from domain and language-specific fixture files"""
     print("\nLoading translations...")
+    checksums = checksums or FixtureChecksums()
     
     # Get all domain folders
     domain_folders = [d for d in FIXTURES_DIR.iterdir() if d.is_dir()]
@@ -139,12 +281,17 @@ async def load_translations(session: AsyncSession, domain_code: str = None):
         for trans_file in sorted(translation_files):
             lang_code = trans_file.stem.split('_')[1]
             
+            digest = checksums.changed(trans_file)
+            if digest is None:
+                continue
+            
             with open(trans_file) as f:
                 translations_data = json.load(f)
             
             if not translations_data:  # Skip empty files
                 continue
-                
+            
+            missing = 0
             for trans_data in translations_data:
                 # Find the master word by concept
                 result = await session.execute(
@@ -154,6 +301,7 @@ async def load_translations(session: AsyncSession, domain_code: str = None):
                 
                 if not master_word:
                     print(f"    ✗ Master word not found for concept: {trans_data['concept']}")
+                    missing += 1
                     continue
                 
                 # Check if translation already exists for this master_word + language
@@ -180,11 +328,232 @@ async def load_translations(session: AsyncSession, domain_code: str = None):
                     existing.plural_text = trans_data.get("plural_text")
                     existing.sentence_example = trans_data.get("sentence_example")
                     existing.synonyms = trans_data.get("synonyms")
+            
+            if not mark_loaded(checksums, trans_file, missing):
+                continue
+            await checksums.save(session, trans_file, digest)
+    
+    await session.commit()
+
+
+def get_domain_folders(domain_code: str = None):
+    """List fixture domain folders, optionally restricted to one domain"""
+    domain_folders = [d for d in FIXTURES_DIR.iterdir() if d.is_dir()]
+    if domain_code:
+        domain_folders = [d for d in domain_folders if d.name == domain_code]
+        if not domain_folders:
+            print(f"  Warning: No domain folder found for '{domain_code}'")
+    return sorted(domain_folders)
+
+
+def report_rate(label: str, rows: int, elapsed: float):
+    rate = rows / elapsed if elapsed > 0 else 0
+    print(f"  {label}: {rows} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+
+
+def find_fixtures(domain_folder: Path, pattern: str) -> List[Path]:
+    """Fixture files matching pattern, as JSON arrays or NDJSON"""
+    return sorted(p for p in domain_folder.glob(f"{pattern}.*") if p.suffix in FIXTURE_SUFFIXES)
+
+
+async def iter_fixture_batches(path: Path, parse_pool: Executor = None) -> AsyncIterator[List[Dict]]:
+    """Stream a fixture file in batches, parsing in the parse pool when given.
+
+    Only one batch is held in memory at a time, whatever the file size.
+    """
+    batches = batched(iter_records(path), BULK_BATCH_SIZE)
+    loop = asyncio.get_running_loop()
+    while True:
+        if parse_pool is None:
+            batch = next(batches, None)
+        else:
+            batch = await loop.run_in_executor(parse_pool, next, batches, None)
+        if batch is None:
+            return
+        yield batch
+
+
+async def bulk_load_domain_master_words(
+    session: AsyncSession,
+    domain_folder: Path,
+    known_concepts: Set[str],
+    checksums: FixtureChecksums,
+    parse_pool: Executor = None
+) -> int:
+    """Upsert one domain's master words, adding their concepts to known_concepts"""
+    total = 0
+    for master_words_file in find_fixtures(domain_folder, "master_words"):
+        digest = checksums.changed(master_words_file)
+        if digest is None:
+            continue
+        
+        start = time.perf_counter()
+        previous = checksums.previous_record_hashes(master_words_file)
+        record_hashes = {} if checksums.record_hashes else None
+        written = 0
+        async for words_data in iter_fixture_batches(master_words_file, parse_pool):
+            known_concepts.update(word_data["concept"] for word_data in words_data)
+            if record_hashes is not None:
+                words_data = changed_records(words_data, lambda w: w["concept"], previous, record_hashes)
+            written += await upsert_master_words(session, words_data)
+        await checksums.save(session, master_words_file, digest, record_hashes)
+        
+        if written:
+            report_rate(f"{domain_folder.name}/{master_words_file.name}", written, time.perf_counter() - start)
+        total += written
+    return total
+
+
+async def bulk_load_domain_translations(
+    session: AsyncSession,
+    domain_folder: Path,
+    known_concepts: Set[str],
+    checksums: FixtureChecksums,
+    parse_pool: Executor = None
+) -> int:
+    """Upsert one domain's translations, skipping unknown concepts"""
+    total = 0
+    for trans_file in find_fixtures(domain_folder, "translations_*"):
+        digest = checksums.changed(trans_file)
+        if digest is None:
+            continue
+        
+        start = time.perf_counter()
+        previous = checksums.previous_record_hashes(trans_file)
+        record_hashes = {} if checksums.record_hashes else None
+        written = 0
+        missing = 0
+        async for translations_data in iter_fixture_batches(trans_file, parse_pool):
+            valid = []
+            for trans_data in translations_data:
+                if trans_data["concept"] in known_concepts:
+                    valid.append(trans_data)
+                else:
+                    print(f"    ✗ Master word not found for concept: {trans_data['concept']}")
+                    missing += 1
+            if record_hashes is not None:
+                valid = changed_records(
+                    valid, lambda t: f"{t['concept']}:{t['language_code']}", previous, record_hashes
+                )
+            written += await upsert_translations(session, valid)
+        if mark_loaded(checksums, trans_file, missing):
+            await checksums.save(session, trans_file, digest, record_hashes)
+        
+        if written:
+            report_rate(f"{domain_folder.name}/{trans_file.name}", written, time.perf_counter() - start)
+        total += written
+    return total
+
+
+async def get_known_concepts(session: AsyncSession) -> Set[str]:
+    return set((await session.execute(select(MasterWord.concept))).scalars())
+
+
+async def bulk_load_master_words(
+    session: AsyncSession,
+    domain_code: str = None,
+    checksums: FixtureChecksums = None
+) -> int:
+    """Upsert master words in batches with INSERT ... ON CONFLICT DO UPDATE"""
+    print("\nLoading master words (bulk)...")
+    checksums = checksums or FixtureChecksums()
+    known_concepts = set()
+    total = 0
+    for domain_folder in get_domain_folders(domain_code):
+        total += await bulk_load_domain_master_words(session, domain_folder, known_concepts, checksums)
     
     await session.commit()
+    return total
+
+
+async def bulk_load_translations(
+    session: AsyncSession,
+    domain_code: str = None,
+    checksums: FixtureChecksums = None
+) -> int:
+    """Upsert translations in batches with INSERT ... ON CONFLICT DO UPDATE"""
+    print("\nLoading translations (bulk)...")
+    checksums = checksums or FixtureChecksums()
+    known_concepts = await get_known_concepts(session)
+    total = 0
+    for domain_folder in get_domain_folders(domain_code):
+        total += await bulk_load_domain_translations(session, domain_folder, known_concepts, checksums)
+    
+    await session.commit()
+    return total
+
+
+async def load_domain(
+    domain_folder: Path,
+    known_concepts: Set[str],
+    checksums: FixtureChecksums,
+    parse_pool: Executor
+) -> int:
+    """Load one domain folder on its own session, in a single transaction"""
+    async with AsyncSessionLocal() as session:
+        try:
+            # Copy: concepts from other domains are not committed yet
+            domain_concepts = set(known_concepts)
+            rows = await bulk_load_domain_master_words(session, domain_folder, domain_concepts, checksums, parse_pool)
+            rows += await bulk_load_domain_translations(session, domain_folder, domain_concepts, checksums, parse_pool)
+            await session.commit()
+            return rows
+        except Exception:
+            await session.rollback()
+            raise
+
+
+async def load_domains_parallel(
+    domain_code: str = None,
+    jobs: int = 1,
+    checksums: FixtureChecksums = None
+) -> Dict[str, Tuple[str, int, float]]:
+    """Load domain folders concurrently, at most `jobs` at a time.
+
+    Each domain gets its own session and transaction, so a failing domain
+    does not roll back the others. Returns {domain: (status, rows, seconds)}.
+    """
+    print(f"\nLoading domains in parallel (jobs={jobs})...")
+    checksums = checksums or FixtureChecksums()
+    async with AsyncSessionLocal() as session:
+        known_concepts = await get_known_concepts(session)
+    
+    semaphore = asyncio.Semaphore(jobs)
+    parse_pool = ThreadPoolExecutor(max_workers=jobs)
+    summary = {}
+    
+    async def run(domain_folder: Path):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                rows = await load_domain(domain_folder, known_concepts, checksums, parse_pool)
+                summary[domain_folder.name] = ("ok", rows, time.perf_counter() - start)
+            except Exception as e:
+                print(f"  ✗ {domain_folder.name} failed: {e}")
+                summary[domain_folder.name] = ("failed", 0, time.perf_counter() - start)
+    
+    try:
+        await asyncio.gather(*(run(folder) for folder in get_domain_folders(domain_code)))
+    finally:
+        parse_pool.shutdown()
+    
+    return summary
+
 
+def print_domain_summary(summary: Dict[str, Tuple[str, int, float]]):
+    print(f"\n{'domain':<20} {'status':<8} {'rows':>8} {'seconds':>9} {'rows/s':>10}")
+    for name, (status, rows, elapsed) in sorted(summary.items()):
+        rate = rows / elapsed if elapsed > 0 else 0
+        print(f"{name:<20} {status:<8} {rows:>8} {elapsed:>9.2f} {rate:>10,.0f}")
 
-async def seed_database(domain_code: str = None):
+
+async def seed_database(
+    domain_code: str = None,
+    bulk: bool = False,
+    jobs: int = 1,
+    force: bool = False,
+    record_hashes: bool = False
+):
     """Main function to seed the database"""
     print("=" * 60)
     if domain_code:
@@ -193,15 +562,38 @@ async def seed_database(domain_code: str = None):
         print("Starting database seeding for all domains...")
     print("=" * 60)
     
+    seed_start = time.perf_counter()
     async with AsyncSessionLocal() as session:
         try:
-            await load_languages(session)
-            await load_domains(session)
-            await load_master_words(session, domain_code)
-            await load_translations(session, domain_code)
+            checksums = await FixtureChecksums.load(session, force=force, record_hashes=record_hashes)
+            await load_languages(session, checksums)
+            await load_domains(session, checksums)
+            failed = []
+            if jobs > 1:
+                summary = await load_domains_parallel(domain_code, jobs, checksums)
+                print_domain_summary(summary)
+                failed = [name for name, (status, _, _) in summary.items() if status != "ok"]
+            elif bulk:
+                start = time.perf_counter()
+                rows = await bulk_load_master_words(session, domain_code, checksums)
+                rows += await bulk_load_translations(session, domain_code, checksums)
+                print()
+                report_rate("Total", rows, time.perf_counter() - start)
+            else:
+                await load_master_words(session, domain_code, checksums)
+                await load_translations(session, domain_code, checksums)
+            
+            print(f"\nFixture files loaded: {checksums.loaded}, unchanged and skipped: {checksums.skipped}")
+            if checksums.loaded:
+                await refresh_concept_language_pairs(session)
+                # Drop the word-selection cache of running API workers
+                await commit_catalog_changes(session)
+            
+            if failed:
+                raise RuntimeError(f"{len(failed)} domain(s) failed to load: {', '.join(sorted(failed))}")
             
             print("\n" + "=" * 60)
-            print("✓ Database seeding completed successfully!")
+            print(f"✓ Database seeding completed successfully in {time.perf_counter() - seed_start:.2f}s!")
             print("=" * 60)
             
         except Exception as e:
@@ -220,6 +612,34 @@ if __name__ == "__main__":
         type=str,
         help="Specific domain code to load (e.g., 'food_dining'). If not provided, all domains will be loaded."
     )
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Upsert fixture rows in batches instead of one query per row (same end state, much faster)."
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Load up to N domain folders concurrently, each in its own transaction (implies --bulk)."
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Reload every fixture file, even when its content hash is unchanged since the last run."
+    )
+    parser.add_argument(
+        "--record-hashes",
+        action="store_true",
+        help="Also store per-record hashes and only apply changed records of changed files (bulk/parallel modes)."
+    )
     args = parser.parse_args()
     
-    asyncio.run(seed_database(domain_code=args.domain))
+    asyncio.run(seed_database(
+        domain_code=args.domain,
+        bulk=args.bulk,
+        jobs=args.jobs,
+        force=args.force,
+        record_hashes=args.record_hashes
+    ))
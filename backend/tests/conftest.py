@@ -0,0 +1,204 @@
+"""
+Test fixtures.
+
+The tests run against a real PostgreSQL database: POSTGRES_* settings as for
+the app, with the database name taken from TEST_POSTGRES_DB (default
+vocab_test). Its tables are dropped and recreated from the models at the
+start of the run and truncated before each test.
+
+    docker compose exec db createdb -U vocab_user vocab_test
+    poetry run pytest
+"""
+import os
+from typing import Callable, Optional
+
+os.environ["POSTGRES_DB"] = os.environ.get("TEST_POSTGRES_DB", "vocab_test")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("DB_ECHO", "false")
+os.environ.setdefault("PREGENERATE_SESSIONS", "false")
+
+import httpx
+import pytest
+from sqlalchemy import text
+
+from app.core import security
+from app.core.cache import MemoryBackend, caches
+from app.core.database import AsyncSessionLocal, Base, engine
+from app.core.metrics import query_budget, route_metrics
+from app.core.query_detector import detector_report
+from app.core.security import create_access_token
+from app.domain.session.prefetch import pending_sessions
+from app.domain.session import models as session_models  # noqa: F401 (registers the tables)
+from app.domain.user.models import User
+from app.domain.user.revocation import revocation_list
+from app.domain.vocab.catalog import commit_catalog_changes, vocab_catalog
+from app.domain.vocab.ingest import upsert_master_words, upsert_translations
+from app.domain.vocab.models import Domain, Language
+from app.domain.vocab.pairs import refresh_concept_language_pairs
+from app.main import app
+
+
+def reset_process_state():
+    """Forget everything cached in memory by previous tests"""
+    vocab_catalog.invalidate()
+    for cache in caches:
+        if isinstance(cache.backend, MemoryBackend):
+            cache.backend._entries.clear()
+    security.token_cache.clear()
+    pending_sessions._submits.clear()
+    revocation_list._revoked.clear()
+    route_metrics.clear()
+    detector_report.clear()
+
+
+@pytest.fixture(scope="session", autouse=True)
+async def schema():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    await engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+async def clean_database(schema):
+    tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+    async with engine.begin() as conn:
+        await conn.execute(text(f"TRUNCATE {tables} CASCADE"))
+    reset_process_state()
+    yield
+
+
+@pytest.fixture
+async def db():
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+async def client():
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture
+async def user(db):
+    user = User(email="learner@example.com", full_name="Learner", is_active=True)
+    db.add(user)
+    await db.commit()
+    return user
+
+
+PASSWORD = "correct horse battery staple"
+
+
+@pytest.fixture
+async def password_user(client):
+    """Credentials of a user registered with a password"""
+    credentials = {"email": "registered@example.com", "password": PASSWORD}
+    response = await client.post("/api/v1/auth/register", json=credentials)
+    response.raise_for_status()
+    return credentials
+
+
+@pytest.fixture
+def auth_headers(user):
+    return {"Authorization": f"Bearer {create_access_token(data={'sub': user.email})}"}
+
+
+VOCAB_WORDS = 30
+
+
+@pytest.fixture
+async def vocab(db):
+    """English and French translations of VOCAB_WORDS EASY family words"""
+    db.add_all([Language(code="en", name="English"), Language(code="fr", name="Français")])
+    db.add(Domain(code="family", name="Family & Relationships"))
+    await db.flush()
+
+    concepts = [f"word-{i}" for i in range(VOCAB_WORDS)]
+    await upsert_master_words(db, [
+        {"concept": concept, "domain_code": "family", "difficulty": "EASY", "word_type": "NOUN"}
+        for concept in concepts
+    ])
+    await upsert_translations(db, [
+        {"concept": concept, "language_code": lang, "text": f"{concept} {lang}", "synonyms": []}
+        for concept in concepts
+        for lang in ("en", "fr")
+    ])
+    await refresh_concept_language_pairs(db, concepts)
+    await commit_catalog_changes(db)
+    return concepts
+
+
+def session_settings(difficulty: str) -> dict:
+    return {"native_language": "en", "language_tested": "fr", "difficulty": difficulty,
+            "domain": "family", "session_type": "COMPREHENSION"}
+
+
+def alternate(i: int, word: dict) -> bool:
+    return i % 2 == 0
+
+
+@pytest.fixture
+def start_session(client, auth_headers):
+    """Create a session config (en -> fr, family) and start a session with it
+
+    With `budget`, the start request must run at most that many statements.
+    """
+    async def start(difficulty: str = "EASY", budget: Optional[int] = None, headers: dict = auth_headers) -> dict:
+        config = session_settings(difficulty)
+        response = await client.post("/api/v1/sessions/config", json=config, headers=headers)
+        response.raise_for_status()
+
+        start = {
+            "config_id": response.json()["id"],
+            "source_lang_code": config["native_language"],
+            "target_lang_code": config["language_tested"],
+            "domain": config["domain"],
+            "difficulty": difficulty,
+            "session_type": config["session_type"],
+        }
+        if budget is None:
+            response = await client.post("/api/v1/sessions/start", json=start, headers=headers)
+        else:
+            with query_budget(budget):
+                response = await client.post("/api/v1/sessions/start", json=start, headers=headers)
+        response.raise_for_status()
+        return response.json()
+    return start
+
+
+def answers(session: dict, correct: Callable[[int, dict], bool] = alternate) -> list:
+    """Answers to every word of a started session, `correct(index, word)` decides which are right"""
+    return [
+        {
+            "translation_from_id": word["translation_from_id"],
+            "translation_to_id": word["translation_to_id"],
+            "from_language": word["from_language"],
+            "to_language": word["to_language"],
+            "correct": correct(i, word),
+            "user_answer": word["translation_to"]["text"],
+        }
+        for i, word in enumerate(session["results"])
+    ]
+
+
+@pytest.fixture
+def submit_session(client, auth_headers):
+    """Submit answers to every word of a session, see `answers`"""
+    async def submit(
+        session: dict,
+        correct: Callable[[int, dict], bool] = alternate,
+        budget: Optional[int] = None,
+        headers: dict = auth_headers
+    ) -> dict:
+        url = f"/api/v1/sessions/{session['id']}/submit"
+        if budget is None:
+            response = await client.post(url, json=answers(session, correct), headers=headers)
+        else:
+            with query_budget(budget):
+                response = await client.post(url, json=answers(session, correct), headers=headers)
+        response.raise_for_status()
+        return response.json()
+    return submit
@@ -0,0 +1,64 @@
+import json
+
+from sqlalchemy import select
+
+from app.domain.vocab.models import ConceptLanguagePair, MasterWord
+
+NDJSON = {"Content-Type": "application/x-ndjson"}
+
+
+def master_word(concept: str, domain: str = "family", translations=("en", "fr")) -> dict:
+    return {
+        "concept": concept,
+        "domain_code": domain,
+        "difficulty": "EASY",
+        "word_type": "NOUN",
+        "translations": [
+            {"master_word_concept": concept, "language_code": lang, "text": f"{concept} {lang}"}
+            for lang in translations
+        ],
+    }
+
+
+def ndjson(*lines) -> bytes:
+    return "\n".join(line if isinstance(line, str) else json.dumps(line) for line in lines).encode()
+
+
+async def test_invalid_rows_are_reported_and_skipped(client, db, vocab):
+    body = ndjson(
+        master_word("aunt"),
+        master_word("cousin", domain="sports"),
+        '{"concept": "uncle",',
+        master_word("niece", translations=("en", "xx")),
+        master_word("uncle"),
+    )
+    response = await client.post("/api/v1/config/master-words/bulk", content=body, headers=NDJSON)
+    response.raise_for_status()
+    result = response.json()
+
+    assert [error["index"] for error in result["errors"]] == [1, 2, 3]
+    assert result["received"] == 5
+    assert result["written"] == 2 + 4
+
+    concepts = set((await db.execute(select(MasterWord.concept).where(MasterWord.concept.in_(
+        ["aunt", "cousin", "niece", "uncle"]
+    )))).scalars())
+    assert concepts == {"aunt", "uncle"}
+    pairs = (await db.execute(
+        select(ConceptLanguagePair.concept, ConceptLanguagePair.source_lang, ConceptLanguagePair.target_lang)
+        .where(ConceptLanguagePair.concept.in_(["aunt", "uncle"]))
+    )).all()
+    assert sorted(pairs) == [("aunt", "en", "fr"), ("aunt", "fr", "en"), ("uncle", "en", "fr"), ("uncle", "fr", "en")]
+
+
+async def test_unchanged_rows_are_not_counted(client, vocab):
+    words = [master_word("aunt"), master_word("uncle")]
+    response = await client.post("/api/v1/config/master-words/bulk", json=words)
+    assert response.json()["written"] == 6
+
+    response = await client.post("/api/v1/config/master-words/bulk", json=words)
+    assert response.json()["written"] == 0
+
+    words[1]["translations"][0]["text"] = "uncle (en)"
+    response = await client.post("/api/v1/config/master-words/bulk", json=words)
+    assert response.json()["written"] == 1
@@ -0,0 +1,84 @@
+import asyncio
+
+from sqlalchemy import func, select
+
+from app.core.database import AsyncSessionLocal
+from app.domain.vocab.models import ConceptLanguagePair, Language, Translation
+from app.domain.vocab.pairs import check_concept_language_pairs, refresh_concept_language_pairs
+
+
+CONCEPT = "word-0"
+
+
+async def add_language(db, code: str, name: str):
+    db.add(Language(code=code, name=name))
+    await db.commit()
+
+
+async def pair_languages(db, concept: str):
+    rows = await db.execute(
+        select(ConceptLanguagePair.source_lang, ConceptLanguagePair.target_lang)
+        .where(ConceptLanguagePair.concept == concept)
+    )
+    return set(rows.all())
+
+
+async def add_translation(session, language_code: str):
+    session.add(Translation(master_word_concept=CONCEPT, language_code=language_code, text=f"{CONCEPT} {language_code}"))
+    await session.flush()
+    await refresh_concept_language_pairs(session, [CONCEPT])
+
+
+async def test_created_translation_pairs_with_every_language(client, db, vocab):
+    await add_language(db, "es", "Español")
+
+    response = await client.post("/api/v1/config/translations", json={
+        "master_word_concept": CONCEPT, "language_code": "es", "text": "palabra",
+    })
+    response.raise_for_status()
+
+    assert await pair_languages(db, CONCEPT) == {
+        ("en", "fr"), ("fr", "en"), ("en", "es"), ("es", "en"), ("fr", "es"), ("es", "fr"),
+    }
+    assert await check_concept_language_pairs(db) == (0, 0)
+
+
+async def test_concurrent_translations_of_one_concept(db, vocab):
+    await add_language(db, "es", "Español")
+    await add_language(db, "de", "Deutsch")
+
+    async with AsyncSessionLocal() as first, AsyncSessionLocal() as second:
+        await add_translation(first, "es")
+        # Waits for the first transaction's lock on the concept
+        waiting = asyncio.create_task(add_translation(second, "de"))
+        await asyncio.sleep(0.2)
+        assert not waiting.done()
+
+        await first.commit()
+        await waiting
+        await second.commit()
+
+    # Neither transaction saw the other's translation when it started
+    assert ("es", "de") in await pair_languages(db, CONCEPT)
+    assert await check_concept_language_pairs(db) == (0, 0)
+
+
+async def test_concurrent_create_translation_requests(client, db, vocab):
+    await add_language(db, "es", "Español")
+    await add_language(db, "de", "Deutsch")
+
+    responses = await asyncio.gather(*(
+        client.post("/api/v1/config/translations", json={
+            "master_word_concept": concept, "language_code": language, "text": f"{concept} {language}",
+        })
+        for concept in vocab[:5]
+        for language in ("es", "de")
+    ))
+    for response in responses:
+        response.raise_for_status()
+
+    count = await db.execute(select(func.count()).select_from(ConceptLanguagePair).where(
+        ConceptLanguagePair.concept.in_(vocab[:5])
+    ))
+    assert count.scalar_one() == 5 * 4 * 3
+    assert await check_concept_language_pairs(db) == (0, 0)
@@ -0,0 +1,29 @@
+from app.core.metrics import STATS_HEADER, query_budget, render_prometheus, route_metrics
+
+
+async def test_reference_data_is_served_from_the_catalog(client, vocab):
+    with query_budget(1):
+        response = await client.get("/api/v1/config/languages")
+    response.raise_for_status()
+    assert [language["code"] for language in response.json()] == ["en", "fr"]
+
+    with query_budget(0):
+        response = await client.get("/api/v1/config/languages")
+    response.raise_for_status()
+
+
+async def test_requests_are_recorded_per_route(client, vocab):
+    for _ in range(2):
+        response = await client.get("/api/v1/config/languages")
+        response.raise_for_status()
+
+    metrics = route_metrics[("GET", "/api/v1/config/languages")]
+    assert metrics.requests == 2
+    assert metrics.queries == 1
+    assert 'vocab_db_queries_total{method="GET",route="/api/v1/config/languages"} 1' in render_prometheus()
+
+
+async def test_stats_header(client, vocab, monkeypatch):
+    monkeypatch.setattr("app.core.metrics.settings.METRICS_DEBUG_HEADER", True)
+    response = await client.get("/api/v1/config/languages")
+    assert response.headers[STATS_HEADER].startswith("queries=1; ")
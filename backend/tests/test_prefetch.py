@@ -0,0 +1,26 @@
+from app.domain.session.models import SessionType
+from app.domain.session.prefetch import WORDS_PER_DIFFICULTY, config_key, pending_sessions, pregenerate_session
+
+
+SETTINGS = ("en", "fr", "family", "EASY", SessionType.COMPREHENSION)
+
+
+async def test_pregenerated_words_are_claimed_once(user, vocab):
+    submit = await pending_sessions.discard(user.id)
+    await pregenerate_session(user.id, *SETTINGS, submit)
+
+    pairs = await pending_sessions.claim(user.id, config_key(*SETTINGS))
+    assert len(pairs) == WORDS_PER_DIFFICULTY["EASY"]
+    assert await pending_sessions.claim(user.id, config_key(*SETTINGS)) is None
+
+
+async def test_words_chosen_before_a_later_submit_are_not_stored(user, vocab):
+    first = await pending_sessions.discard(user.id)
+    second = await pending_sessions.discard(user.id)
+
+    # The first submit's task finishes after the second submit
+    await pregenerate_session(user.id, *SETTINGS, first)
+    assert await pending_sessions.claim(user.id, config_key(*SETTINGS)) is None
+
+    await pregenerate_session(user.id, *SETTINGS, second)
+    assert await pending_sessions.claim(user.id, config_key(*SETTINGS)) is not None
@@ -0,0 +1,39 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update
+
+from app.core.database import AsyncSessionLocal
+from app.domain.session.models import UserProgress
+
+
+async def test_concurrent_submits_add_up(db, user, vocab, start_session, submit_session):
+    first = await start_session()
+    await submit_session(first, correct=lambda i, word: True)
+    words = {word["translation_to_id"] for word in first["results"]}
+
+    # The reviewed words are due, so both sessions are made of them
+    await db.execute(update(UserProgress).values(due_at=datetime.utcnow() - timedelta(hours=1)))
+    await db.commit()
+    right, wrong = await start_session(), await start_session()
+    for session in (right, wrong):
+        assert {word["translation_to_id"] for word in session["results"]} == words
+
+    # Both submits wait on the progress rows until the blocker is done
+    async with AsyncSessionLocal() as blocker:
+        await blocker.execute(select(UserProgress.id).where(UserProgress.user_id == user.id).with_for_update())
+        submits = asyncio.gather(
+            submit_session(right, correct=lambda i, word: True),
+            submit_session(wrong, correct=lambda i, word: False),
+        )
+        await asyncio.sleep(0.2)
+        assert not submits.done()
+        await blocker.commit()
+    await submits
+
+    counts = await db.execute(
+        select(UserProgress.translation_id, UserProgress.correct_count, UserProgress.incorrect_count)
+        .where(UserProgress.user_id == user.id)
+        .execution_options(populate_existing=True)
+    )
+    assert {str(row[0]): (row[1], row[2]) for row in counts.all()} == {word: (2, 1) for word in words}
@@ -0,0 +1,70 @@
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import select
+
+from app.core.database import AsyncSessionLocal
+from app.core.metrics import STATS_HEADER, MetricsMiddleware, route_metrics
+from app.core.query_detector import QueryDetectorMiddleware, detector_report, write_report
+from app.domain.vocab.models import MasterWord
+
+
+REPEATED = 5
+
+
+def detector_app(concepts) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(QueryDetectorMiddleware)
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/words")
+    async def words():
+        async with AsyncSessionLocal() as db:
+            # One query per word, and the domain of each loaded lazily
+            for concept in concepts[:REPEATED]:
+                await db.execute(select(MasterWord).where(MasterWord.concept == concept))
+            words = (await db.execute(select(MasterWord))).scalars().all()
+            domains = await db.run_sync(lambda session: {word.domain.code for word in words})
+        return {"domains": sorted(domains)}
+
+    return app
+
+
+@pytest.fixture
+async def detector_client(vocab, monkeypatch):
+    monkeypatch.setattr("app.core.metrics.settings.METRICS_DEBUG_HEADER", True)
+    monkeypatch.setattr("app.core.query_detector.settings.QUERY_DETECTOR_REPEAT", REPEATED)
+    transport = httpx.ASGITransport(app=detector_app(vocab))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+async def test_repeated_statements_and_lazy_loads_are_reported(detector_client, tmp_path):
+    response = await detector_client.get("/words")
+    response.raise_for_status()
+
+    report = detector_report["GET /words"]
+    assert report.requests == 1
+    assert list(report.repeated.values()) == [REPEATED]
+    assert any("domain" in path for path in report.lazy_loads)
+
+    path = tmp_path / "queries.json"
+    write_report(str(path))
+    written = json.loads(path.read_text())["endpoints"]["GET /words"]
+    assert written["repeated"] == report.repeated
+    assert written["lazy_loads"] == report.lazy_loads
+
+
+async def test_detector_work_is_not_in_the_request_metrics(detector_client, monkeypatch):
+    # Every statement is slow, so each one is EXPLAINed
+    monkeypatch.setattr("app.core.query_detector.settings.SLOW_QUERY_MS", 0)
+    response = await detector_client.get("/words")
+    response.raise_for_status()
+
+    report = detector_report["GET /words"]
+    assert report.slow
+    assert all(slow["plan"] for slow in report.slow.values())
+    assert route_metrics[("GET", "/words")].queries == report.max_queries
+    assert response.headers[STATS_HEADER].startswith(f"queries={report.max_queries}; ")
@@ -0,0 +1,85 @@
+"""
+Engines used by the read endpoints when the replica is a distinct engine
+(a second engine on the test database).
+"""
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core import database
+from app.core.config import settings
+from app.domain.user.cache import invalidate_user
+from app.domain.vocab.catalog import vocab_catalog
+
+
+def record_tables(engine, tables: list):
+    """Append the table each statement of `engine` starts from to `tables`"""
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        words = statement.split()
+        keyword = next(i for i, word in enumerate(words) if word in ("FROM", "INTO", "UPDATE"))
+        tables.append(words[keyword + 1])
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    return before_cursor_execute
+
+
+@pytest.fixture
+async def engines(monkeypatch):
+    """Tables queried on the primary and on the replica, by engine name"""
+    replica = create_async_engine(settings.DATABASE_URL, **database.engine_options(settings))
+    monkeypatch.setattr(database, "AsyncReadSessionLocal", async_sessionmaker(
+        replica, class_=AsyncSession, expire_on_commit=False
+    ))
+    used = {"primary": [], "replica": []}
+    listeners = [
+        (engine, record_tables(engine, used[name]))
+        for name, engine in (("primary", database.engine), ("replica", replica))
+    ]
+    yield used
+    for engine, listener in listeners:
+        event.remove(engine.sync_engine, "before_cursor_execute", listener)
+    await replica.dispose()
+
+
+@pytest.fixture
+def tables_used(client, auth_headers, engines):
+    """GET `url` and return the tables each engine queried for it"""
+    async def get(url: str, headers: dict = auth_headers) -> dict:
+        for tables in engines.values():
+            tables.clear()
+        response = await client.get(url, headers=headers)
+        response.raise_for_status()
+        return {name: sorted(set(tables)) for name, tables in engines.items()}
+    return get
+
+
+async def test_session_detail(user, vocab, start_session, tables_used):
+    url = f"/api/v1/sessions/{(await start_session())['id']}"
+
+    # Cold caches: the user, languages and translations come from the primary
+    await invalidate_user(user.email)
+    vocab_catalog.invalidate()
+    assert await tables_used(url) == {
+        "primary": ["languages", "translations", "users"], "replica": ["session_results", "sessions"],
+    }
+
+    # Warm caches: the primary isn't used at all
+    assert await tables_used(url) == {"primary": [], "replica": ["session_results", "sessions"]}
+
+
+async def test_history_and_stats(vocab, start_session, submit_session, tables_used):
+    await submit_session(await start_session())
+
+    assert await tables_used("/api/v1/sessions/") == {"primary": [], "replica": ["sessions"]}
+    used = await tables_used("/api/v1/stats/")
+    assert used["primary"] == [] and used["replica"]
+
+
+async def test_reference_data_is_loaded_from_the_primary(vocab, tables_used):
+    assert await tables_used("/api/v1/config/languages") == {"primary": ["languages"], "replica": []}
+
+
+async def test_pinned_reads_use_the_primary(auth_headers, vocab, start_session, tables_used):
+    url = f"/api/v1/sessions/{(await start_session())['id']}"
+
+    pinned = {**auth_headers, settings.READ_PRIMARY_HEADER: "1"}
+    assert await tables_used(url, pinned) == {"primary": ["session_results", "sessions"], "replica": []}
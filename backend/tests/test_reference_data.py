@@ -0,0 +1,26 @@
+from app.core.metrics import query_budget
+
+
+async def test_languages_etag(client, vocab):
+    response = await client.get("/api/v1/config/languages")
+    response.raise_for_status()
+    etag = response.headers["ETag"]
+
+    # Warm: served from the catalog, revalidated without a body
+    with query_budget(0):
+        response = await client.get("/api/v1/config/languages", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    response = await client.post("/api/v1/config/languages", json={"code": "es", "name": "Español"})
+    response.raise_for_status()
+
+    response = await client.get("/api/v1/config/languages", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert {"code": "es", "name": "Español"} in response.json()
+
+    with query_budget(0):
+        response = await client.get("/api/v1/config/languages")
+    response.raise_for_status()
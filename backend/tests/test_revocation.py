@@ -0,0 +1,47 @@
+import asyncio
+import time
+
+from sqlalchemy import text
+
+from app.domain.user.revocation import REVOCATION_CHANNEL, revocation_list
+
+
+async def eventually(condition, timeout: float = 5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        await asyncio.sleep(0.05)
+
+
+async def test_listener_reconnects_after_losing_its_connection(db):
+    await revocation_list.start()
+    try:
+        raw_conn = await revocation_list._listener_conn.get_raw_connection()
+        pid = raw_conn.driver_connection.get_server_pid()
+        await db.execute(text("SELECT pg_terminate_backend(:pid)"), {"pid": pid})
+        await db.commit()
+        await eventually(lambda: revocation_list._listener_conn is not None and revocation_list._reconnect_task is None)
+
+        # Revoked by another process
+        await db.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": REVOCATION_CHANNEL, "payload": f"other-jti {time.time() + 60}"}
+        )
+        await db.commit()
+        await eventually(lambda: revocation_list.is_revoked("other-jti"))
+    finally:
+        await revocation_list.stop()
+
+
+async def test_token_is_rejected_after_logout(client, password_user):
+    response = await client.post("/api/v1/auth/login", json=password_user)
+    response.raise_for_status()
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    response = await client.get("/api/v1/profile/", headers=headers)
+    assert response.status_code == 200
+    response = await client.post("/api/v1/auth/logout", headers=headers)
+    response.raise_for_status()
+
+    response = await client.get("/api/v1/profile/", headers=headers)
+    assert response.status_code == 401
@@ -0,0 +1,67 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app.api.v1.endpoints import session as session_endpoints
+from app.core.database import AsyncSessionLocal
+from app.domain.session.models import SessionWord, UserStats
+from app.domain.session.rollup import check_user_stats, rebuild_user_stats
+
+
+NO_DRIFT = {"user_stats": (0, 0), "user_stats_breakdown": (0, 0)}
+
+
+def frozen_utcnow(monkeypatch, now: datetime):
+    """Submits made from now on happen at `now`"""
+    class FrozenDatetime(datetime):
+        @classmethod
+        def utcnow(cls):
+            return now
+    monkeypatch.setattr(session_endpoints, "datetime", FrozenDatetime)
+
+
+async def user_stats(db, user) -> UserStats:
+    return (await db.execute(
+        select(UserStats).where(UserStats.user_id == user.id).execution_options(populate_existing=True)
+    )).scalar_one()
+
+
+async def test_incremental_rollup_matches_rebuild(db, user, vocab, start_session, submit_session, monkeypatch):
+    yesterday = datetime.utcnow() - timedelta(days=1)
+    first = await start_session()
+    frozen_utcnow(monkeypatch, yesterday)
+    await submit_session(first)
+
+    # Today: resubmit yesterday's session with other answers, then a new one
+    frozen_utcnow(monkeypatch, yesterday + timedelta(days=1))
+    await submit_session(first, correct=lambda i, word: True)
+    second = await start_session()
+    await submit_session(second)
+
+    stats = await user_stats(db, user)
+    assert (stats.sessions_completed, stats.current_streak, stats.longest_streak) == (2, 2, 2)
+    assert stats.last_active_date == (yesterday + timedelta(days=1)).date()
+    assert await check_user_stats(db) == NO_DRIFT
+
+    await rebuild_user_stats(db)
+    await db.commit()
+    assert await check_user_stats(db) == NO_DRIFT
+
+
+async def test_concurrent_submits_complete_a_session_once(db, user, vocab, start_session, submit_session):
+    session = await start_session()
+
+    # Both submits wait on the session's answers until the blocker is done
+    async with AsyncSessionLocal() as blocker:
+        await blocker.execute(
+            select(SessionWord.id).where(SessionWord.session_id == session["id"]).with_for_update()
+        )
+        submits = asyncio.gather(submit_session(session), submit_session(session))
+        await asyncio.sleep(0.2)
+        await blocker.commit()
+    await submits
+
+    stats = await user_stats(db, user)
+    assert (stats.sessions_completed, stats.current_streak) == (1, 1)
+    assert await check_user_stats(db) == NO_DRIFT
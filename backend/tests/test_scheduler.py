@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from app.domain.session.models import UserProgress
+
+
+async def schedule(db, translation_id: str) -> dict:
+    progress = UserProgress.__table__
+    row = (await db.execute(select(progress).where(progress.c.translation_id == translation_id))).one()
+    return row._asdict()
+
+
+async def make_due(db, translation_id: str, hours_ago: float):
+    await db.execute(
+        update(UserProgress)
+        .where(UserProgress.translation_id == translation_id)
+        .values(due_at=datetime.utcnow() - timedelta(hours=hours_ago))
+    )
+    await db.commit()
+
+
+@pytest.mark.parametrize("step, correct, ease, interval, repetitions", [
+    (0, True, 2.6, 1, 1),
+    (1, True, 2.7, 6, 2),
+    (2, False, 2.38, 1, 0),
+], ids=["first-correct", "second-correct", "then-wrong"])
+async def test_sm2_schedule(db, vocab, start_session, submit_session, step, correct, ease, interval, repetitions):
+    session = await start_session()
+    word = session["results"][0]["translation_to_id"]
+    answers = [True, True, False]
+
+    for i in range(step + 1):
+        if i:
+            # Overdue words come first in the next session
+            await make_due(db, word, hours_ago=1)
+            session = await start_session()
+            assert session["results"][0]["translation_to_id"] == word
+        await submit_session(session, correct=lambda _, w: w["translation_to_id"] != word or answers[i])
+
+    row = await schedule(db, word)
+    assert answers[step] == correct
+    assert row["ease"] == pytest.approx(ease)
+    assert row["interval_days"] == interval
+    assert row["repetitions"] == repetitions
+    assert row["due_at"] == row["last_reviewed"] + timedelta(days=interval)
+    assert (row["correct_count"], row["incorrect_count"]) == (answers[:step + 1].count(True), answers[:step + 1].count(False))
+
+
+async def test_most_overdue_words_come_first(db, vocab, start_session, submit_session):
+    session = await start_session()
+    await submit_session(session, correct=lambda i, w: True)
+    words = [word["translation_to_id"] for word in session["results"]]
+
+    # Reviewed words are due tomorrow; make three due, the last one the oldest
+    for hours_ago, word in enumerate(words[:3], start=1):
+        await make_due(db, word, hours_ago)
+
+    session = await start_session()
+    assert [word["translation_to_id"] for word in session["results"][:3]] == words[2::-1]
@@ -0,0 +1,60 @@
+import asyncio
+from datetime import timedelta
+
+from passlib.hash import bcrypt
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.core.security import (
+    create_access_token, decode_access_token, jwt_backend, password_hasher, token_cache, verify_password,
+)
+from app.domain.user.models import User
+
+
+async def test_cached_token_expires():
+    token = create_access_token({"sub": "learner@example.com"}, expires_delta=timedelta(seconds=1))
+    assert decode_access_token(token)["sub"] == "learner@example.com"
+    hits = token_cache.hits
+    assert decode_access_token(token) is not None
+    assert token_cache.hits == hits + 1
+
+    # exp has a one second resolution
+    await asyncio.sleep(2.1)
+    assert decode_access_token(token) is None
+    assert not token_cache._entries
+
+
+def test_token_without_exp_is_not_cached():
+    token = jwt_backend.encode({"sub": "learner@example.com"})
+    hits = token_cache.hits
+    for _ in range(2):
+        assert decode_access_token(token)["sub"] == "learner@example.com"
+    assert not token_cache._entries
+    assert token_cache.hits == hits
+
+
+async def test_login_refused_when_hasher_is_busy(client, password_user, monkeypatch):
+    monkeypatch.setattr(password_hasher, "max_pending", 1)
+
+    responses = await asyncio.gather(*(
+        client.post("/api/v1/auth/login", json=password_user) for _ in range(2)
+    ))
+    assert sorted(response.status_code for response in responses) == [200, 503]
+    busy = next(response for response in responses if response.status_code == 503)
+    assert busy.headers["Retry-After"] == "1"
+
+
+async def test_outdated_hash_is_upgraded_on_login(client, db, password_user):
+    await db.execute(
+        update(User)
+        .where(User.email == password_user["email"])
+        .values(hashed_password=bcrypt.using(rounds=4).hash(password_user["password"]))
+    )
+    await db.commit()
+
+    response = await client.post("/api/v1/auth/login", json=password_user)
+    response.raise_for_status()
+
+    hashed_password = await db.scalar(select(User.hashed_password).where(User.email == password_user["email"]))
+    assert hashed_password.startswith(f"$2b${settings.BCRYPT_ROUNDS}$")
+    assert (await verify_password(password_user["password"], hashed_password)) == (True, None)
@@ -0,0 +1,60 @@
+import json
+
+import pytest
+from sqlalchemy import select
+
+from app.core.database import AsyncSessionLocal
+from app.domain.vocab.models import Translation
+from scripts import seed_database as seeder
+
+
+def write_json(path, data):
+    path.write_text(json.dumps(data))
+
+
+@pytest.fixture
+def fixtures_dir(tmp_path, monkeypatch):
+    write_json(tmp_path / "languages.json", [{"code": "en", "name": "English"}])
+    write_json(tmp_path / "domains.json", [{"code": "family", "name": "Family"}])
+    family = tmp_path / "family"
+    family.mkdir()
+    write_json(family / "master_words.json", [
+        {"concept": "mother", "domain_code": "family", "difficulty": "EASY", "word_type": "NOUN"},
+    ])
+    # "aunt" has no master word yet
+    write_json(family / "translations_en.json", [
+        {"concept": "mother", "language_code": "en", "text": "mother"},
+        {"concept": "aunt", "language_code": "en", "text": "aunt"},
+    ])
+    monkeypatch.setattr(seeder, "FIXTURES_DIR", tmp_path)
+    return tmp_path
+
+
+async def translated_concepts():
+    async with AsyncSessionLocal() as session:
+        return set((await session.execute(select(Translation.master_word_concept))).scalars())
+
+
+@pytest.mark.parametrize("mode", [{}, {"bulk": True}, {"jobs": 2}], ids=["default", "bulk", "parallel"])
+async def test_skipped_translations_load_once_their_concept_exists(fixtures_dir, mode):
+    await seeder.seed_database(**mode)
+    assert await translated_concepts() == {"mother"}
+
+    # Only master_words.json changes; the translations file is the same
+    write_json(fixtures_dir / "family" / "master_words.json", [
+        {"concept": "mother", "domain_code": "family", "difficulty": "EASY", "word_type": "NOUN"},
+        {"concept": "aunt", "domain_code": "family", "difficulty": "EASY", "word_type": "NOUN"},
+    ])
+    await seeder.seed_database(**mode)
+    assert await translated_concepts() == {"mother", "aunt"}
+
+
+async def test_fully_loaded_files_are_skipped(fixtures_dir):
+    write_json(fixtures_dir / "family" / "translations_en.json", [
+        {"concept": "mother", "language_code": "en", "text": "mother"},
+    ])
+    await seeder.seed_database(bulk=True)
+
+    async with AsyncSessionLocal() as session:
+        checksums = await seeder.FixtureChecksums.load(session)
+    assert checksums.changed(fixtures_dir / "family" / "translations_en.json") is None
@@ -0,0 +1,66 @@
+"""
+Statement budgets of the session endpoints.
+
+The responses are built from the rows just written and the catalog cache,
+so the number of statements must not grow with the number of words.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.core.metrics import collect_queries, query_budget, route_metrics
+from app.domain.session.models import UserProgress
+from app.domain.session.prefetch import pending_sessions
+from app.domain.vocab.catalog import vocab_catalog
+from app.domain.vocab.models import Translation
+
+
+@pytest.mark.parametrize("difficulty, words", [("EASY", 10), ("HARD", 20)])
+async def test_session_detail_query_budget(client, auth_headers, vocab, start_session, submit_session, difficulty, words):
+    # Cold catalog: config with due words, catalog entry, session and words
+    # inserts, translations, languages
+    session = await start_session(difficulty, budget=6)
+    assert len(session["results"]) == words
+
+    # Session, answers, progress, stats, breakdown, score update, words
+    submitted = await submit_session(session, budget=7)
+    assert submitted["score"] == 50
+    assert all(word["correct"] is not None for word in submitted["results"])
+
+    # Session, words
+    with query_budget(2):
+        response = await client.get(f"/api/v1/sessions/{session['id']}", headers=auth_headers)
+    response.raise_for_status()
+    assert response.json() == submitted
+
+
+async def test_submit_metrics_exclude_pregeneration(vocab, start_session, submit_session, monkeypatch):
+    monkeypatch.setattr(settings, "PREGENERATE_SESSIONS", True)
+    session = await start_session()
+    generated = pending_sessions.generated
+
+    with collect_queries() as everything:
+        await submit_session(session)
+
+    # The next session's words were chosen after the response was sent
+    assert pending_sessions.generated == generated + 1
+    metrics = route_metrics[("POST", "/api/v1/sessions/{session_id}/submit")]
+    assert metrics.queries == 7
+    assert everything.queries > metrics.queries
+
+
+async def test_warm_session_start_query_budget(db, vocab, start_session, submit_session):
+    # Catalog entry and every translation cached, and the reviewed words due
+    session = await start_session()
+    await submit_session(session)
+    await db.execute(update(UserProgress).values(due_at=datetime.utcnow() - timedelta(hours=1)))
+    await db.commit()
+    translation_ids = (await db.execute(select(Translation.id))).scalars().all()
+    await vocab_catalog.translations(db, translation_ids)
+
+    # Config with due words, session insert, words insert
+    due = {word["translation_to_id"] for word in session["results"]}
+    session = await start_session(budget=3)
+    assert {word["translation_to_id"] for word in session["results"]} == due
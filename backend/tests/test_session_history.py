@@ -0,0 +1,42 @@
+import pytest
+
+
+SESSIONS = 5
+
+
+@pytest.fixture
+async def history(vocab, start_session) -> list:
+    """Ids of the user's sessions, newest first"""
+    return [(await start_session())["id"] for _ in range(SESSIONS)][::-1]
+
+
+async def test_pages_cover_the_history(client, auth_headers, history):
+    seen, params = [], {"limit": 2}
+    while True:
+        response = await client.get("/api/v1/sessions/", params=params, headers=auth_headers)
+        response.raise_for_status()
+        page = [session["id"] for session in response.json()]
+        assert 0 < len(page) <= 2
+        seen += page
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params = {"limit": 2, "cursor": response.headers["X-Next-Cursor"]}
+
+    assert seen == history
+
+
+async def test_whole_history_without_limit(client, auth_headers, history):
+    response = await client.get("/api/v1/sessions/", headers=auth_headers)
+    response.raise_for_status()
+    assert [session["id"] for session in response.json()] == history
+    assert "X-Next-Cursor" not in response.headers
+
+    response = await client.get("/api/v1/sessions/", params={"fields": "id,score"}, headers=auth_headers)
+    response.raise_for_status()
+    assert response.json() == [{"id": session_id, "score": None} for session_id in history]
+
+
+@pytest.mark.parametrize("params", [{"cursor": "not-a-cursor"}, {"fields": "id,hashed_password"}])
+async def test_bad_parameters(client, auth_headers, params):
+    response = await client.get("/api/v1/sessions/", params=params, headers=auth_headers)
+    assert response.status_code == 400
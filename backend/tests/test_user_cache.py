@@ -0,0 +1,49 @@
+import json
+
+from app.domain.user.cache import user_cache
+
+
+async def user_cache_stats(client) -> dict:
+    response = await client.get("/health/caches")
+    response.raise_for_status()
+    return response.json()["user"]
+
+
+def cached_entries() -> list:
+    return [value for _, value in user_cache.backend._entries.values()]
+
+
+async def test_profile_update_invalidates_the_cached_user(client, user, auth_headers):
+    before = await user_cache_stats(client)
+
+    response = await client.get("/api/v1/profile/", headers=auth_headers)
+    response.raise_for_status()
+    response = await client.patch("/api/v1/profile/", json={"full_name": "Renamed"}, headers=auth_headers)
+    response.raise_for_status()
+
+    response = await client.get("/api/v1/profile/", headers=auth_headers)
+    response.raise_for_status()
+    assert response.json()["full_name"] == "Renamed"
+    response = await client.get("/api/v1/profile/", headers=auth_headers)
+    response.raise_for_status()
+
+    # Loaded by the first GET and again after the update, cached for the others
+    after = await user_cache_stats(client)
+    assert after["misses"] - before["misses"] == 2
+    assert after["hits"] - before["hits"] == 2
+
+
+async def test_cached_user_is_json_without_password_hash(client, password_user):
+    credentials = password_user
+    response = await client.post("/api/v1/auth/login", json=credentials)
+    response.raise_for_status()
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    for _ in range(2):
+        response = await client.get("/api/v1/auth/current-user", headers=headers)
+        response.raise_for_status()
+        assert response.json()["email"] == credentials["email"]
+
+    [entry] = cached_entries()
+    assert "hashed_password" not in entry
+    assert json.loads(json.dumps(entry)) == entry
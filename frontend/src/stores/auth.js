@@ -47,7 +47,15 @@ export const useAuthStore = defineStore('auth', {
       }
     },
 
-    logout() {
+    async logout() {
+      // Revoke the token server-side while it is still known to be valid
+      if (this.isAuthenticated) {
+        try {
+          await apiClient.post('/api/v1/auth/logout')
+        } catch (error) {
+          // The token is dropped below anyway
+        }
+      }
       this.user = null
       this.token = null
       this.isAuthenticated = false